@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: bench_optimizer.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Compare settlement strategies on large synthetic balance maps (company-wide cost allocation).
+
+Usage:
+python benchmarks/bench_optimizer.py --people 100000 --seed 7
+
+Notes:
+- Balances are drawn from a handful of common amounts plus a long tail, so exact
+  debtor/creditor matches occur as they do in real allocations.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from decimal import Decimal
+from typing import Dict
+
+from fairsplit.money import from_minor
+from fairsplit.optimizer import optimize_settlements
+
+
+def make_balances(people: int, seed: int) -> Dict[str, Decimal]:
+    rng = random.Random(seed)
+    common = [rng.randint(100, 50_000) for _ in range(50)]
+    cents = []
+    for _ in range(people - 1):
+        v = rng.choice(common) if rng.random() < 0.3 else rng.randint(1, 200_000)
+        cents.append(v if rng.random() < 0.5 else -v)
+    cents.append(-sum(cents))
+    return {f"p{i:07d}": from_minor(v) for i, v in enumerate(cents)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare settlement strategies on large groups")
+    parser.add_argument("--people", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    balances = make_balances(args.people, args.seed)
+    print(f"{'strategy':<10}{'transfers':>12}{'seconds':>10}")
+    for strategy in ("greedy", "heap"):
+        start = time.perf_counter()
+        settlement = optimize_settlements(balances, strategy=strategy)
+        elapsed = time.perf_counter() - start
+        print(f"{strategy:<10}{len(settlement.transactions):>12}{elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
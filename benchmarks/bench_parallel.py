@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: bench_parallel.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Compare serial and sharded (`workers=`) balance computation on one large synthetic ledger,
+read as an NDJSON log and as an ExpenseTable.
+
+Usage:
+python benchmarks/bench_parallel.py --expenses 1000000 --workers 1,2,4,8
+
+Notes:
+- "split s" is the time spent in this process cutting the input into shards; everything
+  else (parsing, validation, splitting) happens in the workers.
+- The speedup is bounded by the number of physical cores.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from fairsplit.io_utils import expense_to_obj, stream_json
+from fairsplit.ledger import DEFAULT_SHARD_SIZE, _shards, compute_balances
+from fairsplit.synthetic import Workload, generate
+from fairsplit.table import ExpenseTable
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sharded balance computation")
+    parser.add_argument("--expenses", type=int, default=300_000)
+    parser.add_argument("--people", type=int, default=200)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts (1 = serial)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    people, expenses = generate(Workload(people=args.people, expenses=args.expenses, seed=args.seed, span_days=365))
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "ledger.ndjson"
+        with log.open("w", encoding="utf-8") as fh:
+            fh.write(json.dumps({"people": people}) + "\n")
+            fh.writelines(json.dumps(expense_to_obj(e)) + "\n" for e in expenses)
+        sources = {
+            "ndjson": lambda: stream_json(log),
+            "table": lambda: ExpenseTable.from_expenses(people, expenses),
+        }
+
+        print(f"{'input':<8}{'workers':>8}{'split s':>9}{'total s':>9}{'speedup':>9}")
+        for name, open_source in sources.items():
+            source = open_source()
+            start = time.perf_counter()
+            list(_shards(source, args.chunk_size))
+            split = time.perf_counter() - start
+
+            serial = None
+            for workers in (int(w) for w in args.workers.split(",")):
+                start = time.perf_counter()
+                balances = compute_balances(people, source, engine="minor", workers=workers, chunk_size=args.chunk_size)
+                elapsed = time.perf_counter() - start
+                if serial is None:
+                    serial, expected = elapsed, balances
+                assert balances == expected
+                print(f"{name:<8}{workers:>8}{split if workers > 1 else 0:>9.3f}{elapsed:>9.3f}{serial / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
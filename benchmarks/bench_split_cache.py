@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: bench_split_cache.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Measure the split cache on a recurring-expense workload (rent, groceries, utilities
+for the same flatmates, plus one-off expenses).
+
+Usage:
+python benchmarks/bench_split_cache.py --expenses 200000 --recurring 0.9
+
+Notes:
+- Each engine is timed without a cache and with a fresh SplitCache.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from decimal import Decimal
+from typing import List
+
+from fairsplit.ledger import compute_balances
+from fairsplit.models import Expense, SplitCache
+
+
+def make_expenses(count: int, recurring: float, seed: int) -> tuple[List[str], List[Expense]]:
+    rng = random.Random(seed)
+    people = [f"flatmate{i}" for i in range(12)]
+    shapes = []
+    for desc in ("rent", "groceries", "utilities", "internet", "cleaning"):
+        for _ in range(8):
+            group = rng.sample(people, rng.randint(2, 6))
+            weights = {p: Decimal(rng.choice(["1", "1.5", "2"])) for p in group} if rng.random() < 0.3 else None
+            amount = Decimal(rng.randint(2_000, 200_000)) / 100
+            shapes.append((desc, amount, rng.choice(group), group, weights))
+
+    expenses = []
+    for _ in range(count):
+        if rng.random() < recurring:
+            desc, amount, payer, group, weights = rng.choice(shapes)
+        else:
+            group = rng.sample(people, rng.randint(2, 6))
+            desc, amount, payer, weights = "one-off", Decimal(rng.randint(100, 50_000)) / 100, rng.choice(group), None
+        expenses.append(Expense(desc=desc, amount=amount, paid_by=payer, beneficiaries=group, weights=weights))
+    return people, expenses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the recurring-shape split cache")
+    parser.add_argument("--expenses", type=int, default=200_000)
+    parser.add_argument("--recurring", type=float, default=0.9, help="fraction of recurring expenses")
+    parser.add_argument("--maxsize", type=int, default=4096)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    people, expenses = make_expenses(args.expenses, args.recurring, args.seed)
+    print(f"{'engine':<9}{'uncached s':>12}{'cached s':>10}{'speedup':>9}{'hit rate':>10}")
+    for engine in ("decimal", "minor"):
+        start = time.perf_counter()
+        plain = compute_balances(people, expenses, engine=engine, split_cache=None)
+        uncached = time.perf_counter() - start
+
+        cache = SplitCache(args.maxsize)
+        start = time.perf_counter()
+        cached_result = compute_balances(people, expenses, engine=engine, split_cache=cache)
+        cached = time.perf_counter() - start
+
+        assert cached_result == plain
+        hit_rate = cache.hits / max(cache.hits + cache.misses, 1)
+        print(f"{engine:<9}{uncached:>12.3f}{cached:>10.3f}{uncached / cached:>8.1f}x{hit_rate:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
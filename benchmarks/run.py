@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: run.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Benchmark runner: times each pipeline stage (split, balances, settlement, constrained
+min-cost-flow settlement, JSON dump and load, trusted load, validation, monthly
+statements) on synthetic ledgers at several scales, reports throughput and peak memory,
+and compares the numbers against stored baselines.
+
+Usage:
+python benchmarks/run.py --scales small,medium --save      # record baselines
+python benchmarks/run.py --scales small,medium --check     # exit 1 on regression
+
+Notes:
+- Throughput is items per second from the best of `--repeat` runs; peak memory comes
+  from a separate run under `tracemalloc` so tracing does not skew the timings.
+- A stage regresses when throughput drops, or peak memory grows, by more than
+  `--threshold` (default 25%) against `benchmarks/baselines.json`.
+- Baselines are machine-specific: record them on the machine that runs `--check`.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from fairsplit.flow import settle_flow
+from fairsplit.io_utils import dump_json, load_json
+from fairsplit.ledger import compute_balances
+from fairsplit.models import SplitCache
+from fairsplit.optimizer import optimize_settlements
+from fairsplit.snapshots import SnapshotIndex
+from fairsplit.synthetic import START, Workload, generate, payment_network
+from fairsplit.validation import validate_file
+
+BASELINES = Path(__file__).with_name("baselines.json")
+SCALES = {
+    "small": Workload(people=20, expenses=2_000, weighted=0.2, recurring=0.5, span_days=365),
+    "medium": Workload(people=200, expenses=20_000, weighted=0.2, recurring=0.5, span_days=3 * 365),
+    "large": Workload(people=2_000, expenses=200_000, weighted=0.2, recurring=0.5, span_days=3 * 365),
+}
+MEMORY_FLOOR_KIB = 64  # ignore peak-memory changes smaller than this
+
+
+def stages(workload: Workload, tmp: Path) -> List[Tuple[str, int, Callable[[], object]]]:
+    """(name, items processed, callable) for every stage of one workload."""
+    people, expenses = generate(workload)
+    balances = compute_balances(people, expenses)
+    path = tmp / "ledger.json"
+    dump_json(path, people, expenses)
+    index = SnapshotIndex(people, expenses)
+    network = payment_network(people, networks=max(len(people) // 50, 1), seed=workload.seed)
+    months = [START.replace(year=START.year + m // 12, month=m % 12 + 1) for m in range(workload.span_days // 30 + 2)]
+    return [
+        ("split", len(expenses), lambda: [e.split() for e in expenses]),
+        ("balances", len(expenses), lambda: compute_balances(people, expenses, split_cache=SplitCache())),
+        (
+            "balances_minor",
+            len(expenses),
+            lambda: compute_balances(people, expenses, engine="minor", split_cache=SplitCache()),
+        ),
+        ("optimize", len(people), lambda: optimize_settlements(balances)),
+        ("settle_flow", len(people), lambda: settle_flow(balances, network)),
+        ("dump_json", len(expenses), lambda: dump_json(tmp / "out.json", people, expenses)),
+        ("load_json", len(expenses), lambda: load_json(path)),
+        ("load_json_trusted", len(expenses), lambda: load_json(path, trusted=True)),
+        ("validate", len(expenses), lambda: validate_file(path)),
+        ("snapshot_index", len(expenses), lambda: SnapshotIndex(people, expenses, split_cache=SplitCache())),
+        (
+            "statements",
+            len(months) - 1,
+            lambda: [index.between(lo, hi) for lo, hi in zip(months, months[1:])],
+        ),
+    ]
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Tuple[float, float]:
+    """Return (best seconds, peak KiB) for `fn`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / 1024
+
+
+def run(scales: List[str], repeat: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'stage':<24}{'items':>9}{'seconds':>10}{'items/s':>13}{'peak KiB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            for name, items, fn in stages(SCALES[scale], Path(tmp)):
+                seconds, peak = measure(fn, repeat)
+                key = f"{scale}/{name}"
+                results[key] = {
+                    "items": items,
+                    "seconds": round(seconds, 6),
+                    "throughput": round(items / seconds, 1),
+                    "peak_kib": round(peak, 1),
+                }
+                print(f"{key:<24}{items:>9}{seconds:>10.4f}{items / seconds:>13,.0f}{peak:>11,.0f}")
+    return results
+
+
+def regressions(
+    results: Dict[str, Dict[str, float]], baselines: Dict[str, Dict[str, float]], threshold: float
+) -> List[str]:
+    problems = []
+    for key, now in results.items():
+        base = baselines.get(key)
+        if base is None:
+            continue
+        if now["throughput"] < base["throughput"] * (1 - threshold):
+            problems.append(f"{key}: throughput {now['throughput']:,.0f}/s vs baseline {base['throughput']:,.0f}/s")
+        grown = now["peak_kib"] - base["peak_kib"]
+        if grown > MEMORY_FLOOR_KIB and now["peak_kib"] > base["peak_kib"] * (1 + threshold):
+            problems.append(f"{key}: peak {now['peak_kib']:,.0f} KiB vs baseline {base['peak_kib']:,.0f} KiB")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the FairSplit benchmark suite")
+    parser.add_argument("--scales", default="small,medium", help=f"comma-separated: {', '.join(SCALES)}")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baselines", type=Path, default=BASELINES)
+    parser.add_argument("--save", action="store_true", help="write these results as the new baselines")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any stage regressed")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed regression fraction")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+
+    results = run(scales, args.repeat)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.save:
+        stored = json.loads(args.baselines.read_text(encoding="utf-8")) if args.baselines.exists() else {}
+        stored.update(results)
+        args.baselines.write_text(json.dumps(stored, indent=2, sort_keys=True), encoding="utf-8")
+        print(f"Saved {len(results)} baselines to {args.baselines}")
+
+    if args.check:
+        if not args.baselines.exists():
+            sys.exit(f"No baselines at {args.baselines}; run with --save first")
+        problems = regressions(results, json.loads(args.baselines.read_text(encoding="utf-8")), args.threshold)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+        print(f"No stage regressed by more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: batch.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Settle many group files in one run: each file is loaded, balanced and optimized in a
+worker process, its result written as JSON, and one aggregated summary produced.
+
+Usage:
+from fairsplit.batch import find_group_files, run_batch
+summary = run_batch(find_group_files("groups/"), "results/", workers=8)
+
+Notes:
+- A failing file is recorded in the summary; it never aborts the run.
+- Results are named `<stem>.result.json`; files sharing a stem get `-2`, `-3`, ... suffixes
+  that never collide with another input's stem (`unique_stems`).
+- Keep this module free of typer/rich imports so workers start cheaply.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import glob
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .io_utils import NDJSON_SUFFIXES, stream_json
+from .ledger import compute_balances_by_currency
+from .money import D
+from .optimizer import EXACT_BUDGET_MS, optimize_settlements
+from .utils import normalize_people
+
+GROUP_SUFFIXES = (".json",) + NDJSON_SUFFIXES
+SUMMARY_NAME = "summary.json"
+RESULT_SUFFIX = ".result.json"
+
+
+@dataclass
+class GroupResult:
+    source: str
+    output: str
+    ok: bool
+    people: int = 0
+    expenses: int = 0
+    transactions: int = 0
+    transferred: Dict[str, str] = field(default_factory=dict)  # currency -> total settled
+    error: Optional[str] = None
+
+
+def find_group_files(source: str | Path, exclude: Optional[str | Path] = None) -> List[Path]:
+    """Group files in a directory (non-recursive) or matching a glob pattern, sorted.
+
+    Earlier batch output (`*.result.json`, `summary.json`) and anything under the `exclude`
+    directory are skipped, so a rerun never treats its own results as groups.
+    """
+    path = Path(source)
+    if path.is_dir():
+        candidates: Iterable[Path] = path.iterdir()
+    else:
+        candidates = (Path(p) for p in glob.glob(str(source), recursive=True))
+    skip = Path(exclude).resolve() if exclude is not None else None
+    return sorted(
+        p for p in candidates
+        if p.is_file()
+        and p.suffix.lower() in GROUP_SUFFIXES
+        and not _is_output(p.name)
+        and (skip is None or skip not in p.resolve().parents)
+    )
+
+
+def _is_output(name: str) -> bool:
+    name = name.lower()
+    return name == SUMMARY_NAME or name.endswith(RESULT_SUFFIX)
+
+
+def settle_group(
+    job: Tuple[str, str], engine: str = "decimal", strategy: str = "greedy", budget_ms: float = EXACT_BUDGET_MS
+) -> GroupResult:
+    """Balance and settle one group file, writing its result JSON; errors are captured."""
+    source, output = job
+    try:
+        stream = stream_json(source)
+        people = normalize_people(stream.people)
+        counted = _Counter(stream)
+        partitions = compute_balances_by_currency(people, counted, engine=engine)
+
+        settlements = {}
+        transferred = {}
+        for currency in sorted(partitions):
+            settlement = optimize_settlements(partitions[currency], strategy=strategy, budget_ms=budget_ms)
+            settlements[currency] = [
+                {"payer": t.payer, "payee": t.payee, "amount": str(t.amount)} for t in settlement.transactions
+            ]
+            transferred[currency] = str(sum((t.amount for t in settlement.transactions), D("0")))
+
+        document = {
+            "source": source,
+            "balances": {c: {p: str(v) for p, v in b.items()} for c, b in sorted(partitions.items())},
+            "settlements": settlements,
+        }
+        Path(output).write_text(json.dumps(document, indent=2, ensure_ascii=False), encoding="utf-8")
+        return GroupResult(
+            source=source,
+            output=output,
+            ok=True,
+            people=len(people) or len({p for b in partitions.values() for p in b}),
+            expenses=counted.count,
+            transactions=sum(len(s) for s in settlements.values()),
+            transferred=transferred,
+        )
+    except Exception as exc:  # one bad group must not abort the batch
+        return GroupResult(source=source, output=output, ok=False, error=f"{type(exc).__name__}: {exc}")
+
+
+def run_batch(
+    paths: Sequence[str | Path],
+    out_dir: str | Path,
+    workers: Optional[int] = None,
+    chunk_size: int = 16,
+    engine: str = "decimal",
+    strategy: str = "greedy",
+    budget_ms: float = EXACT_BUDGET_MS,
+) -> Dict[str, object]:
+    """Settle every file in `paths` into `out_dir` and write `summary.json` there.
+
+    `workers=1` runs in-process; otherwise a ProcessPoolExecutor with `workers` processes
+    (default: CPU count) receives files in chunks of `chunk_size`.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    jobs = list(zip((str(p) for p in paths), _output_names(paths, out)))
+    settle = partial(settle_group, engine=engine, strategy=strategy, budget_ms=budget_ms)
+
+    start = time.perf_counter()
+    if workers == 1 or len(jobs) <= 1:
+        results = [settle(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(settle, jobs, chunksize=max(1, chunk_size)))
+    elapsed = time.perf_counter() - start
+
+    summary = _summarize(results, elapsed)
+    (out / SUMMARY_NAME).write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    return summary
+
+
+def unique_stems(paths: Sequence[str | Path]) -> List[str]:
+    """File stems, with repeats renamed `<stem>-2`, `<stem>-3`, ... avoiding every other stem.
+
+    Real stems are reserved first, so `a-2.json`, `a.json`, `a.ndjson` give `a-2`, `a`, `a-3`.
+    """
+    stems = [Path(p).stem for p in paths]
+    taken = set(stems)
+    used: Set[str] = set()
+    last: Dict[str, int] = {}
+    names: List[str] = []
+    for stem in stems:
+        name = stem
+        if name in used:
+            n = last.get(stem, 1)
+            while name in used or name in taken:
+                n += 1
+                name = f"{stem}-{n}"
+            last[stem] = n
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _output_names(paths: Sequence[str | Path], out: Path) -> List[str]:
+    return [str(out / f"{stem}{RESULT_SUFFIX}") for stem in unique_stems(paths)]
+
+
+def _summarize(results: List[GroupResult], elapsed: float) -> Dict[str, object]:
+    ok = [r for r in results if r.ok]
+    transferred: Dict[str, Decimal] = {}
+    for r in ok:
+        for currency, amount in r.transferred.items():
+            transferred[currency] = transferred.get(currency, D("0")) + D(amount)
+    return {
+        "groups": len(results),
+        "succeeded": len(ok),
+        "failed": len(results) - len(ok),
+        "expenses": sum(r.expenses for r in ok),
+        "transactions": sum(r.transactions for r in ok),
+        "transferred": {c: str(v) for c, v in sorted(transferred.items())},
+        "seconds": round(elapsed, 3),
+        "errors": [{"source": r.source, "error": r.error} for r in results if not r.ok],
+        "results": [asdict(r) for r in results],
+    }
+
+
+class _Counter:
+    """Pass-through iterable that counts the expenses streamed through it."""
+
+    def __init__(self, items: Iterable) -> None:
+        self._items = items
+        self.count = 0
+
+    def __iter__(self):
+        for item in self._items:
+            self.count += 1
+            yield item
\ No newline at end of file
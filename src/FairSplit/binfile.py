@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: binfile.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Binary columnar ledger format (`.fsb`). An ExpenseTable is written as one file of
+fixed-width little-endian columns that `load_binary` memory-maps and exposes without
+parsing or copying, so reopening a large ledger costs a header read, not a JSON parse.
+
+Usage:
+from fairsplit.binfile import dump_binary, load_binary, json_to_binary
+json_to_binary("trip.json", "trip.fsb")
+people, table = load_binary("trip.fsb")
+
+Notes:
+- Layout: 48-byte header (magic, version, counts), a section directory of
+  (offset, nbytes) pairs, then 8-byte aligned sections in `SECTIONS` order.
+- Names, currencies and descriptions are stored as offset + UTF-8 blob pairs and
+  decoded on load; numeric columns stay on the mapping as typed memoryviews.
+- Version 2 added the `timestamp` column; version 1 files still load, as undated rows.
+- On big-endian hosts the numeric columns are copied and byte-swapped instead.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from contextlib import ExitStack
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Sequence, Tuple
+
+from .table import COLUMNS, NO_TIMESTAMP, ExpenseTable
+
+MAGIC = b"FSPL"
+VERSION = 2
+BINARY_SUFFIXES = (".fsb",)
+
+# magic, version, flags, rows, beneficiary slots, people, currencies, descriptions
+_HEADER = struct.Struct("<4sHHQQQQQ")
+_SECTION = struct.Struct("<QQ")
+_ALIGN = 8
+
+_STRINGS = ("people", "currencies", "desc_texts")
+SECTIONS = tuple(f"{name}_{part}" for name in _STRINGS for part in ("offsets", "blob")) + tuple(COLUMNS)
+_V1_SECTIONS = tuple(name for name in SECTIONS if name != "timestamp")
+_LITTLE = sys.byteorder == "little"
+
+
+def dump_binary(path: str | Path, people: Sequence[str], table: ExpenseTable) -> None:
+    """Write `table` (and the `people` roster, which comes first in the name table) to `path`."""
+    roster = set(people)
+    names = list(people) + [p for p in table.people if p not in roster]
+    if names != list(table.people):
+        table = ExpenseTable.from_expenses(names, table)
+
+    sections: List[bytes | memoryview] = []
+    for strings in (table.people.names, table.currencies, table.desc_texts):
+        sections.extend(_pack_strings(strings))
+    for name, typecode in COLUMNS.items():
+        sections.append(_column_bytes(getattr(table, name), typecode))
+
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        len(table),
+        len(table.beneficiaries),
+        len(table.people),
+        len(table.currencies),
+        len(table.desc_texts),
+    )
+    offset = _aligned(_HEADER.size + _SECTION.size * len(sections))
+    directory = []
+    for data in sections:
+        directory.append(_SECTION.pack(offset, len(data)))
+        offset = _aligned(offset + len(data))
+
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(b"".join(directory))
+        for data in sections:
+            _pad(f)
+            f.write(data)
+
+
+def load_binary(path: str | Path) -> Tuple[List[str], ExpenseTable]:
+    """Memory-map `path` and return (people, read-only ExpenseTable over the mapping)."""
+    with open(path, "rb") as f:
+        size = f.seek(0, 2)
+        if size < _HEADER.size:
+            raise ValueError(f"{path}: not a FairSplit binary ledger (file too short)")
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # Until the table owns the mapping, every view is released and the mmap closed on error
+    with ExitStack() as stack:
+        stack.enter_context(buf)
+        magic, version, _flags, rows, _slots, n_people, n_currencies, n_descs = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a FairSplit binary ledger (bad magic {magic!r})")
+        if version not in (1, VERSION):
+            raise ValueError(f"{path}: unsupported binary ledger version {version}")
+
+        view = stack.enter_context(memoryview(buf))
+        spans: Dict[str, memoryview] = {}
+        for i, name in enumerate(SECTIONS if version == VERSION else _V1_SECTIONS):
+            offset, nbytes = _SECTION.unpack_from(buf, _HEADER.size + i * _SECTION.size)
+            if offset + nbytes > size:
+                raise ValueError(f"{path}: section {name!r} runs past end of file")
+            spans[name] = stack.enter_context(view[offset : offset + nbytes])
+
+        strings = [
+            _unpack_strings(spans[f"{name}_offsets"], spans[f"{name}_blob"], count)
+            for name, count in zip(_STRINGS, (n_people, n_currencies, n_descs))
+        ]
+        columns = {name: _column_view(spans[name], typecode) for name, typecode in COLUMNS.items() if name in spans}
+        for column in columns.values():
+            if isinstance(column, memoryview):
+                stack.enter_context(column)
+        if "timestamp" not in columns:
+            columns["timestamp"] = array("q", [NO_TIMESTAMP]) * rows
+        if len(columns["amount"]) != rows or len(columns["offsets"]) != rows + 1 or len(columns["timestamp"]) != rows:
+            raise ValueError(f"{path}: column lengths do not match header")
+
+        table = ExpenseTable.from_columns(strings[0], strings[1], strings[2], columns)
+        table.mapping = buf
+        stack.pop_all()
+    return list(strings[0]), table
+
+
+def json_to_binary(src: str | Path, dst: str | Path) -> int:
+    """Convert a JSON/NDJSON document to `.fsb`; returns the number of rows written."""
+    from .io_utils import load_json
+
+    people, table = load_json(src, compact=True)
+    dump_binary(dst, people, table)
+    return len(table)
+
+
+def binary_to_json(src: str | Path, dst: str | Path) -> int:
+    """Convert a `.fsb` ledger back to a JSON document; returns the number of rows written."""
+    from .io_utils import dump_json
+
+    people, table = load_binary(src)
+    dump_json(dst, people, list(table))
+    return len(table)
+
+
+def _pack_strings(strings: Sequence[str]) -> Tuple[memoryview, bytes]:
+    blobs = [s.encode("utf-8") for s in strings]
+    offsets = array("Q", [0])
+    for b in blobs:
+        offsets.append(offsets[-1] + len(b))
+    return _column_bytes(offsets, "Q"), b"".join(blobs)
+
+
+def _unpack_strings(offsets: memoryview, blob: memoryview, count: int) -> List[str]:
+    ends = _column_view(offsets, "Q").tolist()  # no view left behind to pin the mapping
+    if len(ends) != count + 1:
+        raise ValueError("string table length does not match header")
+    data = bytes(blob)
+    return [data[ends[i] : ends[i + 1]].decode("utf-8") for i in range(count)]
+
+
+def _column_bytes(column: Sequence[int], typecode: str) -> memoryview:
+    if not isinstance(column, array) or column.typecode != typecode:
+        column = array(typecode, column)
+    if not _LITTLE:
+        column = array(typecode, column)
+        column.byteswap()
+    return memoryview(column).cast("B")
+
+
+def _column_view(raw: memoryview, typecode: str) -> Sequence[int]:
+    if _LITTLE:
+        return raw.cast(typecode)
+    column = array(typecode, bytes(raw))
+    column.byteswap()
+    return column
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _pad(f: BinaryIO) -> None:
+    f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
\ No newline at end of file
@@ -18,58 +18,587 @@ python -m fairsplit  # or `fairsplit`
 
 Notes:
 - Pretty output via `rich`.
+- Startup stays cheap: rich, NumPy, SQLite, the binary/FX/JSON readers and cProfile are
+  imported inside the commands (and branches) that use them, and the Console is created
+  on first use. `tests/test_startup.py` enforces an import-time budget.
 
 =================================================================================================================
 """
 from __future__ import annotations
 
+import signal
+import sys
 from decimal import Decimal
-from typing import Optional
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
 
 import typer
-from rich.console import Console
-from rich import box
 
-from .io_utils import load_json
-from .ledger import compute_balances
-from .models import Expense
+from .ledger import ENGINES, compute_balances, compute_balances_by_currency
+from .models import Expense, parse_timestamp
 from .money import D
-from .optimizer import optimize_settlements
+from .output import FORMATS, open_writer
+from .optimizer import EXACT_BUDGET_MS, STRATEGIES, Settlement, optimize_settlements
+from .profiling import NULL_PROFILER, Profiler, activate
 from .utils import make_table, normalize_people
 
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from .flow import FlowNetwork
+    from .result_cache import ResultCache
+
 app = typer.Typer(add_completion=False, help="FairSplit – Optimized cost sharing calculator")
-console = Console()
+
+BINARY_SUFFIXES = (".fsb",)  # mirrors binfile.BINARY_SUFFIXES
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")  # mirrors sqlite_store.SQLITE_SUFFIXES
+
+_console: Optional[Console] = None
+
+
+def get_console() -> Console:
+    """The shared stdout Console, created on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
 
 
 @app.command()
 def file(
-    input: str = typer.Option("", "--input", "-i", help="Path to JSON input file"),
+    input: str = typer.Option("", "--input", "-i", help="Path to JSON, NDJSON, binary (.fsb) or SQLite (.db) input"),
     optimize: bool = typer.Option(True, "--optimize/--no-optimize", help="Optimize settlements"),
+    engine: str = typer.Option("decimal", "--engine", help="Ledger engine: decimal or minor"),
+    strategy: str = typer.Option(
+        "greedy", "--strategy", help="Settlement strategy: greedy, exact, heap or flow (with --network)"
+    ),
+    budget_ms: float = typer.Option(
+        EXACT_BUDGET_MS, "--budget-ms", help="Time budget for the exact strategy before falling back to greedy"
+    ),
+    base: Optional[str] = typer.Option(
+        None, "--base", help="Settle everything in this currency instead of per currency"
+    ),
+    fx: Optional[str] = typer.Option(None, "--fx", help="Path to FX rates JSON (required with --base)"),
+    profile: Optional[str] = typer.Option(
+        None, "--profile", help="Write a JSON report of per-stage timings and counters to this path"
+    ),
+    cprofile: Optional[str] = typer.Option(None, "--cprofile", help="Also run under cProfile and dump stats here"),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format: table, json, ndjson or csv"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Write the report here instead of stdout"),
+    since: Optional[str] = typer.Option(
+        None, "--since", help="Only expenses at or after this ISO 8601 date/time (net change over the period)"
+    ),
+    until: Optional[str] = typer.Option(None, "--until", help="Only expenses before this ISO 8601 date/time"),
+    trusted: bool = typer.Option(
+        False, "--trusted", help="Skip per-expense validation of JSON input (files already checked or exported by us)"
+    ),
+    network: Optional[str] = typer.Option(
+        None, "--network", help="Payment network JSON (allowed channels, fees, caps) for --strategy flow"
+    ),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Reuse results for unchanged inputs from the on-disk result cache"
+    ),
+    cache_dir: Optional[str] = typer.Option(
+        None, "--cache-dir", help="Result cache directory (default: $XDG_CACHE_HOME/fairsplit or ~/.cache/fairsplit)"
+    ),
+    cache_max_mb: int = typer.Option(64, "--cache-max-mb", help="Evict least recently used results beyond this size"),
 ) -> None:
     if not input:
         typer.echo("--input is required when using 'file' command.")
         raise typer.Exit(code=2)
 
-    people, expenses = load_json(input)
-    people = normalize_people(people)
+    if engine not in ENGINES:
+        typer.echo(f"--engine must be one of: {', '.join(ENGINES)}")
+        raise typer.Exit(code=2)
+    if strategy not in STRATEGIES:
+        typer.echo(f"--strategy must be one of: {', '.join(STRATEGIES)}")
+        raise typer.Exit(code=2)
+    if fmt not in FORMATS:
+        typer.echo(f"--format must be one of: {', '.join(FORMATS)}")
+        raise typer.Exit(code=2)
+    if network and strategy != "flow":
+        typer.echo("--network only applies to --strategy flow")
+        raise typer.Exit(code=2)
+    for flag, value in (("--since", since), ("--until", until)):
+        if value is not None:
+            try:
+                parse_timestamp(value)
+            except ValueError as exc:
+                typer.echo(f"{flag}: {exc}")
+                raise typer.Exit(code=2) from None
 
-    balances = compute_balances(people, expenses)
+    cache = None
+    if use_cache:
+        from .result_cache import ResultCache
 
-    table = make_table("Balances", ["Person", "Balance"])
-    for p in people:
-        table.add_row(p, str(balances[p]))
-    console.print(table)
+        cache = ResultCache(cache_dir, max_bytes=max(cache_max_mb, 0) << 20)
+
+    prof = Profiler() if profile else NULL_PROFILER
+    profiler = None
+    if cprofile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    out = open(output, "w", encoding="utf-8", newline="") if output else sys.stdout
+    with activate(prof):
+        if profiler is not None:
+            profiler.enable()
+        try:
+            _report(
+                input, optimize, engine, strategy, budget_ms, base, fx, prof, fmt, out,
+                since, until, trusted, network, cache,
+            )
+        finally:
+            if output:
+                out.close()
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(cprofile)
+    if profile:
+        prof.dump(profile)
+        typer.echo(f"Stage report written to {profile}", err=True)
+
+
+def _report(
+    input: str,
+    optimize: bool,
+    engine: str,
+    strategy: str,
+    budget_ms: float,
+    base: Optional[str],
+    fx: Optional[str],
+    prof: Profiler,
+    fmt: str,
+    out: TextIO,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    trusted: bool = False,
+    network: Optional[str] = None,
+    cache: Optional[ResultCache] = None,
+) -> None:
+    period = since is not None or until is not None
+    suffix = Path(input).suffix.lower()
+    if base:
+        base = base.upper()
+
+    key = None
+    # SQLite balances are already materialized, and WAL writes change neither the main file nor its stat
+    if cache is not None and suffix not in SQLITE_SUFFIXES:
+        with prof.span("cache"):
+            options = {
+                "suffix": suffix, "optimize": optimize, "engine": engine, "strategy": strategy,
+                "budget_ms": budget_ms, "base": base, "since": since, "until": until, "trusted": trusted,
+                "fx": cache.file_digest(fx) if fx else None,
+                "network": cache.file_digest(network) if network else None,
+            }
+            key = cache.key(input, options)
+            cached = cache.get(key)
+        if cached is not None:
+            prof.count("cache.hits")
+            typer.echo(f"Result cache hit {key[:12]} ({cache.directory})", err=True)
+            for currency, total in cached.fees.items():
+                typer.echo(f"Transfer fees ({currency}): {total}", err=True)
+            stored = cached.settlements
+            replay = (lambda currency, _: stored[currency]) if optimize else None
+            _render(cached.partitions, cached.people, replay, strategy, bool(base), prof, fmt, out)
+            return
+        prof.count("cache.misses")
+
+    if suffix in SQLITE_SUFFIXES:
+        from .sqlite_store import SqliteLedger
+
+        # Balances are materialized in the database; only a period report replays expenses
+        with prof.span("balances"), SqliteLedger(input) as db:
+            people = normalize_people(db.people())
+            if period:
+                partitions = _period_balances(people, db.expenses(), since, until)
+            else:
+                partitions = db.balances_by_currency()
+    else:
+        # Expenses are streamed straight into the ledger (or read off a mapped binary file);
+        # nothing holds the full list
+        with prof.span("open_input"):
+            if suffix in BINARY_SUFFIXES:
+                from .binfile import load_binary
+
+                roster, expenses = load_binary(input)
+            else:
+                from .io_utils import stream_json
+
+                expenses = stream_json(input, trusted=trusted)
+                roster = expenses.people
+        with prof.span("normalize_people"):
+            people = normalize_people(roster)
+        # includes the read.* spans: expenses are parsed while balances accumulate
+        with prof.span("balances"):
+            if period:
+                partitions = _period_balances(people, expenses, since, until)
+            else:
+                partitions = compute_balances_by_currency(people, expenses, engine=engine)
+    if not people:  # NDJSON log without a people header
+        people = sorted({p for balances in partitions.values() for p in balances})
+
+    if base:
+        currencies = set(partitions) - {base}
+        if currencies and not fx:
+            typer.echo(f"--fx is required to convert {', '.join(sorted(currencies))} into {base}.")
+            raise typer.Exit(code=2)
+        from .fx import FxRates, load_rates
+
+        with prof.span("fx"):
+            rates = load_rates(fx) if fx else FxRates.from_mapping(base, {})
+            partitions = {base: rates.convert_balances(partitions, base)}
+    if not partitions:
+        partitions = {"USD": compute_balances(people, [])}
+
+    constraints = None
+    if network:
+        from .flow import load_network
+
+        constraints = load_network(network)
+
+    settlements: Dict[str, Settlement] = {}
+    fees: Dict[str, Decimal] = {}
+
+    def settle(currency: str, balances: Dict[str, Decimal]) -> Settlement:
+        with prof.span("optimize"):
+            if constraints is not None:
+                settlement, fees[currency] = _settle_flow(currency, balances, constraints)
+            else:
+                settlement = optimize_settlements(balances, strategy=strategy, budget_ms=budget_ms)
+        settlements[currency] = settlement
+        return settlement
+
+    _render(partitions, people, settle if optimize else None, strategy, bool(base), prof, fmt, out)
+
+    if cache is not None and key is not None:
+        from .result_cache import CachedReport
+
+        with prof.span("cache"):
+            cache.put(key, CachedReport(people, partitions, settlements, fees))
+        typer.echo(f"Result cache miss; stored {key[:12]} ({cache.directory})", err=True)
+
+
+def _settle_flow(
+    currency: str, balances: Dict[str, Decimal], constraints: FlowNetwork
+) -> Tuple[Settlement, Decimal]:
+    """Cheapest plan within `constraints` and its fees; reports the fees, exits 1 if it cannot settle."""
+    from .flow import InfeasibleSettlement, settle_flow
+
+    try:
+        transactions, fees = settle_flow(balances, constraints)
+    except InfeasibleSettlement as exc:
+        typer.echo(f"{currency}: {exc}", err=True)
+        raise typer.Exit(code=1) from None
+    typer.echo(f"Transfer fees ({currency}): {fees}", err=True)
+    return Settlement(transactions=transactions, strategy="flow"), fees
+
+
+def _period_balances(
+    people: List[str], expenses: Iterable[Expense], since: Optional[str], until: Optional[str]
+) -> Dict[str, Dict[str, Decimal]]:
+    """Net balance change over [since, until) through a snapshot index (minor engine)."""
+    from .snapshots import SnapshotIndex
+
+    index = SnapshotIndex(people, expenses)
+    if index.undated:
+        typer.echo(f"{index.undated} expenses without a timestamp were left out of the period.", err=True)
+    return index.between(since, until)
+
+
+def _render(
+    partitions: Dict[str, Dict[str, Decimal]],
+    people: List[str],
+    settle: Optional[Callable[[str, Dict[str, Decimal]], Settlement]],
+    strategy: str,
+    titled: bool,
+    prof: Profiler,
+    fmt: str,
+    out: TextIO,
+) -> None:
+    """Print balances (and, with `settle`, settlements) per currency in `fmt`."""
+    if fmt != "table":
+        # Machine-readable formats stream rows straight to `out`; no rich tables are built
+        with open_writer(fmt, out) as writer:
+            for currency in sorted(partitions):
+                balances = partitions[currency]
+                with prof.span("render"):
+                    writer.balances(currency, ((p, balances.get(p, D("0"))) for p in people))
+                if settle is not None:
+                    settlement = settle(currency, balances)
+                    if settlement.strategy != strategy:
+                        typer.echo(f"{strategy} search exceeded its budget; using the greedy plan.", err=True)
+                    with prof.span("render"):
+                        writer.settlements(currency, settlement.transactions)
+        return
+
+    if out is sys.stdout:
+        screen = get_console()
+    else:
+        from rich.console import Console
+
+        screen = Console(file=out)
+    for currency in sorted(partitions):
+        suffix = f" ({currency})" if len(partitions) > 1 or titled else ""
+        balances = partitions[currency]
+
+        with prof.span("render"):
+            table = make_table(f"Balances{suffix}", ["Person", "Balance"])
+            for p in people:
+                table.add_row(p, str(balances.get(p, D("0"))))
+            screen.print(table)
+
+        if settle is not None:
+            settlement = settle(currency, balances)
+            with prof.span("render"):
+                if settlement.strategy != strategy:
+                    screen.print(f"[yellow]{strategy} search exceeded its budget; showing the greedy plan.[/]")
+                t = make_table(f"Optimized Settlements{suffix}", ["Payer", "Payee", "Amount"])
+                for tx in settlement.transactions:
+                    t.add_row(tx.payer, tx.payee, str(tx.amount))
+                screen.print(t)
+
+
+@app.command()
+def batch(
+    source: str = typer.Argument(..., help="Directory or glob of group JSON/NDJSON files"),
+    output: str = typer.Option("fairsplit-results", "--output", "-o", help="Directory for per-group results"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", help="Worker processes (default: CPU count)"),
+    chunk_size: int = typer.Option(16, "--chunk-size", help="Files handed to a worker at a time"),
+    engine: str = typer.Option("decimal", "--engine", help="Ledger engine: decimal or minor"),
+    strategy: str = typer.Option("greedy", "--strategy", help="Settlement strategy: greedy, exact, heap or flow"),
+    budget_ms: float = typer.Option(EXACT_BUDGET_MS, "--budget-ms", help="Time budget for the exact strategy"),
+) -> None:
+    from .batch import SUMMARY_NAME, find_group_files, run_batch
+
+    if engine not in ENGINES or strategy not in STRATEGIES:
+        typer.echo(f"--engine must be one of {', '.join(ENGINES)}; --strategy one of {', '.join(STRATEGIES)}")
+        raise typer.Exit(code=2)
+
+    paths = find_group_files(source, exclude=output)
+    if not paths:
+        typer.echo(f"No group files found for {source!r}.")
+        raise typer.Exit(code=2)
+
+    summary = run_batch(
+        paths, output, workers=workers, chunk_size=chunk_size, engine=engine, strategy=strategy, budget_ms=budget_ms
+    )
+    typer.echo(
+        f"Settled {summary['succeeded']}/{summary['groups']} groups "
+        f"({summary['transactions']} transactions) in {summary['seconds']}s; "
+        f"summary: {Path(output) / SUMMARY_NAME}"
+    )
+    for err in summary["errors"]:
+        typer.echo(f"  failed: {err['source']}: {err['error']}", err=True)
+    if summary["failed"]:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def net(
+    source: str = typer.Argument(..., help="Directory or glob of group JSON/NDJSON files"),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", help="Worker processes for group balances (default: CPU count; 0 = inline)"
+    ),
+    chunk_size: int = typer.Option(64, "--chunk-size", help="Files handed to a worker at a time"),
+    strategy: str = typer.Option("heap", "--strategy", help="Settlement strategy: greedy, exact, heap or flow"),
+    budget_ms: float = typer.Option(EXACT_BUDGET_MS, "--budget-ms", help="Time budget for the exact strategy"),
+    fmt: str = typer.Option("ndjson", "--format", "-f", help="Output format: ndjson or table"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Write the transfers here instead of stdout"),
+) -> None:
+    """Net balances across many groups and settle each person's total once."""
+    import json
+
+    from .batch import find_group_files
+    from .netting import consolidate_files
+
+    if strategy not in STRATEGIES:
+        typer.echo(f"--strategy must be one of: {', '.join(STRATEGIES)}")
+        raise typer.Exit(code=2)
+    if fmt not in ("ndjson", "table"):
+        typer.echo("--format must be one of: ndjson, table")
+        raise typer.Exit(code=2)
+    paths = find_group_files(source)
+    if not paths:
+        typer.echo(f"No group files found for {source!r}.")
+        raise typer.Exit(code=2)
+
+    try:
+        result = consolidate_files(paths, workers=workers, chunk_size=chunk_size, strategy=strategy, budget_ms=budget_ms)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        typer.echo(f"Could not net groups: {type(exc).__name__}: {exc}", err=True)
+        raise typer.Exit(code=1) from None
+
+    out = open(output, "w", encoding="utf-8", newline="") if output else sys.stdout
+    try:
+        if fmt == "ndjson":
+            for t in result.transfers:
+                tx = t.transaction
+                record = {
+                    "type": "transfer", "currency": t.currency, "payer": tx.payer, "payee": tx.payee,
+                    "amount": str(tx.amount), "groups": {g: str(a) for g, a in t.groups},
+                }
+                out.write(json.dumps(record, ensure_ascii=False))
+                out.write("\n")
+        else:
+            from rich.console import Console
+
+            table = make_table("Net Settlements", ["Currency", "Payer", "Payee", "Amount", "Groups"])
+            for t in result.transfers:
+                tx = t.transaction
+                table.add_row(t.currency, tx.payer, tx.payee, str(tx.amount), ", ".join(f"{g} {a}" for g, a in t.groups))
+            (get_console() if out is sys.stdout else Console(file=out)).print(table)
+    finally:
+        if output:
+            out.close()
+    typer.echo(
+        f"{result.groups} groups, {result.people} people: {len(result.transfers)} transfers "
+        f"instead of up to {result.separate_transfers} settling each group alone",
+        err=True,
+    )
+
+
+@app.command()
+def convert(
+    source: str = typer.Argument(..., help="Input file: JSON/NDJSON, or .fsb to convert back to JSON"),
+    target: str = typer.Argument(..., help="Output file (.fsb or .json)"),
+) -> None:
+    """Convert between JSON/NDJSON documents and the binary columnar format."""
+    from .binfile import binary_to_json, json_to_binary
+
+    src_binary = Path(source).suffix.lower() in BINARY_SUFFIXES
+    dst_binary = Path(target).suffix.lower() in BINARY_SUFFIXES
+    if src_binary == dst_binary:
+        typer.echo("Exactly one of SOURCE and TARGET must be a binary (.fsb) file.")
+        raise typer.Exit(code=2)
+    rows = binary_to_json(source, target) if src_binary else json_to_binary(source, target)
+    typer.echo(f"Wrote {rows} expenses to {target}")
+
+
+@app.command()
+def validate(
+    source: str = typer.Argument(..., help="JSON or NDJSON file of expenses to check"),
+    limit: int = typer.Option(50, "--limit", help="Print at most this many issues (0 for all)"),
+) -> None:
+    """Check every expense in a file and report all problems, not just the first."""
+    from .validation import validate_file
+
+    issues = validate_file(source)
+    for issue in issues[: limit or None]:
+        typer.echo(f"{source}: {issue}")
+    if len(issues) > limit > 0:
+        typer.echo(f"... and {len(issues) - limit} more")
+    if issues:
+        typer.echo(f"{len(issues)} issue(s) found", err=True)
+        raise typer.Exit(code=1)
+    typer.echo(f"{source}: OK")
+
+
+@app.command()
+def ingest(
+    source: str = typer.Argument(..., help="JSON or NDJSON file of expenses to append"),
+    database: str = typer.Argument(..., help="SQLite ledger to append to (created if missing)"),
+    chunk_size: int = typer.Option(10_000, "--chunk-size", help="Expenses inserted per transaction"),
+) -> None:
+    """Append expenses to a persistent SQLite ledger, updating its stored balances."""
+    from .io_utils import stream_json
+    from .sqlite_store import SqliteLedger
+
+    stream = stream_json(source)
+    added = 0
+    with SqliteLedger(database) as db:
+        db.add_people(stream.people)
+        expenses = iter(stream)
+        while chunk := list(islice(expenses, chunk_size)):
+            added += len(db.add_expenses(chunk))
+        total = len(db)
+    typer.echo(f"Added {added} expenses to {database} ({total} total)")
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to listen on"),
+    port: int = typer.Option(8750, "--port", "-p", help="TCP port"),
+    data_dir: str = typer.Option("fairsplit-groups", "--data-dir", help="Directory holding one NDJSON log per group"),
+    max_groups: int = typer.Option(128, "--max-groups", help="Groups kept hot in memory (LRU)"),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", help="Settlement worker processes (default: CPU count; 0 = in a thread)"
+    ),
+) -> None:
+    """Serve balances and settlements over local HTTP/JSON."""
+    from .server import serve as run_server
+
+    typer.echo(f"FairSplit service on http://{host}:{port} (data: {data_dir})", err=True)
+    try:
+        run_server(host, port, data_dir, max_groups, workers)
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command()
+def watch(
+    log: str = typer.Argument(..., help="Append-only NDJSON expense log to follow"),
+    checkpoint: Optional[str] = typer.Option(
+        None, "--checkpoint", help="Checkpoint file (default: <log>.checkpoint.json)"
+    ),
+    strategy: str = typer.Option("greedy", "--strategy", help="Settlement strategy: greedy, exact, heap or flow"),
+    budget_ms: float = typer.Option(EXACT_BUDGET_MS, "--budget-ms", help="Time budget for the exact strategy"),
+    debounce: float = typer.Option(1.0, "--debounce", help="Seconds without new lines before re-settling"),
+    max_wait: Optional[float] = typer.Option(
+        None, "--max-wait", help="Re-settle at least this often under a continuous feed (default: 10x debounce)"
+    ),
+    poll_interval: float = typer.Option(0.25, "--poll-interval", help="Seconds between checks of the log"),
+    checkpoint_interval: float = typer.Option(5.0, "--checkpoint-interval", help="Seconds between checkpoints"),
+    fmt: str = typer.Option("ndjson", "--format", "-f", help="Output format: table, json, ndjson or csv"),
+    once: bool = typer.Option(False, "--once", help="Apply what is in the log, print settlements and exit"),
+    replan: bool = typer.Option(
+        False, "--replan", help="Recompute the plan with --strategy on every change instead of patching it"
+    ),
+) -> None:
+    """Follow an expense log and print settlements whenever balances change."""
+    from .watch import LogWatcher
+
+    if strategy not in STRATEGIES:
+        typer.echo(f"--strategy must be one of: {', '.join(STRATEGIES)}")
+        raise typer.Exit(code=2)
+    if fmt not in FORMATS:
+        typer.echo(f"--format must be one of: {', '.join(FORMATS)}")
+        raise typer.Exit(code=2)
+
+    watcher = LogWatcher(
+        log,
+        checkpoint=checkpoint or f"{log}.checkpoint.json",
+        strategy=strategy,
+        budget_ms=budget_ms,
+        debounce=debounce,
+        max_wait=max_wait,
+        checkpoint_interval=checkpoint_interval,
+        incremental=not replan,
+        on_warning=lambda message: typer.echo(message, err=True),
+    )
+
+    def show(partitions: Dict[str, Dict[str, Decimal]], settlements: Dict[str, Settlement]) -> None:
+        people = normalize_people(list(watcher.people))
+        _render(partitions, people, lambda c, b: settlements[c], strategy, False, NULL_PROFILER, fmt, sys.stdout)
+
+    def interrupt(signum: int, frame: object) -> None:
+        raise KeyboardInterrupt
 
-    if optimize:
-        settlement = optimize_settlements(balances)
-        t = make_table("Optimized Settlements", ["Payer", "Payee", "Amount"])
-        for tx in settlement.transactions:
-            t.add_row(tx.payer, tx.payee, str(tx.amount))
-        console.print(t)
+    # SIGTERM unwinds like Ctrl-C so the final checkpoint is still written
+    signal.signal(signal.SIGTERM, interrupt)
+    try:
+        watcher.run(show, poll_interval=poll_interval, once=once)
+    except KeyboardInterrupt:
+        pass
+    typer.echo(f"{watcher.expenses} expenses applied, {watcher.skipped} skipped (offset {watcher.offset})", err=True)
 
 
 @app.command()
 def wizard() -> None:
+    console = get_console()
     console.rule("[bold]Interactive Wizard")
     n = typer.prompt("How many people?", type=int)
     people = [typer.prompt(f"Person #{i+1} name") for i in range(n)]
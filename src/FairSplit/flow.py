@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: flow.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Constrained settlement as a min-cost flow problem. Debtors supply their debt, creditors
+demand their credit, and money may only move along allowed channels (payer -> payee,
+with a fee rate and an optional capacity) or within shared payment networks; people can
+cap how much they pay out in total. The cheapest plan that settles every balance is found
+with successive shortest paths (primal-dual: Dijkstra on reduced costs, then a blocking
+flow over every shortest path at once).
+
+Usage:
+from fairsplit.flow import Channel, FlowNetwork, PaymentNetwork, load_network
+network = FlowNetwork(
+    channels=[Channel("Ali", "Sara", fee_rate=Decimal("0.01"), capacity=Decimal("200"))],
+    networks=[PaymentNetwork("bank", ["Sara", "Omid", "Reza"])],
+    max_outflow={"Sara": Decimal("500")},
+)
+optimize_settlements(balances, strategy="flow", network=network)
+transactions, fees = settle_flow(balances, network)
+
+Notes:
+- Amounts flow in integer minor units. Fees are proportional (`fee_rate` of the amount,
+  charged to the sender); a fixed charge per transfer would make the problem NP-hard.
+- Among plans with the lowest total fee, the one moving the least money (fewest hops
+  through intermediaries) is chosen, so free direct payments are preferred over routes.
+- A payment network is a hub node: members pay into it at the network's fee rate and it
+  pays out to members for free, so k members cost 2k edges instead of k^2. Flow through a
+  hub is paired up into member-to-member transfers afterwards.
+- `max_outflow` caps everything a person sends, their own debt plus money they pass on.
+- Balances that cannot be settled under the constraints raise `InfeasibleSettlement`.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .models import Transaction
+from .money import D, from_minor, quantize, to_minor
+
+_PPM = 1_000_000  # fee rates are resolved to millionths
+_S, _T = 0, 1  # super source and sink
+
+
+@dataclass(frozen=True)
+class Channel:
+    """`payer` may pay `payee` directly."""
+
+    payer: str
+    payee: str
+    fee_rate: Decimal = Decimal(0)  # fraction of the amount, e.g. 0.015
+    capacity: Optional[Decimal] = None  # most that may move over this channel; None for no limit
+
+
+@dataclass(frozen=True)
+class PaymentNetwork:
+    """Every member may pay every other member (a shared bank or payment app)."""
+
+    name: str
+    members: Sequence[str]
+    fee_rate: Decimal = Decimal(0)
+
+
+class InfeasibleSettlement(ValueError):
+    """Raised when the constraints leave some balances unsettled."""
+
+    def __init__(self, unsettled: Dict[str, Decimal]) -> None:
+        self.unsettled = unsettled  # person -> balance still open (negative: debt, positive: credit)
+        total = sum(v for v in unsettled.values() if v > 0)
+        super().__init__(f"Balances cannot be settled under these constraints: {total} left unsettled")
+
+
+@dataclass
+class FlowNetwork:
+    channels: Sequence[Channel] = ()
+    networks: Sequence[PaymentNetwork] = ()
+    max_outflow: Mapping[str, Decimal] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        for c in self.channels:
+            if c.payer == c.payee:
+                raise ValueError(f"Channel from {c.payer!r} to itself")
+            if c.fee_rate < 0 or (c.capacity is not None and c.capacity < 0):
+                raise ValueError(f"Channel {c.payer!r} -> {c.payee!r}: fee rate and capacity must be non-negative")
+        for n in self.networks:
+            if n.fee_rate < 0:
+                raise ValueError(f"Payment network {n.name!r}: fee rate must be non-negative")
+        if any(v < 0 for v in self.max_outflow.values()):
+            raise ValueError("max_outflow caps must be non-negative")
+
+    @classmethod
+    def from_obj(cls, obj: Mapping[str, Any]) -> "FlowNetwork":
+        """Build from the JSON form read by `load_network`."""
+        channels: List[Channel] = []
+        for item in obj.get("channels", []):
+            capacity = D(item["capacity"]) if item.get("capacity") is not None else None
+            fee_rate = D(item.get("fee_rate", 0))
+            channels.append(Channel(item["payer"], item["payee"], fee_rate, capacity))
+            if item.get("both_ways"):
+                channels.append(Channel(item["payee"], item["payer"], fee_rate, capacity))
+        networks = [
+            PaymentNetwork(item["name"], list(item["members"]), D(item.get("fee_rate", 0)))
+            for item in obj.get("networks", [])
+        ]
+        max_outflow = {p: D(v) for p, v in obj.get("max_outflow", {}).items()}
+        return cls(channels=channels, networks=networks, max_outflow=max_outflow)
+
+
+def load_network(path: str | Path) -> FlowNetwork:
+    """Read a network file:
+
+    {"channels": [{"payer": "Ali", "payee": "Sara", "fee_rate": "0.01", "capacity": "200", "both_ways": true}],
+     "networks": [{"name": "bank", "members": ["Sara", "Omid"], "fee_rate": "0"}],
+     "max_outflow": {"Sara": "500"}}
+    """
+    import json
+
+    return FlowNetwork.from_obj(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def settle_flow(balances: Mapping[str, Decimal], network: FlowNetwork) -> Tuple[List[Transaction], Decimal]:
+    """Cheapest settlement of `balances` within `network`; returns (transactions, total fees)."""
+    graph = _Graph(network, {p: to_minor(v) for p, v in balances.items()})
+    graph.solve()
+    return graph.transactions(), graph.fees()
+
+
+class _Graph:
+    """Residual graph in flat lists; edge `e` and its reverse `e ^ 1` are stored side by side."""
+
+    def __init__(self, network: FlowNetwork, cents: Dict[str, int]) -> None:
+        self.cents = {p: v for p, v in cents.items() if v}
+        if sum(self.cents.values()) != 0:
+            raise ValueError("Balances must sum to zero")
+        self.supply = sum(v for v in self.cents.values() if v > 0)
+        self.to: List[int] = []
+        self.cap: List[int] = []
+        self.cost: List[int] = []
+        self.adj: List[List[int]] = [[], []]
+        self.names: List[Optional[str]] = [None, None]  # node -> person (None for source, sink and hubs)
+        self.inbound: Dict[str, int] = {}  # person -> node receiving payments
+        self.outbound: Dict[str, int] = {}  # person -> node sending them (differs when capped)
+        self.rates: Dict[int, Decimal] = {}  # edge -> fee rate, for fee-charging edges
+        self.hubs: List[int] = []
+        self.max_outflow = network.max_outflow
+
+        # Unit cost = fee (millionths) * scale + 1 per edge: fees dominate, volume breaks ties
+        people = set(self.cents).union(
+            (c.payer for c in network.channels), (c.payee for c in network.channels),
+            *(n.members for n in network.networks),
+        )
+        nodes = 2 + len(people) + len(self.max_outflow) + len(network.networks)
+        self.scale = self.supply * nodes + 1  # exceeds any total of per-edge volume terms
+
+        for person, v in self.cents.items():
+            if v < 0:
+                self._add(_S, self._in(person), -v, 0)
+            else:
+                self._add(self._in(person), _T, v, 0)
+        for c in network.channels:
+            cap = self.supply if c.capacity is None else min(to_minor(c.capacity), self.supply)
+            self._add(self._out(c.payer), self._in(c.payee), cap, self._cost(c.fee_rate), c.fee_rate)
+        for n in network.networks:
+            hub = self._node(None)
+            self.hubs.append(hub)
+            cost = self._cost(n.fee_rate)
+            for member in dict.fromkeys(n.members):
+                self._add(self._out(member), hub, self.supply, cost, n.fee_rate)
+                self._add(hub, self._in(member), self.supply, 1)
+
+    # --- construction --------------------------------------------------------------------------
+
+    def _node(self, name: Optional[str]) -> int:
+        self.adj.append([])
+        self.names.append(name)
+        return len(self.adj) - 1
+
+    def _in(self, person: str) -> int:
+        node = self.inbound.get(person)
+        if node is None:
+            node = self.inbound[person] = self._node(person)
+            cap = self.max_outflow.get(person)
+            if cap is None:
+                self.outbound[person] = node
+            else:
+                self.outbound[person] = out = self._node(person)
+                self._add(node, out, min(to_minor(cap), self.supply), 0)
+        return node
+
+    def _out(self, person: str) -> int:
+        self._in(person)
+        return self.outbound[person]
+
+    def _cost(self, fee_rate: Decimal) -> int:
+        return int(quantize(fee_rate * _PPM, Decimal(1))) * self.scale + 1
+
+    def _add(self, u: int, v: int, cap: int, cost: int, fee_rate: Optional[Decimal] = None) -> None:
+        e = len(self.to)
+        self.to += (v, u)
+        self.cap += (cap, 0)
+        self.cost += (cost, -cost)
+        self.adj[u].append(e)
+        self.adj[v].append(e + 1)
+        if fee_rate:
+            self.rates[e] = fee_rate
+
+    # --- solving -------------------------------------------------------------------------------
+
+    def solve(self) -> None:
+        """Successive shortest paths; all costs start non-negative, so zero potentials are valid."""
+        n = len(self.adj)
+        potential = [0] * n
+        flow = 0
+        while flow < self.supply and self._shortest_paths(potential):
+            flow += self._blocking_flow(potential)
+        if flow < self.supply:
+            raise InfeasibleSettlement(self._unsettled())
+
+    def _shortest_paths(self, potential: List[int]) -> bool:
+        """Dijkstra on reduced costs; folds distances into `potential`. False if the sink is cut off."""
+        to, cap, cost, adj = self.to, self.cap, self.cost, self.adj
+        inf = float("inf")
+        dist: List[Any] = [inf] * len(adj)
+        dist[_S] = 0
+        heap = [(0, _S)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if d > dist[_T]:
+                break  # ties with the sink are settled too: zero-cost edges may still lead to it
+            base = d + potential[u]
+            for e in adj[u]:
+                if cap[e]:
+                    v = to[e]
+                    nd = base + cost[e] - potential[v]
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        heapq.heappush(heap, (nd, v))
+        reach = dist[_T]
+        if reach == inf:
+            return False
+        # Unsettled nodes move by the sink's distance, which keeps every reduced cost >= 0
+        for v, d in enumerate(dist):
+            potential[v] += d if d < reach else reach
+        return True
+
+    def _blocking_flow(self, potential: List[int]) -> int:
+        """Dinic over the admissible (zero reduced cost) edges; every path found is a shortest path."""
+        to, cap, cost, full = self.to, self.cap, self.cost, self.adj
+        # Potentials are fixed for the phase, so the admissible edges are too (only capacities
+        # change); each node's list is filtered once, the first time the search reaches it
+        adj: List[Optional[List[int]]] = [None] * len(full)
+
+        def admissible(u: int) -> List[int]:
+            pu = potential[u]
+            edges = adj[u] = [e for e in full[u] if cost[e] + pu == potential[to[e]]]
+            return edges
+
+        total = 0
+        while True:
+            # Levels count hops *to* the sink (edge e ^ 1 enters u whenever e leaves it, and is
+            # admissible with it), so the search below never wanders into nodes that cannot finish
+            rank = [-1] * len(adj)
+            rank[_T] = 0
+            queue = deque([_T])
+            while queue:
+                v = queue.popleft()
+                if 0 <= rank[_S] <= rank[v]:
+                    break
+                edges = adj[v]
+                for e in admissible(v) if edges is None else edges:
+                    u = to[e]
+                    if cap[e ^ 1] and rank[u] < 0:
+                        rank[u] = rank[v] + 1
+                        queue.append(u)
+            if rank[_S] < 0:
+                return total
+
+            nxt = [0] * len(adj)
+            path: List[int] = []
+            u = _S
+            while True:
+                if u == _T:
+                    pushed = min(cap[e] for e in path)
+                    for e in path:
+                        cap[e] -= pushed
+                        cap[e ^ 1] += pushed
+                    total += pushed
+                    cut = next(i for i, e in enumerate(path) if not cap[e])
+                    del path[cut:]
+                    u = to[path[-1]] if path else _S
+                    continue
+                edges = adj[u]
+                if edges is None:
+                    edges = admissible(u)
+                end = len(edges)
+                i = nxt[u]
+                want = rank[u] - 1
+                while i < end:
+                    e = edges[i]
+                    if cap[e] and rank[to[e]] == want:
+                        break
+                    i += 1
+                nxt[u] = i
+                if i < end:
+                    path.append(edges[i])
+                    u = to[edges[i]]
+                elif u == _S:
+                    break
+                else:
+                    rank[u] = -1  # saturated downstream: dead end for this round
+                    e = path.pop()
+                    u = to[e ^ 1]
+                    nxt[u] += 1
+
+    # --- results -------------------------------------------------------------------------------
+
+    def _flows(self) -> Iterable[Tuple[int, int, int]]:
+        """(from node, to node, flow) for every forward edge carrying flow."""
+        to, cap = self.to, self.cap
+        for e in range(0, len(to), 2):
+            if cap[e + 1]:
+                yield to[e + 1], to[e], cap[e + 1]
+
+    def transactions(self) -> List[Transaction]:
+        names = self.names
+        hubs = set(self.hubs)
+        pairs: Dict[Tuple[str, str], int] = {}
+        into: Dict[int, List[List[Any]]] = {h: [] for h in hubs}  # hub -> [[payer, cents], ...]
+        out_of: Dict[int, List[List[Any]]] = {h: [] for h in hubs}
+        for u, v, f in self._flows():
+            if u in hubs:
+                out_of[u].append([names[v], f])
+            elif v in hubs:
+                into[v].append([names[u], f])
+            elif names[u] is not None and names[v] is not None and names[u] != names[v]:
+                pairs[names[u], names[v]] = pairs.get((names[u], names[v]), 0) + f
+        # Money through a hub is conserved, so pairing senders with receivers in order is exact
+        for hub in self.hubs:
+            senders, receivers = into[hub], out_of[hub]
+            i = 0
+            for receiver in receivers:
+                while receiver[1]:
+                    sender = senders[i]
+                    take = min(sender[1], receiver[1])
+                    key = (sender[0], receiver[0])
+                    pairs[key] = pairs.get(key, 0) + take
+                    sender[1] -= take
+                    receiver[1] -= take
+                    if not sender[1]:
+                        i += 1
+        return [
+            Transaction(payer=payer, payee=payee, amount=from_minor(cents))
+            for (payer, payee), cents in pairs.items()
+        ]
+
+    def fees(self) -> Decimal:
+        total = sum((from_minor(self.cap[e + 1]) * rate for e, rate in self.rates.items()), Decimal(0))
+        return quantize(total)
+
+    def _unsettled(self) -> Dict[str, Decimal]:
+        """Residual balances: supply still sitting on the source edges, demand left on sink edges."""
+        left: Dict[str, int] = {}
+        for e in self.adj[_S]:
+            if self.cap[e]:
+                left[self.names[self.to[e]]] = -self.cap[e]
+        for e in self.adj[_T]:
+            if self.cap[e ^ 1]:
+                left[self.names[self.to[e]]] = self.cap[e ^ 1]
+        return {p: from_minor(v) for p, v in left.items()}
\ No newline at end of file
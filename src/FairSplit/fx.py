@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: fx.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Foreign-exchange rates loaded from a local JSON file and held as a precomputed
+conversion matrix, used to fold per-currency balances into one base currency.
+
+Usage:
+from fairsplit.fx import load_rates
+rates = load_rates("rates.json")
+balances = rates.convert_balances(compute_balances_by_currency(people, expenses), "USD")
+
+Notes:
+- File format: {"base": "USD", "rates": {"EUR": "1.08", "JPY": "0.0067"}}, i.e. one unit
+  of each listed currency is worth `rate` units of `base`.
+- Conversion runs once per (currency, person) balance, never per expense.
+- `load_rates` is cached per file path and modification time.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Mapping, Tuple
+
+from .money import D, quantize
+
+
+@dataclass(frozen=True)
+class FxRates:
+    base: str
+    currencies: Tuple[str, ...]
+    matrix: Tuple[Tuple[Decimal, ...], ...]  # matrix[i][j]: one currencies[i] in currencies[j]
+    index: Dict[str, int] = field(default_factory=dict, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not self.index:
+            object.__setattr__(self, "index", {c: i for i, c in enumerate(self.currencies)})
+
+    @classmethod
+    def from_mapping(cls, base: str, rates: Mapping[str, str | int | float | Decimal]) -> "FxRates":
+        pivot = {base.upper(): D("1")}
+        for currency, rate in rates.items():
+            value = D(rate)
+            if value <= 0:
+                raise ValueError(f"FX rate for {currency} must be positive")
+            pivot[currency.upper()] = value
+        currencies = tuple(sorted(pivot))
+        matrix = tuple(tuple(pivot[src] / pivot[dst] for dst in currencies) for src in currencies)
+        return cls(base=base.upper(), currencies=currencies, matrix=matrix)
+
+    def rate(self, src: str, dst: str) -> Decimal:
+        try:
+            return self.matrix[self.index[src.upper()]][self.index[dst.upper()]]
+        except KeyError as exc:
+            raise KeyError(f"No FX rate for {exc.args[0]}") from None
+
+    def convert_balances(
+        self, partitions: Mapping[str, Mapping[str, Decimal]], target: str | None = None
+    ) -> Dict[str, Decimal]:
+        """Fold currency -> person -> balance partitions into one balance map in `target`.
+
+        Amounts are summed unrounded per person and quantized once; any cent of rounding
+        drift goes to the lexicographically first person, as in `compute_balances`.
+        """
+        target = (target or self.base).upper()
+        totals: Dict[str, Decimal] = {}
+        for currency, balances in partitions.items():
+            rate = self.rate(currency, target)
+            for p, amount in balances.items():
+                totals[p] = totals.get(p, Decimal(0)) + amount * rate
+
+        converted = {p: quantize(v) for p, v in totals.items()}
+        drift = quantize(sum(converted.values(), Decimal(0)))
+        if drift != 0:
+            first = min(converted)
+            converted[first] = quantize(converted[first] - drift)
+        return converted
+
+
+def load_rates(path: str | Path) -> FxRates:
+    """Load an FX table, reusing the parsed matrix while the file is unchanged."""
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    return _load_rates(str(resolved), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=8)
+def _load_rates(path: str, mtime_ns: int, size: int) -> FxRates:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return FxRates.from_mapping(data["base"], data.get("rates", {}))
\ No newline at end of file
@@ -14,55 +14,356 @@ Description:
 Load and dump FairSplit JSON documents.
 
 Usage:
-from fairsplit.io_utils import load_json, dump_json
+from fairsplit.io_utils import load_json, dump_json, stream_json
 
 Notes:
 - JSON schema is deliberately simple; validations live in models.
+- `stream_json` parses the `expenses` array incrementally (or an NDJSON log, one expense
+  per line) and yields Expense objects one at a time in constant memory.
+- `load_json(path, compact=True)` returns an array-backed ExpenseTable instead of a list.
+- `trusted=True` (load_json / stream_json) builds expenses with `Expense.unchecked`:
+  no per-object validation, for files we exported ourselves. Check anything else with
+  `validation.validate_file` first, which reports every problem at once.
+- `ExpenseStream.byte_ranges` cuts an NDJSON log into line-aligned byte ranges that
+  `iter_ndjson_range` reads independently (e.g. one per worker process).
 
 =================================================================================================================
 """
 from __future__ import annotations
 
 import json
+import re
+import time
+from contextlib import closing
 from dataclasses import asdict
+from decimal import Decimal
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Optional, Sequence, TextIO, Tuple, overload
 
 from .money import D
-from .models import Expense
+from .models import Expense, parse_timestamp
+from .profiling import current as current_profiler
+from .table import ExpenseTable
 
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+DEFAULT_CHUNK_SIZE = 1 << 16
+_SAMPLE_BYTES = 1 << 20  # read to estimate the average NDJSON line length
 
-def load_json(path: str | Path) -> tuple[List[str], List[Expense]]:
+_WS = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def expense_from_obj(item: Dict[str, Any]) -> Expense:
+    """Build an Expense from its JSON object form (as written by `expense_to_obj`)."""
+    return Expense(
+        desc=item.get("desc", ""),
+        amount=D(item["amount"]),
+        paid_by=item["paid_by"],
+        beneficiaries=list(item["for"]),
+        currency=item.get("currency", "USD"),
+        weights={k: D(v) for k, v in item.get("weights", {}).items()} if item.get("weights") else None,
+        timestamp=item.get("timestamp"),
+    )
+
+
+def trusted_expense_from_obj(item: Dict[str, Any]) -> Expense:
+    """`expense_from_obj` without validation; amounts and weights must be decimal strings or numbers."""
+    weights = item.get("weights")
+    timestamp = item.get("timestamp")
+    return Expense.unchecked(
+        item.get("desc", ""),
+        _decimal(item["amount"]),
+        item["paid_by"],
+        item["for"],
+        item.get("currency", "USD"),
+        {k: _decimal(v) for k, v in weights.items()} if weights else None,
+        parse_timestamp(timestamp) if timestamp is not None else None,
+    )
+
+
+def _decimal(value: Any) -> Decimal:
+    return Decimal(value) if type(value) is str else D(value)
+
+
+def expense_to_obj(e: Expense) -> Dict[str, Any]:
+    """JSON object form of an expense (amounts and weights as decimal strings, timestamp as ISO 8601)."""
+    obj = {
+        "desc": e.desc,
+        "amount": str(e.amount),
+        "currency": e.currency,
+        "paid_by": e.paid_by,
+        "for": list(e.beneficiaries),
+        "weights": {k: str(v) for k, v in (e.weights or {}).items()} or None,
+    }
+    if e.timestamp is not None:
+        obj["timestamp"] = e.timestamp.isoformat()
+    return obj
+
+
+@overload
+def load_json(
+    path: str | Path, compact: Literal[False] = ..., trusted: bool = ...
+) -> tuple[List[str], List[Expense]]: ...
+
+
+@overload
+def load_json(path: str | Path, compact: Literal[True], trusted: bool = ...) -> tuple[List[str], ExpenseTable]: ...
+
+
+def load_json(path: str | Path, compact: bool = False, trusted: bool = False):
+    """Load people and expenses; `compact=True` returns an ExpenseTable built while streaming.
+
+    `trusted=True` skips per-expense validation (see `trusted_expense_from_obj`).
+    """
+    if compact:
+        stream = stream_json(path, trusted=trusted)
+        return stream.people, ExpenseTable.from_expenses(stream.people, stream)
+    if Path(path).suffix.lower() in NDJSON_SUFFIXES:
+        stream = stream_json(path, trusted=trusted)
+        return stream.people, list(stream)
     data = json.loads(Path(path).read_text(encoding="utf-8"))
     people = list(data.get("people", []))
-    expenses: List[Expense] = []
-    for item in data.get("expenses", []):
-        expenses.append(
-            Expense(
-                desc=item.get("desc", ""),
-                amount=D(item["amount"]),
-                paid_by=item["paid_by"],
-                beneficiaries=list(item["for"]),
-                currency=item.get("currency", "USD"),
-                weights={k: D(v) for k, v in item.get("weights", {}).items()} if item.get("weights") else None,
+    build = trusted_expense_from_obj if trusted else expense_from_obj
+    return people, [build(item) for item in data.get("expenses", [])]
+
+
+def stream_json(
+    path: str | Path, ndjson: Optional[bool] = None, chunk_size: int = DEFAULT_CHUNK_SIZE, trusted: bool = False
+) -> "ExpenseStream":
+    """Open a JSON document or NDJSON log for incremental reading (see ExpenseStream)."""
+    return ExpenseStream(path, ndjson=ndjson, chunk_size=chunk_size, trusted=trusted)
+
+
+def iter_ndjson_range(path: str | Path, lo: int, hi: int, trusted: bool = False) -> Iterator[Expense]:
+    """Expenses on the NDJSON lines that start in bytes [lo, hi) of `path` (see ExpenseStream.byte_ranges)."""
+    build = trusted_expense_from_obj if trusted else expense_from_obj
+    with Path(path).open("rb") as fh:
+        fh.seek(lo)
+        pos = lo
+        while pos < hi:
+            line = fh.readline()
+            if not line:
+                return
+            if line.strip():
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"{path}: invalid NDJSON line at byte {pos}: {exc.msg}") from exc
+                yield build(item)
+            pos += len(line)
+
+
+def _profiled_items(
+    items: Iterator[Dict[str, Any]], build: Callable[[Dict[str, Any]], Expense]
+) -> Iterator[Expense]:
+    """Build expenses, timing JSON decoding and Expense validation as separate spans."""
+    prof = current_profiler()
+    clock = time.perf_counter
+    end = object()
+    while True:
+        start = clock()
+        item = next(items, end)
+        decoded = clock()
+        prof.add("read.decode", decoded - start)
+        if item is end:
+            return
+        expense = build(item)
+        prof.add("read.validate", clock() - decoded)
+        yield expense
+
+
+class ExpenseStream:
+    """Expenses of a FairSplit file, parsed lazily and yielded one at a time.
+
+    `people` is read eagerly (cheap when it precedes `expenses`, as `dump_json` writes it).
+    Every iteration re-reads the file, so the stream can be consumed more than once.
+    NDJSON logs hold one expense object per line; an optional first line
+    `{"people": [...]}` provides the people list.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        ndjson: Optional[bool] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        trusted: bool = False,
+    ) -> None:
+        self.path = Path(path)
+        self.ndjson = self.path.suffix.lower() in NDJSON_SUFFIXES if ndjson is None else ndjson
+        self.chunk_size = chunk_size
+        self.trusted = trusted
+        self.build = trusted_expense_from_obj if trusted else expense_from_obj
+        self.people: List[str] = self._read_people()
+
+    def __iter__(self) -> Iterator[Expense]:
+        items = self._ndjson_items() if self.ndjson else self._document_items(lambda _: None)
+        with closing(items):
+            if current_profiler().enabled:
+                yield from _profiled_items(items, self.build)
+                return
+            yield from map(self.build, items)
+
+    def byte_ranges(self, rows: int) -> List[Tuple[int, int]]:
+        """Line-aligned [lo, hi) byte ranges covering an NDJSON log's expenses, about `rows` lines each.
+
+        The people header is left out; read each range with `iter_ndjson_range`.
+        """
+        if not self.ndjson:
+            raise ValueError(f"{self.path}: byte ranges need an NDJSON log")
+        size = self.path.stat().st_size
+        ranges: List[Tuple[int, int]] = []
+        with self.path.open("rb") as fh:
+            start = 0
+            while line := fh.readline():
+                if line.strip():
+                    try:
+                        header = json.loads(line)
+                    except ValueError:
+                        header = None  # reported with its position by whoever reads the range
+                    if is_people_header(header):
+                        start = fh.tell()
+                    break
+            sample = fh.read(_SAMPLE_BYTES)
+            step = max(int(rows * len(sample) / max(sample.count(b"\n"), 1)), 1)
+            lo = start
+            while lo < size:
+                hi = lo + step
+                if hi < size:
+                    fh.seek(hi - 1)
+                    fh.readline()  # finish the line that byte hi - 1 belongs to
+                    hi = fh.tell()
+                ranges.append((lo, min(hi, size)))
+                lo = hi
+        return ranges
+
+    def _read_people(self) -> List[str]:
+        found: List[List[str]] = []
+        if self.ndjson:
+            with self.path.open(encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        header = json.loads(line)
+                        return list(header["people"]) if is_people_header(header) else []
+            return []
+
+        # Stops at the first expense once `people` has been seen; otherwise the
+        # expenses are decoded (but not validated) and skipped until `people` appears.
+        items = self._document_items(found.append)
+        with closing(items):
+            for _ in items:
+                if found:
+                    break
+        return list(found[0]) if found else []
+
+    def _ndjson_items(self) -> Iterator[Dict[str, Any]]:
+        with self.path.open(encoding="utf-8") as fh:
+            first = True
+            for lineno, line in enumerate(fh, 1):
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"{self.path}:{lineno}: invalid NDJSON line: {exc.msg}") from exc
+                if first and is_people_header(item):
+                    first = False
+                    continue
+                first = False
+                yield item
+
+    def _document_items(self, on_people: Callable[[Any], None]) -> Iterator[Dict[str, Any]]:
+        with self.path.open(encoding="utf-8") as fh:
+            sc = _Scanner(fh, self.chunk_size)
+            sc.expect("{")
+            if sc.peek() == "}":
+                return
+            while True:
+                key = sc.value()
+                sc.expect(":")
+                if key == "expenses":
+                    yield from sc.array()
+                else:
+                    value = sc.value()
+                    if key == "people":
+                        on_people(value)
+                if sc.peek() != ",":
+                    break
+                sc.expect(",")
+            sc.expect("}")
+
+
+def is_people_header(obj: Any) -> bool:
+    """True for the optional `{"people": [...]}` first line of an NDJSON log."""
+    return isinstance(obj, dict) and "people" in obj and "amount" not in obj
+
+
+class _Scanner:
+    """Minimal incremental JSON tokenizer over a text file, reading fixed-size chunks."""
+
+    def __init__(self, fh: TextIO, chunk_size: int) -> None:
+        self._fh = fh
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._consumed = 0  # characters dropped from the front of the buffer
+
+    def _fill(self) -> bool:
+        # Read at least as much as is still pending so re-parsing a long value stays linear
+        data = self._fh.read(max(self._chunk_size, len(self._buf) - self._pos))
+        if not data:
+            return False
+        self._consumed += self._pos
+        self._buf = self._buf[self._pos :] + data
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(
+                f"Malformed FairSplit JSON at offset {self._consumed + self._pos}: "
+                f"expected {char!r}, found {found or 'end of file'!r}"
             )
-        )
-    return people, expenses
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as exc:
+                if self._fill():
+                    continue
+                raise ValueError(
+                    f"Malformed FairSplit JSON at offset {self._consumed + exc.pos}: {exc.msg}"
+                ) from exc
+            # A number ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+    def array(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() != ",":
+                break
+            self._pos += 1
+        self.expect("]")
 
 
 def dump_json(path: str | Path, people: Sequence[str], expenses: Iterable[Expense]) -> None:
-    obj = {
-        "people": list(people),
-        "expenses": [
-            {
-                "desc": e.desc,
-                "amount": str(e.amount),
-                "currency": e.currency,
-                "paid_by": e.paid_by,
-                "for": list(e.beneficiaries),
-                "weights": {k: str(v) for k, v in (e.weights or {}).items()} or None,
-            }
-            for e in expenses
-        ],
-    }
+    obj = {"people": list(people), "expenses": [expense_to_obj(e) for e in expenses]}
     Path(path).write_text(json.dumps(obj, indent=2, ensure_ascii=False), encoding="utf-8")
\ No newline at end of file
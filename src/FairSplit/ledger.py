@@ -16,43 +16,452 @@ Positive balance => person is a **creditor** (others owe them).
 Negative balance => person is a **debtor** (they owe others).
 
 Usage:
-from fairsplit.ledger import compute_balances
+from fairsplit.ledger import Ledger, compute_balances, compute_balances_batch
+compute_balances(people, expenses, engine="minor")
 
 Notes:
 - Ensures the sum of balances is ~0 at cent precision.
+- Two engines: "decimal" quantizes every operation; "minor" accumulates integer cents and
+  converts to Decimal only when returning. Both split in the same units (whole yen for
+  JPY, cents for two- and three-digit currencies) and give identical balances.
+- `compute_balances_batch` takes columnar (CSR) input and uses NumPy when installed,
+  falling back to a pure-Python loop with identical results. Weighted inputs whose
+  products could overflow int64 always take the (exact) Python loop.
+- `Ledger` keeps running balances and applies add/remove/edit in O(beneficiaries).
+- Splits go through the shared `models.SPLIT_CACHE` LRU unless `split_cache=None`.
+- `workers=` shards a single huge ExpenseTable/`.fsb` file or NDJSON log across processes
+  (map-reduce of integer totals); see `python benchmarks/bench_parallel.py`.
+- `compute_balances` does not look at currencies; use `compute_balances_by_currency` for
+  mixed-currency ledgers and `fx.FxRates` to fold the partitions into one base currency.
 
 =================================================================================================================
 """
 from __future__ import annotations
 
-from collections import defaultdict
+from collections import deque
+from concurrent.futures import Future
 from decimal import Decimal
-from typing import Dict, Iterable, Sequence
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Sequence, Tuple
 
-from .money import D, quantize
-from .models import Expense
+from .money import D, from_minor, quantize, round_div
+from .models import SPLIT_CACHE, Expense, SplitCache
+from .profiling import current as current_profiler
+from .table import INT64_MAX, ExpenseTable
 
+# Optional vectorized backend for compute_balances_batch, imported on first use so that
+# importing the ledger (and starting the CLI) does not pay for NumPy; None when absent
+_UNLOADED: Any = object()
+np: Any = _UNLOADED
 
-def compute_balances(people: Sequence[str], expenses: Iterable[Expense]) -> Dict[str, Decimal]:
-    balances: Dict[str, Decimal] = defaultdict(lambda: D("0"))
+
+ENGINES = ("decimal", "minor")
+
+# Rows per shard for the parallel path: large enough to amortize pickling per task
+DEFAULT_SHARD_SIZE = 100_000
+
+_ZERO = D("0")
+
+
+def compute_balances(
+    people: Sequence[str],
+    expenses: Iterable[Expense],
+    engine: str = "decimal",
+    split_cache: Optional[SplitCache] = SPLIT_CACHE,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_SHARD_SIZE,
+) -> Dict[str, Decimal]:
+    """Balances over all expenses, whatever their currency (see compute_balances_by_currency).
+
+    Splits of recurring expense shapes come from `split_cache` (None disables caching).
+    An `ExpenseTable` is consumed column-wise by `compute_balances_batch` (same results,
+    whichever engine is named). With `workers > 1` an ExpenseTable (or mapped `.fsb` file)
+    or an NDJSON `ExpenseStream` is cut into shards of about `chunk_size` rows, reduced to
+    partial integer balances in worker processes and merged, with the drift correction
+    applied once at the end. Other inputs, such as lists of Expense objects, run serially:
+    converting them for the workers costs as much as computing their balances.
+    """
+    add, finish, zero = _engine(engine)
+    if workers is not None and workers > 1:
+        shards = _shards(expenses, chunk_size)
+        if shards is not None:
+            return _compute_balances_parallel(people, shards, workers)
+    if isinstance(expenses, ExpenseTable):
+        return _compute_balances_table(people, expenses)
+
+    if current_profiler().enabled:
+        expenses = _profiled(expenses, split_cache)
 
     # Ensure all people appear in balances
-    for p in people:
-        balances[p] = D("0")
+    balances = {p: zero for p in people}
 
     # For each expense: payer gets credited, beneficiaries are charged
     for e in expenses:
-        shares = e.split()
-        balances[e.paid_by] = quantize(balances[e.paid_by] + e.amount)
-        for b, share in shares.items():
-            balances[b] = quantize(balances[b] - share)
+        add(balances, e, split_cache)
+
+    return finish(balances)
+
+
+def compute_balances_by_currency(
+    people: Sequence[str],
+    expenses: Iterable[Expense],
+    engine: str = "decimal",
+    split_cache: Optional[SplitCache] = SPLIT_CACHE,
+) -> Dict[str, Dict[str, Decimal]]:
+    """Balances partitioned by expense currency (currency -> person -> balance), in one pass.
+
+    Each partition sums to zero on its own and every listed person appears in each one.
+    """
+    if isinstance(expenses, ExpenseTable) and len(expenses.currencies) == 1:
+        # Single-currency tables (the common case, e.g. a mapped `.fsb` file) go through the batch kernel
+        return {expenses.currencies[0]: _compute_balances_table(people, expenses)} if len(expenses) else {}
+    add, finish, zero = _engine(engine)
+    if current_profiler().enabled:
+        expenses = _profiled(expenses, split_cache)
+    partitions: Dict[str, dict] = {}
+    for e in expenses:
+        balances = partitions.get(e.currency)
+        if balances is None:
+            balances = partitions[e.currency] = {p: zero for p in people}
+        add(balances, e, split_cache)
+    return {currency: finish(balances) for currency, balances in partitions.items()}
+
+
+def _profiled(expenses: Iterable[Expense], cache: Optional[SplitCache]) -> Iterator[Expense]:
+    """Pass expenses through, then report expense and split counts to the active profiler."""
+    hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    n = 0
+    for e in expenses:
+        n += 1
+        yield e
+    prof = current_profiler()
+    prof.count("expenses", n)
+    if cache is None:
+        prof.count("splits", n)
+    else:
+        prof.count("splits", cache.misses - misses)
+        prof.count("split_cache_hits", cache.hits - hits)
+
+
+def _compute_balances_table(people: Sequence[str], table: ExpenseTable) -> Dict[str, Decimal]:
+    current_profiler().count("expenses", len(table))
+    computed = compute_balances_batch(table.people.names, *table.columns())
+    balances = {p: computed.get(p, from_minor(0)) for p in people}
+    balances.update(computed)
+    return balances
+
+
+def _compute_balances_parallel(
+    people: Sequence[str], shards: Iterator[Tuple[Callable[[tuple], Dict[str, int]], tuple]], workers: int
+) -> Dict[str, Decimal]:
+    totals: Dict[str, int] = {p: 0 for p in people}
 
+    def merge(partial: Dict[str, int]) -> None:
+        for p, v in partial.items():
+            totals[p] = totals.get(p, 0) + v
+
+    # Keep a bounded number of shards in flight so streamed input stays streamed
+    from concurrent.futures import ProcessPoolExecutor  # pulls in multiprocessing; only needed here
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        for reduce, shard in shards:
+            pending.append(pool.submit(reduce, shard))
+            if len(pending) >= 2 * workers:
+                merge(pending.popleft().result())
+        while pending:
+            merge(pending.popleft().result())
+
+    return _finish_minor(totals)
+
+
+def _shards(
+    expenses: Iterable[Expense], chunk_size: int
+) -> Optional[Iterator[Tuple[Callable[[tuple], Dict[str, int]], tuple]]]:
+    """(reduce, shard) tasks that leave all per-row work to the workers; None for other inputs.
+
+    Table shards are row ranges of array columns (which pickle as raw bytes); NDJSON shards
+    are line-aligned byte ranges that each worker reads, parses and splits itself.
+    """
+    from .io_utils import ExpenseStream
+
+    if isinstance(expenses, ExpenseTable):
+        table = expenses
+        names = table.people.names
+        return (
+            (_table_totals, (names,) + table.columns(lo, min(lo + chunk_size, len(table))))
+            for lo in range(0, len(table), chunk_size)
+        )
+    if isinstance(expenses, ExpenseStream) and expenses.ndjson:
+        stream = expenses
+        return (
+            (_ndjson_totals, (str(stream.path), lo, hi, stream.trusted))
+            for lo, hi in stream.byte_ranges(chunk_size)
+        )
+    return None
+
+
+def _table_totals(shard: tuple) -> Dict[str, int]:
+    names, *columns = shard
+    return dict(zip(names, _batch_totals(len(names), *columns)))
+
+
+def _ndjson_totals(shard: tuple) -> Dict[str, int]:
+    from .io_utils import iter_ndjson_range
+
+    balances: Dict[str, int] = {}
+    for e in iter_ndjson_range(*shard):
+        _add_minor(balances, e, SPLIT_CACHE)  # the worker process's own cache
+    return balances
+
+
+def _engine(engine: str):
+    if engine == "decimal":
+        return _add_decimal, _finish_decimal, D("0")
+    if engine == "minor":
+        return _add_minor, _finish_minor, 0
+    raise ValueError(f"Unknown ledger engine: {engine!r} (expected one of {ENGINES})")
+
+
+def _add_decimal(balances: Dict[str, Decimal], e: Expense, cache: Optional[SplitCache]) -> None:
+    shares = cache.split(e) if cache is not None else e.split()
+    balances[e.paid_by] = quantize(balances.get(e.paid_by, _ZERO) + e.charged())
+    for b, share in shares.items():
+        balances[b] = quantize(balances.get(b, _ZERO) - share)
+
+
+def _finish_decimal(balances: Dict[str, Decimal]) -> Dict[str, Decimal]:
     # Small invariant correction at cent level
-    total = sum(balances.values())
+    total = sum(balances.values(), _ZERO)
     drift = quantize(total)
     if drift != 0:
+        current_profiler().count("drift_corrections")
         # assign drift to the lexicographically first person for determinism
         first = sorted(balances.keys())[0]
         balances[first] = quantize(balances[first] - drift)
+    return balances
+
+
+def _add_minor(balances: Dict[str, int], e: Expense, cache: Optional[SplitCache]) -> None:
+    if cache is not None:
+        amount, shares = cache.charge_minor(e)
+    else:
+        amount, shares = e.amount_minor(), e.split_minor()
+    balances[e.paid_by] = balances.get(e.paid_by, 0) + amount
+    for b, share in shares.items():
+        balances[b] = balances.get(b, 0) - share
+
+
+def _finish_minor(balances: Dict[str, int]) -> Dict[str, Decimal]:
+    drift = sum(balances.values())
+    if drift != 0:
+        current_profiler().count("drift_corrections")
+        first = min(balances)
+        balances[first] -= drift
+    return {p: from_minor(v) for p, v in balances.items()}
+
+
+def compute_balances_batch(
+    people: Sequence[str],
+    payer: Sequence[int],
+    amount: Sequence[int],
+    offsets: Sequence[int],
+    beneficiaries: Sequence[int],
+    weights: Optional[Sequence[int]] = None,
+    unit: Optional[Sequence[int]] = None,
+) -> Dict[str, Decimal]:
+    """Compute balances from columnar expenses in a single vectorized pass.
+
+    Row `r` is paid by `people[payer[r]]` for `amount[r]` cents and split among
+    `beneficiaries[offsets[r]:offsets[r + 1]]` (indices into `people`, distinct per row).
+    `weights` is aligned with `beneficiaries` and holds positive integer weights; rows whose
+    weights are 0 use the equal split. `unit` is the per-row split granularity in cents
+    (100 for a zero-decimal currency such as JPY) and defaults to 1.
+
+    Rounding follows `Expense.split_minor`, so results equal `compute_balances` on the
+    same expenses.
+    """
+    n_rows = len(amount)
+    if len(payer) != n_rows or len(offsets) != n_rows + 1 or (unit is not None and len(unit) != n_rows):
+        raise ValueError("payer, amount, unit and offsets must describe the same number of rows")
+    if offsets[0] != 0 or offsets[-1] != len(beneficiaries):
+        raise ValueError("offsets must start at 0 and end at len(beneficiaries)")
+    if weights is not None and len(weights) != len(beneficiaries):
+        raise ValueError("weights must be aligned with beneficiaries")
+
+    totals = _batch_totals(len(people), payer, amount, offsets, beneficiaries, weights, unit)
+    drift = sum(totals)
+    if drift != 0 and people:
+        first = min(range(len(people)), key=lambda i: people[i])
+        totals[first] -= drift
+
+    return {p: from_minor(v) for p, v in zip(people, totals)}
+
+
+def _numpy() -> Any:
+    global np
+    if np is _UNLOADED:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - exercised when numpy is absent
+            numpy = None
+        np = numpy
+    return np
+
+
+def _batch_totals(n_people, payer, amount, offsets, beneficiaries, weights, unit) -> list:
+    if len(amount) and _numpy() is not None and _fits_int64(amount, weights):
+        return _batch_numpy(n_people, payer, amount, offsets, beneficiaries, weights, unit)
+    return _batch_python(n_people, payer, amount, offsets, beneficiaries, weights, unit)
+
+
+def _fits_int64(amount, weights) -> bool:
+    """Whether `_batch_numpy`'s weighted terms (2 * units * w + total_w) stay within int64."""
+    if weights is None or not len(weights):
+        return True
+    try:
+        w_max = int(np.max(np.asarray(weights, dtype=np.int64)))
+    except OverflowError:  # a list column holding weights beyond int64
+        return False
+    units_max = int(np.max(np.abs(np.asarray(amount, dtype=np.int64))))
+    return (2 * units_max + len(weights)) * w_max <= INT64_MAX
+
+
+def _batch_python(n_people, payer, amount, offsets, beneficiaries, weights, unit) -> list:
+    totals = [0] * n_people
+    for r in range(len(amount)):
+        lo, hi = offsets[r], offsets[r + 1]
+        if hi <= lo:
+            raise ValueError(f"Row {r} has no beneficiaries")
+        step = unit[r] if unit is not None else 1
+        units = amount[r] // step
+        totals[payer[r]] += units * step
+
+        if weights is not None and weights[lo] > 0:
+            ws = weights[lo:hi]
+            total_w = sum(ws)
+            shares = [round_div(units * w, total_w) for w in ws]
+            drift = units - sum(shares)
+            if drift:
+                shares[shares.index(max(shares))] += drift
+        else:
+            n = hi - lo
+            base = round_div(units, n)
+            drift = units - base * n
+            shares = [base] * n
+            sign = 1 if drift > 0 else -1
+            for k in range(abs(drift)):
+                shares[k] += sign
+
+        for b, share in zip(beneficiaries[lo:hi], shares):
+            totals[b] -= share * step
+    return totals
+
+
+def _batch_numpy(n_people, payer, amount, offsets, beneficiaries, weights, unit) -> list:
+    payer = np.asarray(payer, dtype=np.int64)
+    amount = np.asarray(amount, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    beneficiaries = np.asarray(beneficiaries, dtype=np.int64)
+    counts = np.diff(offsets)
+    if (counts <= 0).any():
+        raise ValueError(f"Row {int(np.argmax(counts <= 0))} has no beneficiaries")
+    starts = offsets[:-1]
+
+    step = np.asarray(unit, dtype=np.int64) if unit is not None else np.ones_like(amount)
+    units = amount // step
+    row_of = np.repeat(np.arange(len(amount)), counts)
+    pos = np.arange(len(beneficiaries)) - starts[row_of]
+
+    # Equal split: HALF_UP base, then +/-1 unit to the first |drift| beneficiaries
+    base = (2 * units + counts) // (2 * counts)
+    drift = units - base * counts
+    shares = base[row_of] + np.where(pos < np.abs(drift)[row_of], np.sign(drift)[row_of], 0)
+
+    if weights is not None:
+        w = np.asarray(weights, dtype=np.int64)
+        weighted = w[starts] > 0
+        if weighted.any():
+            total_w = np.add.reduceat(w, starts)
+            num = units[row_of] * w
+            den = np.where(weighted, total_w, 1)[row_of]
+            wshares = (2 * num + den) // (2 * den)
+            wdrift = units - np.add.reduceat(wshares, starts)
+            # drift goes to the first largest share of each row
+            row_max = np.maximum.reduceat(wshares, starts)
+            idx = np.arange(len(beneficiaries))
+            first_max = np.minimum.reduceat(np.where(wshares == row_max[row_of], idx, len(idx)), starts)
+            wshares[first_max] += wdrift
+            shares = np.where(weighted[row_of], wshares, shares)
+
+    totals = np.zeros(n_people, dtype=np.int64)
+    np.add.at(totals, payer, units * step)
+    np.subtract.at(totals, beneficiaries, shares * step[row_of])
+    return totals.tolist()
+
+
+class Ledger:
+    """Running balances updated per expense instead of recomputed over the full history.
+
+    Amounts are held as integer cents (the "minor" engine). Every expense credits its payer
+    exactly what it debits its beneficiaries, so the balances always sum to zero and
+    `balances()` equals `compute_balances(people, expenses)` for the expenses held.
+    """
+
+    def __init__(self, people: Sequence[str] = (), split_cache: Optional[SplitCache] = SPLIT_CACHE) -> None:
+        self._split_cache = split_cache
+        self._cents: Dict[str, int] = {p: 0 for p in people}
+        self._view: Dict[str, Decimal] = {p: from_minor(0) for p in people}
+        self._expenses: Dict[int, Expense] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._expenses)
+
+    def __contains__(self, expense_id: object) -> bool:
+        return expense_id in self._expenses
+
+    def expenses(self) -> Iterator[Tuple[int, Expense]]:
+        return iter(self._expenses.items())
+
+    def add_expense(self, expense: Expense) -> int:
+        """Record an expense and return the id used to remove or edit it later."""
+        expense_id = self._next_id
+        self._next_id += 1
+        self._expenses[expense_id] = expense
+        self._apply(self._deltas(expense, 1))
+        return expense_id
+
+    def remove_expense(self, expense_id: int) -> Expense:
+        expense = self._expenses.pop(expense_id)
+        self._apply(self._deltas(expense, -1))
+        return expense
+
+    def edit_expense(self, expense_id: int, expense: Expense) -> Expense:
+        """Replace an expense, applying only the difference between old and new shares."""
+        old = self._expenses[expense_id]
+        deltas = self._deltas(old, -1)
+        for p, v in self._deltas(expense, 1).items():
+            deltas[p] = deltas.get(p, 0) + v
+        self._expenses[expense_id] = expense
+        self._apply(deltas)
+        return old
+
+    def balances(self) -> Dict[str, Decimal]:
+        return dict(self._view)
+
+    def _apply(self, deltas: Dict[str, int]) -> None:
+        cents, view = self._cents, self._view
+        for p, v in deltas.items():
+            if v or p not in cents:
+                cents[p] = cents.get(p, 0) + v
+                view[p] = from_minor(cents[p])
 
-    return dict(balances)
\ No newline at end of file
+    def _deltas(self, expense: Expense, sign: int) -> Dict[str, int]:
+        cache = self._split_cache
+        if cache is not None:
+            amount, shares = cache.charge_minor(expense)
+        else:
+            amount, shares = expense.amount_minor(), expense.split_minor()
+        deltas = {b: -sign * share for b, share in shares.items()}
+        deltas[expense.paid_by] = deltas.get(expense.paid_by, 0) + sign * amount
+        return deltas
\ No newline at end of file
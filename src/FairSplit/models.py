@@ -18,17 +18,26 @@ from fairsplit.models import Person, Expense, Transaction
 
 Notes:
 - Expense supports equal or weighted splits via `weights`.
-- All amounts are Decimal (see money.py).
+- All amounts are Decimal (see money.py); `split_minor` is the integer minor-unit counterpart.
+- `SplitCache` memoizes splits of recurring expense shapes (same amount, beneficiaries, weights).
+- `Expense.unchecked` skips validation for trusted bulk loads (see io_utils `trusted=True`).
+- `Expense.timestamp` is optional; it is normalized to an aware UTC datetime (naive values
+  and bare dates are taken as UTC) and never affects the split.
 
 =================================================================================================================
 """
 from __future__ import annotations
 
+import re
+from collections import OrderedDict
 from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Dict, Iterable, List, Sequence
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Sequence, Tuple
 
-from .money import D, quantize
+from .money import MINOR_EXP, D, minor_exponent, quantize, round_div, to_minor
+from .profiling import current as current_profiler
 
 
 @dataclass(frozen=True)
@@ -48,8 +57,11 @@ class Expense:
     beneficiaries: Sequence[str]
     currency: str = "USD"
     weights: Dict[str, Decimal] | None = None  # beneficiary -> weight
+    timestamp: datetime | None = None  # when the expense happened (UTC)
 
     def __post_init__(self) -> None:
+        if self.timestamp is not None:
+            self.timestamp = parse_timestamp(self.timestamp)
         if self.amount <= 0:
             raise ValueError("Expense amount must be positive")
         if not self.beneficiaries:
@@ -60,36 +72,161 @@ class Expense:
             if any(w <= 0 for w in self.weights.values()):
                 raise ValueError("Weights must be positive")
 
+    @classmethod
+    def unchecked(
+        cls,
+        desc: str,
+        amount: Decimal,
+        paid_by: str,
+        beneficiaries: Sequence[str],
+        currency: str = "USD",
+        weights: Dict[str, Decimal] | None = None,
+        timestamp: datetime | None = None,
+    ) -> "Expense":
+        """Build without `__post_init__` checks, for data already validated (or exported by us).
+
+        Nothing is normalized either: `timestamp` must already be an aware UTC datetime.
+        """
+        expense = cls.__new__(cls)
+        expense.__dict__.update(
+            desc=desc, amount=amount, paid_by=paid_by, beneficiaries=beneficiaries,
+            currency=currency, weights=weights, timestamp=timestamp,
+        )
+        return expense
+
     def split(self) -> Dict[str, Decimal]:
-        """Return each beneficiary's share as a dict (name -> Decimal)."""
+        """Return each beneficiary's share as a dict (name -> Decimal).
+
+        Shares are rounded to the currency's minor unit, but never finer than a cent (a JPY
+        expense is split in whole yen), and add up to `charged()`.
+        """
+        unit = share_unit(self.currency)
+        amount = quantize(self.amount, unit)
         if self.weights:
             total_w = sum(self.weights.values())
+            # multiply before dividing so exact half-cent shares round HALF_UP correctly
             shares = {
-                p: quantize(self.amount * (w / total_w)) for p, w in self.weights.items()
+                p: quantize(amount * w / total_w, unit) for p, w in self.weights.items()
             }
             # Fix rounding drift by adjusting the largest share
-            drift = quantize(self.amount - sum(shares.values()))
+            drift = amount - sum(shares.values())
             if drift != 0:
+                current_profiler().count("drift_corrections")
                 # add drift to the beneficiary with the max fractional part
                 target = max(shares, key=lambda k: shares[k])
-                shares[target] = quantize(shares[target] + drift)
+                shares[target] = shares[target] + drift
             return shares
 
         # Equal split
         n = Decimal(len(self.beneficiaries))
-        base = quantize(self.amount / n)
+        base = quantize(amount / n, unit)
         shares = {b: base for b in self.beneficiaries}
-        drift = quantize(self.amount - sum(shares.values()))
+        drift = amount - sum(shares.values())
         if drift != 0:
-            # assign remaining cents to first beneficiaries deterministically
+            current_profiler().count("drift_corrections")
+            # assign remaining units (or take back over-rounded ones) from the first
+            # beneficiaries deterministically
+            step = unit if drift > 0 else -unit
             for b in self.beneficiaries:
                 if drift == 0:
                     break
-                shares[b] = quantize(shares[b] + Decimal("0.01"))
-                drift = quantize(drift - Decimal("0.01"))
+                shares[b] = shares[b] + step
+                drift = drift - step
+        return shares
+
+    def charged(self) -> Decimal:
+        """The amount actually split: rounded to the unit `split` uses."""
+        return quantize(self.amount, share_unit(self.currency))
+
+    def amount_minor(self, exp: int = MINOR_EXP) -> int:
+        """Return the amount in integer units of 10**-exp, rounded to the currency's minor unit."""
+        unit_exp = min(exp, minor_exponent(self.currency))
+        return to_minor(self.amount, unit_exp) * 10 ** (exp - unit_exp)
+
+    def split_minor(self, exp: int = MINOR_EXP) -> Dict[str, int]:
+        """Integer counterpart of `split`: each share in units of 10**-exp.
+
+        Shares are never finer than the currency's own minor unit (a JPY expense is
+        split in whole yen), so the result always equals `split()` in those units.
+        """
+        unit_exp = min(exp, minor_exponent(self.currency))
+        scale = 10 ** (exp - unit_exp)
+        units = to_minor(self.amount, unit_exp)
+
+        if self.weights:
+            # Same expression as `split` so Decimal weights round identically
+            total_w = sum(self.weights.values())
+            amount = Decimal(units)
+            shares = {p: to_minor(amount * w / total_w, 0) for p, w in self.weights.items()}
+            drift = units - sum(shares.values())
+            if drift != 0:
+                current_profiler().count("drift_corrections")
+                target = max(shares, key=lambda k: shares[k])
+                shares[target] += drift
+        else:
+            base = round_div(units, len(self.beneficiaries))
+            shares = {b: base for b in self.beneficiaries}
+            drift = units - sum(shares.values())
+            if drift != 0:
+                current_profiler().count("drift_corrections")
+                step = 1 if drift > 0 else -1
+                for b in self.beneficiaries:
+                    if drift == 0:
+                        break
+                    shares[b] += step
+                    drift -= step
+
+        if scale != 1:
+            return {p: s * scale for p, s in shares.items()}
         return shares
 
 
+def share_unit(currency: str) -> Decimal:
+    """Smallest share of an expense in `currency`: its minor unit, but no finer than CENTS."""
+    unit = _SHARE_UNITS.get(currency)
+    if unit is None:
+        unit = _SHARE_UNITS[currency] = Decimal(1).scaleb(-min(MINOR_EXP, minor_exponent(currency)))
+    return unit
+
+
+_SHARE_UNITS: Dict[str, Decimal] = {}
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+# Before Python 3.11, fromisoformat takes neither a "Z" suffix nor fractions other than 3 or 6 digits
+_FRACTION = re.compile(r"(\d{2}:\d{2}:\d{2})[.,](\d{1,6})(?!\d)")
+
+
+def parse_timestamp(value: str | date | datetime) -> datetime:
+    """ISO 8601 date/datetime text, a date or a datetime as an aware UTC datetime."""
+    if isinstance(value, str):
+        text = value.strip()
+        if text.endswith(("Z", "z")):
+            text = text[:-1] + "+00:00"
+        text = _FRACTION.sub(lambda m: f"{m[1]}.{m[2]:0<6}", text, count=1)
+        try:
+            value = datetime.fromisoformat(text)
+        except ValueError:
+            raise ValueError(f"Invalid timestamp: {value!r} (expected ISO 8601)") from None
+    elif not isinstance(value, date):
+        raise TypeError(f"Timestamp must be an ISO 8601 string, date or datetime, not {type(value).__name__}")
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def timestamp_us(value: datetime) -> int:
+    """Microseconds since the Unix epoch (exact; used for sorting and binary storage)."""
+    return (parse_timestamp(value) - EPOCH) // _MICROSECOND
+
+
+def from_timestamp_us(us: int) -> datetime:
+    return EPOCH + timedelta(microseconds=us)
+
+
 @dataclass(frozen=True)
 class Transaction:
     payer: str
@@ -100,4 +237,72 @@ class Transaction:
         if self.payer == self.payee:
             raise ValueError("Transaction payer and payee must differ")
         if self.amount <= 0:
-            raise ValueError("Transaction amount must be positive")
\ No newline at end of file
+            raise ValueError("Transaction amount must be positive")
+
+
+class SplitCache:
+    """Bounded LRU cache of split results keyed by expense shape.
+
+    Recurring expenses (rent, groceries for the same people) repeat the same amount,
+    beneficiaries and weights; their shares are computed once and returned as read-only
+    mappings. `hits`/`misses` help size `maxsize`.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize < 0:
+            raise ValueError("SplitCache maxsize must be non-negative")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def split(self, expense: Expense) -> Mapping[str, Decimal]:
+        key = (None, expense.amount, tuple(expense.beneficiaries), _weights_key(expense), share_unit(expense.currency))
+        return self._lookup(key, lambda: MappingProxyType(expense.split()))
+
+    def split_minor(self, expense: Expense, exp: int = MINOR_EXP) -> Mapping[str, int]:
+        return self.charge_minor(expense, exp)[1]
+
+    def charge_minor(self, expense: Expense, exp: int = MINOR_EXP) -> Tuple[int, Mapping[str, int]]:
+        """Return (amount_minor, split_minor) for the expense, cached together."""
+        key = (exp, expense.amount, tuple(expense.beneficiaries), _weights_key(expense), expense.currency)
+        return self._lookup(
+            key, lambda: (expense.amount_minor(exp), MappingProxyType(expense.split_minor(exp)))
+        )
+
+    def info(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def resize(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        while len(self._data) > maxsize:
+            self._data.popitem(last=False)
+
+    def _lookup(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        value = self._data.get(key)
+        if value is not None:
+            self.hits += 1
+            self._data.move_to_end(key)
+            return value
+        self.misses += 1
+        value = compute()
+        if self.maxsize:
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+
+def _weights_key(expense: Expense) -> tuple | None:
+    return tuple(expense.weights.items()) if expense.weights else None
+
+
+# Shared default used by ledger.compute_balances and ledger.Ledger
+SPLIT_CACHE = SplitCache()
\ No newline at end of file
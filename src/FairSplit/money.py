@@ -14,11 +14,12 @@ Description:
 Decimal-backed money helpers to ensure exact currency arithmetic and rounding.
 
 Usage:
-from fairsplit.money import D, quantize
+from fairsplit.money import D, quantize, to_minor, from_minor
 
 Notes:
 - Always use Decimal with a fixed quantization of 2 fraction digits unless specified.
 - Avoid binary float for money math.
+- Integer minor units (cents) are used by the fast ledger engine; convert at the API boundary.
 
 =================================================================================================================
 """
@@ -30,6 +31,27 @@ from decimal import Decimal, ROUND_HALF_UP, getcontext
 getcontext().prec = 28
 
 CENTS = Decimal("0.01")
+_ONE = Decimal("1")
+
+# Fraction digits of the ledger's minor unit (CENTS)
+MINOR_EXP = 2
+
+# ISO 4217 currencies whose minor unit differs from two fraction digits
+CURRENCY_EXPONENTS = {
+    "BHD": 3,
+    "CLP": 0,
+    "IQD": 3,
+    "ISK": 0,
+    "JOD": 3,
+    "JPY": 0,
+    "KRW": 0,
+    "KWD": 3,
+    "LYD": 3,
+    "OMR": 3,
+    "TND": 3,
+    "UGX": 0,
+    "VND": 0,
+}
 
 
 def D(value: str | int | float | Decimal) -> Decimal:
@@ -41,4 +63,31 @@ def D(value: str | int | float | Decimal) -> Decimal:
 
 def quantize(amount: Decimal, exp: Decimal = CENTS) -> Decimal:
     """Quantize to currency step using HALF_UP (typical for financial amounts)."""
-    return amount.quantize(exp, rounding=ROUND_HALF_UP)
\ No newline at end of file
+    return amount.quantize(exp, rounding=ROUND_HALF_UP)
+
+
+def minor_exponent(currency: str) -> int:
+    """Number of fraction digits in the currency's minor unit (defaults to 2)."""
+    return CURRENCY_EXPONENTS.get(currency.upper(), MINOR_EXP)
+
+
+def to_minor(amount: Decimal, exp: int = MINOR_EXP) -> int:
+    """Convert a Decimal amount to integer minor units, rounding HALF_UP."""
+    scaled = amount.scaleb(exp)
+    units = int(scaled)
+    if units == scaled:  # already a whole number of minor units (the common case)
+        return units
+    return int(scaled.quantize(_ONE, rounding=ROUND_HALF_UP))
+
+
+def from_minor(units: int, exp: int = MINOR_EXP) -> Decimal:
+    """Convert integer minor units back to a Decimal with `exp` fraction digits."""
+    return Decimal(units).scaleb(-exp)
+
+
+def round_div(numerator: int, denominator: int) -> int:
+    """Integer division rounding HALF_UP (away from zero on ties), like `quantize`."""
+    q, r = divmod(abs(numerator), denominator)
+    if 2 * r >= denominator:
+        q += 1
+    return q if numerator >= 0 else -q
\ No newline at end of file
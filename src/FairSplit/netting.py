@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: netting.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Cross-group netting: per-person balances from many groups are merged into one net
+position per person and currency, settled with a single optimizer run, and every
+resulting transfer is attributed back to the groups whose debts it pays down.
+
+Usage:
+from fairsplit.netting import consolidate, consolidate_files
+result = consolidate((group_id, partitions) for group_id, partitions in groups)
+result = consolidate_files(find_group_files("groups/"), workers=8)
+
+Notes:
+- Groups are consumed one at a time; only sparse per-person totals and the debtors'
+  per-group debts (interned ids in typed arrays) are kept, never any expenses.
+- Currencies are netted separately; converting between them is `fx`'s job.
+- Attribution follows the payer: a debtor's net debt is apportioned over the groups in
+  which they owe (in proportion to each debt, to the cent), then their transfers draw
+  on those shares largest-first, so each transfer lists as few groups as possible.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .ledger import compute_balances_by_currency
+from .models import Transaction
+from .money import from_minor, to_minor
+from .optimizer import EXACT_BUDGET_MS, optimize_settlements
+from .table import PersonTable
+
+GroupPartitions = Mapping[str, Mapping[str, Decimal]]  # currency -> person -> balance
+
+
+@dataclass(frozen=True)
+class NetTransfer:
+    currency: str
+    transaction: Transaction
+    groups: Tuple[Tuple[str, Decimal], ...]  # (group id, part of the amount paying down a debt there)
+
+
+@dataclass
+class Consolidation:
+    transfers: List[NetTransfer] = field(default_factory=list)
+    groups: int = 0
+    people: int = 0
+    separate_transfers: int = 0  # what settling each group alone takes (greedy bound: parties - 1)
+
+
+class _Positions:
+    """Sparse totals and debtor entries for one currency."""
+
+    __slots__ = ("totals", "debtor", "group", "debt")
+
+    def __init__(self) -> None:
+        self.totals: Dict[int, int] = {}  # person id -> net minor units
+        self.debtor = array("I")  # person id, group index, minor units owed: one row per debt
+        self.group = array("I")
+        self.debt = array("q")
+
+
+def consolidate(
+    groups: Iterable[Tuple[str, GroupPartitions]],
+    strategy: str = "heap",
+    budget_ms: Optional[float] = EXACT_BUDGET_MS,
+) -> Consolidation:
+    """Net `(group id, currency -> person -> balance)` pairs and settle the totals once per currency."""
+    people = PersonTable()
+    group_ids: List[str] = []
+    positions: Dict[str, _Positions] = {}
+    separate = 0
+
+    for group_id, partitions in groups:
+        g = len(group_ids)
+        group_ids.append(group_id)
+        for currency, balances in partitions.items():
+            pos = positions.get(currency)
+            if pos is None:
+                pos = positions[currency] = _Positions()
+            totals = pos.totals
+            parties = 0
+            for name, balance in balances.items():
+                cents = to_minor(balance)
+                if not cents:
+                    continue
+                parties += 1
+                pid = people.intern(name)
+                totals[pid] = totals.get(pid, 0) + cents
+                if cents < 0:
+                    pos.debtor.append(pid)
+                    pos.group.append(g)
+                    pos.debt.append(-cents)
+            separate += max(parties - 1, 0)
+
+    result = Consolidation(groups=len(group_ids), people=len(people), separate_transfers=separate)
+    for currency in sorted(positions):
+        pos = positions[currency]
+        net = {people[pid]: from_minor(v) for pid, v in pos.totals.items() if v}
+        settlement = optimize_settlements(net, strategy=strategy, budget_ms=budget_ms)
+        result.transfers.extend(_attribute(currency, settlement.transactions, pos, people, group_ids))
+    return result
+
+
+def consolidate_files(
+    paths: Sequence[str | Path],
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    strategy: str = "heap",
+    budget_ms: Optional[float] = EXACT_BUDGET_MS,
+) -> Consolidation:
+    """Consolidate group files (JSON/NDJSON); balances are computed per file, in worker processes.
+
+    Group ids are file names without suffix; files sharing one (e.g. `x/trip.json` and
+    `y/trip.json`) become `trip`, `trip-2`, ... as batch output names do.
+    """
+    from .batch import unique_stems
+
+    sources = [str(p) for p in paths]
+    ids = unique_stems(sources)
+    if workers == 0 or len(sources) <= 1:
+        return consolidate(map(group_balances, sources, ids), strategy=strategy, budget_ms=budget_ms)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return consolidate(
+            pool.map(group_balances, sources, ids, chunksize=chunk_size), strategy=strategy, budget_ms=budget_ms
+        )
+
+
+def group_balances(path: str, group_id: Optional[str] = None) -> Tuple[str, Dict[str, Dict[str, Decimal]]]:
+    """(group id, per-currency balances) of one group file; the id defaults to the file name without suffix."""
+    from .io_utils import stream_json
+
+    stream = stream_json(path)
+    group_id = Path(path).stem if group_id is None else group_id
+    return group_id, compute_balances_by_currency(stream.people, stream, engine="minor")
+
+
+def _attribute(
+    currency: str,
+    transactions: Sequence[Transaction],
+    pos: _Positions,
+    people: PersonTable,
+    group_ids: Sequence[str],
+) -> Iterator[NetTransfer]:
+    # CSR index of the debt rows by person (counting sort; rows stay in group order)
+    starts = array("Q", bytes(8 * (len(people) + 1)))
+    for pid in pos.debtor:
+        starts[pid + 1] += 1
+    for i in range(len(people)):
+        starts[i + 1] += starts[i]
+    rows = array("Q", bytes(8 * len(pos.debtor)))
+    fill = array("Q", starts)
+    for row, pid in enumerate(pos.debtor):
+        rows[fill[pid]] = row
+        fill[pid] += 1
+
+    shares: Dict[str, List[List[int]]] = {}  # payer -> [[group index, minor units left], ...], smallest first
+    for tx in transactions:
+        left = shares.get(tx.payer)
+        if left is None:
+            pid = people.id(tx.payer)
+            debts = [(pos.group[r], pos.debt[r]) for r in rows[starts[pid] : starts[pid + 1]]]
+            left = shares[tx.payer] = _apportion(-pos.totals[pid], debts)
+        amount = to_minor(tx.amount)
+        parts: List[Tuple[str, Decimal]] = []
+        while amount and left:
+            g, available = left[-1]
+            take = min(amount, available)
+            parts.append((group_ids[g], from_minor(take)))
+            amount -= take
+            if take == available:
+                left.pop()
+            else:
+                left[-1][1] -= take
+        yield NetTransfer(currency=currency, transaction=tx, groups=tuple(parts))
+
+
+def _apportion(total: int, debts: List[Tuple[int, int]]) -> List[List[int]]:
+    """Split `total` over `debts` in proportion (largest remainder), smallest share first."""
+    owed = sum(d for _, d in debts)
+    shares = [[g, total * d // owed, total * d % owed] for g, d in debts]
+    for share in sorted(shares, key=lambda s: s[2], reverse=True)[: total - sum(s[1] for s in shares)]:
+        share[1] += 1
+    return [[g, v] for g, v, _ in sorted(shares, key=lambda s: s[1]) if v]
\ No newline at end of file
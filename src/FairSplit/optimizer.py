@@ -16,29 +16,278 @@ min-cash-flow algorithm (pairs largest debtor with largest creditor).
 
 Usage:
 from fairsplit.optimizer import optimize_settlements
+optimize_settlements(balances, strategy="exact", budget_ms=200)
 
 Notes:
 - Produces a small set of transactions that settle all balances to zero.
 - Greedy is fast and near-optimal for realistic group sizes.
+- "exact" maximizes the number of disjoint zero-sum subgroups (each settles in k-1
+  transfers), which gives the provable minimum; it falls back to greedy when the
+  group is larger than `max_parties` or the time budget runs out.
+- "heap" scales the greedy to very large groups: exactly matching debtor/creditor
+  amounts are paired first via a hash index, then heaps always match the current
+  largest residual debt with the current largest residual credit (O(n log n)).
+- "flow" settles under constraints (allowed payer -> payee channels with fees and
+  capacities, payment networks, per-person outflow caps) as a min-cost flow; see flow.py.
+- `update_settlements` patches an existing plan after a balance change instead of
+  replanning: only transfers between people whose balance moved are resized, added or
+  dropped, and the result comes with a diff of what changed.
 
 =================================================================================================================
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
+import heapq
+import time
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 
-from .money import D, quantize
+from .money import D, from_minor, quantize, to_minor
 from .models import Transaction
+from .profiling import current as current_profiler
+
+if TYPE_CHECKING:
+    from .flow import FlowNetwork
+
+STRATEGIES = ("greedy", "exact", "heap", "flow")
+
+# Subset sums are tabulated for all 2**n subsets, so keep n interactive by default
+EXACT_MAX_PARTIES = 20
+EXACT_BUDGET_MS = 1000.0
 
 
 @dataclass
 class Settlement:
     transactions: List[Transaction]
+    strategy: str = "greedy"  # strategy that actually produced the plan
+
+
+@dataclass
+class SettlementDiff:
+    """Transfers added, removed and resized ((old, new), same payer and payee) between two plans."""
+
+    added: List[Transaction] = field(default_factory=list)
+    removed: List[Transaction] = field(default_factory=list)
+    changed: List[Tuple[Transaction, Transaction]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+def optimize_settlements(
+    balances: Dict[str, Decimal],
+    strategy: str = "greedy",
+    budget_ms: Optional[float] = EXACT_BUDGET_MS,
+    max_parties: int = EXACT_MAX_PARTIES,
+    network: Optional[FlowNetwork] = None,
+) -> Settlement:
+    """Settle `balances` with as few transfers as the chosen strategy finds.
+
+    `budget_ms` bounds the exact search (None for no limit); `Settlement.strategy` reports
+    "greedy" when the exact search fell back. "flow" finds the cheapest plan allowed by
+    `network` (see flow.py); without one anyone may pay anyone for free, so every plan is
+    cheapest and the heap plan is used.
+    """
+    if strategy == "greedy":
+        settlement = Settlement(transactions=_greedy(balances))
+    elif strategy == "exact":
+        settlement = _optimize_exact(balances, budget_ms, max_parties)
+    elif strategy == "heap":
+        settlement = Settlement(transactions=_heap_greedy(balances), strategy="heap")
+    elif strategy == "flow":
+        if network is None:
+            transactions = _heap_greedy(balances)
+        else:
+            from .flow import settle_flow
+
+            transactions, _ = settle_flow(balances, network)
+        settlement = Settlement(transactions=transactions, strategy="flow")
+    else:
+        raise ValueError(f"Unknown settlement strategy: {strategy!r} (expected one of {STRATEGIES})")
+    current_profiler().count("transactions", len(settlement.transactions))
+    return settlement
+
+
+def update_settlements(previous: Settlement, delta: Dict[str, Decimal]) -> Tuple[Settlement, SettlementDiff]:
+    """Update `previous` for balances that moved by `delta`; returns (plan, diff).
+
+    The residual `delta` is settled on top of the old plan, first by resizing transfers
+    already running between people whose balance moved, then by pairing the remainder
+    largest-first. A new transfer that closes a loop of transfers is cancelled around
+    that loop, so the plan stays acyclic (at most one transfer fewer than the people in
+    it, as greedy guarantees) and only transfers on the loop change. Every other
+    Transaction is carried over as the same object.
+    """
+    residual = {p: to_minor(v) for p, v in delta.items()}
+    residual = {p: v for p, v in residual.items() if v}
+    if sum(residual.values()) != 0:
+        raise ValueError("Balance delta must sum to zero")
+
+    plan = _Plan(previous.transactions)
+    _absorb(plan, residual)
+    if plan.added:
+        _cancel_cycles(plan)
+
+    transactions: List[Transaction] = []
+    diff = SettlementDiff()
+    for tx in previous.transactions:
+        key = (tx.payer, tx.payee)
+        if key not in plan.changed or plan.changed[key] == to_minor(tx.amount):
+            transactions.append(tx)
+        elif plan.changed[key]:
+            new = Transaction(payer=tx.payer, payee=tx.payee, amount=from_minor(plan.changed[key]))
+            transactions.append(new)
+            diff.changed.append((tx, new))
+        else:
+            diff.removed.append(tx)
+    for key in plan.added:
+        if plan.changed[key]:
+            new = Transaction(payer=key[0], payee=key[1], amount=from_minor(plan.changed[key]))
+            transactions.append(new)
+            diff.added.append(new)
+    current_profiler().count("transactions", len(transactions))
+    return Settlement(transactions=transactions, strategy="incremental"), diff
+
+
+def diff_settlements(old: Settlement, new: Settlement) -> SettlementDiff:
+    """Compare two plans transfer by transfer, keyed by (payer, payee)."""
+    before = {(tx.payer, tx.payee): tx for tx in old.transactions}
+    after = {(tx.payer, tx.payee): tx for tx in new.transactions}
+    diff = SettlementDiff()
+    for key, tx in after.items():
+        prev = before.get(key)
+        if prev is None:
+            diff.added.append(tx)
+        elif prev.amount != tx.amount:
+            diff.changed.append((prev, tx))
+    diff.removed = [tx for key, tx in before.items() if key not in after]
+    return diff
+
+
+class _Plan:
+    """Transfers of an existing plan with copy-on-write amounts in minor units."""
+
+    def __init__(self, transactions: Sequence[Transaction]) -> None:
+        self.transactions = transactions
+        self.index = {(tx.payer, tx.payee): tx for tx in transactions}
+        self.changed: Dict[Tuple[str, str], int] = {}  # (payer, payee) -> new amount, 0 when dropped
+        self.added: List[Tuple[str, str]] = []  # pairs with no transfer in the old plan
+
+    def amount(self, key: Tuple[str, str]) -> int:
+        value = self.changed.get(key)
+        if value is not None:
+            return value
+        tx = self.index.get(key)
+        return to_minor(tx.amount) if tx is not None else 0
+
+    def set(self, key: Tuple[str, str], value: int) -> None:
+        if key not in self.index and key not in self.changed:
+            self.added.append(key)
+        self.changed[key] = value
+
+
+def _absorb(plan: _Plan, residual: Dict[str, int]) -> None:
+    """Settle `residual` minor units on top of `plan`."""
+    debtors = {p: -v for p, v in residual.items() if v < 0}  # must pay this much more (or receive less)
+    creditors = {p: v for p, v in residual.items() if v > 0}
 
+    # Existing transfers between a residual debtor and creditor absorb what they can
+    for d in list(debtors):
+        for c in list(creditors):
+            if d not in debtors or c not in creditors:
+                continue
+            if (d, c) in plan.index:
+                move = min(debtors[d], creditors[c])
+                plan.set((d, c), plan.amount((d, c)) + move)
+            elif (c, d) in plan.index:
+                move = min(debtors[d], creditors[c], plan.amount((c, d)))
+                plan.set((c, d), plan.amount((c, d)) - move)
+            else:
+                continue
+            for side, name in ((debtors, d), (creditors, c)):
+                side[name] -= move
+                if not side[name]:
+                    del side[name]
 
-def optimize_settlements(balances: Dict[str, Decimal]) -> Settlement:
+    # The rest pairs largest debtor with largest creditor, as `_greedy` does
+    owing = sorted(debtors.items(), key=lambda x: x[1], reverse=True)
+    owed = sorted(creditors.items(), key=lambda x: x[1], reverse=True)
+    i = j = 0
+    while i < len(owing) and j < len(owed):
+        (d_name, d_amt), (c_name, c_amt) = owing[i], owed[j]
+        pay = min(d_amt, c_amt)
+        back = min(plan.amount((c_name, d_name)), pay)  # cancel an opposite transfer first
+        if back:
+            plan.set((c_name, d_name), plan.amount((c_name, d_name)) - back)
+        if pay > back:
+            plan.set((d_name, c_name), plan.amount((d_name, c_name)) + pay - back)
+        owing[i], owed[j] = (d_name, d_amt - pay), (c_name, c_amt - pay)
+        if d_amt == pay:
+            i += 1
+        if c_amt == pay:
+            j += 1
+
+
+def _cancel_cycles(plan: _Plan) -> None:
+    """Insert the plan's new transfers one by one, cancelling any loop each one closes.
+
+    A loop is cancelled by pushing its smallest transfer's amount backwards around it,
+    which leaves every person's net flow unchanged and drops at least one transfer.
+    """
+    adjacency: Dict[str, Dict[str, None]] = {}
+    for key in plan.index:
+        if plan.amount(key):
+            a, b = key
+            adjacency.setdefault(a, {})[b] = None
+            adjacency.setdefault(b, {})[a] = None
+
+    for payer, payee in plan.added:
+        if not plan.amount((payer, payee)):
+            continue
+        path = _path(adjacency, payee, payer)
+        if path:
+            # loop: payer -> payee (the new transfer), then back along `path` to payer;
+            # transfers running along the loop shrink by `push`, those against it grow
+            steps = [(payer, payee)] + list(zip(path, path[1:]))
+            along = {step for step in steps if plan.amount(step) > 0}
+            push = min(plan.amount(step) for step in along)
+            for a, b in steps:
+                if (a, b) in along:
+                    plan.set((a, b), plan.amount((a, b)) - push)
+                    if not plan.amount((a, b)) and (a, b) != (payer, payee):
+                        del adjacency[a][b], adjacency[b][a]
+                else:
+                    plan.set((b, a), plan.amount((b, a)) + push)
+        if plan.amount((payer, payee)):
+            adjacency.setdefault(payer, {})[payee] = None
+            adjacency.setdefault(payee, {})[payer] = None
+
+
+def _path(adjacency: Dict[str, Dict[str, None]], start: str, goal: str) -> List[str]:
+    """Nodes from `start` to `goal` in the (acyclic) transfer graph, or [] if unconnected."""
+    if start not in adjacency or goal not in adjacency:
+        return []
+    parent: Dict[str, str] = {start: start}
+    queue = [start]
+    for node in queue:
+        if node == goal:
+            path = [goal]
+            while path[-1] != start:
+                path.append(parent[path[-1]])
+            return path[::-1]
+        for nxt in adjacency[node]:
+            if nxt not in parent:
+                parent[nxt] = node
+                queue.append(nxt)
+    return []
+
+
+def _greedy(balances: Dict[str, Decimal]) -> List[Transaction]:
     # Split into creditors (>0) and debtors (<0)
     creditors = [(p, amt) for p, amt in balances.items() if amt > 0]
     debtors = [(p, -amt) for p, amt in balances.items() if amt < 0]
@@ -68,4 +317,117 @@ def optimize_settlements(balances: Dict[str, Decimal]) -> Settlement:
         if c_amt == 0:
             j += 1
 
-    return Settlement(transactions=txs)
\ No newline at end of file
+    return txs
+
+
+def _heap_greedy(balances: Dict[str, Decimal]) -> List[Transaction]:
+    txs: List[Transaction] = []
+
+    # Exact-match prefilter: one hash lookup per debtor settles equal amounts in one payment
+    cents = [(p, to_minor(amt)) for p, amt in balances.items()]
+    credit_index: Dict[int, List[str]] = {}
+    debtors: List[Tuple[int, str]] = []
+    for p, v in cents:
+        if v > 0:
+            credit_index.setdefault(v, []).append(p)
+    for p, v in cents:
+        if v >= 0:
+            continue
+        matches = credit_index.get(-v)
+        if matches:
+            txs.append(Transaction(payer=p, payee=matches.pop(), amount=from_minor(-v)))
+        else:
+            debtors.append((v, p))  # negated debt: heap top is the largest debtor
+    creditors = [(-v, p) for v, ps in credit_index.items() for p in ps]
+
+    heapq.heapify(debtors)
+    heapq.heapify(creditors)
+    while debtors and creditors:
+        d_amt, d_name = heapq.heappop(debtors)
+        c_amt, c_name = heapq.heappop(creditors)
+        pay = min(-d_amt, -c_amt)
+        txs.append(Transaction(payer=d_name, payee=c_name, amount=from_minor(pay)))
+        if -d_amt > pay:
+            heapq.heappush(debtors, (d_amt + pay, d_name))
+        if -c_amt > pay:
+            heapq.heappush(creditors, (c_amt + pay, c_name))
+    return txs
+
+
+def _optimize_exact(
+    balances: Dict[str, Decimal], budget_ms: Optional[float], max_parties: int
+) -> Settlement:
+    deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+    cents = {p: to_minor(amt) for p, amt in balances.items()}
+    cents = {p: v for p, v in cents.items() if v != 0}
+    if sum(cents.values()) != 0:
+        # Not zero-sum at cent precision, so no exact partition exists
+        return Settlement(transactions=_greedy(balances))
+
+    # Independent components first: an exactly opposite pair is always its own
+    # subgroup in some optimal plan, so only the remainder needs the search.
+    groups: List[List[str]] = []
+    waiting: Dict[int, List[str]] = {}
+    for p in sorted(cents, key=lambda p: (abs(cents[p]), p)):
+        partners = waiting.get(-cents[p])
+        if partners:
+            groups.append([partners.pop(), p])
+        else:
+            waiting.setdefault(cents[p], []).append(p)
+    rest = sorted(p for ps in waiting.values() for p in ps)
+
+    if len(rest) > max_parties:
+        return Settlement(transactions=_greedy(balances))
+    try:
+        groups.extend(_zero_sum_groups(rest, [cents[p] for p in rest], deadline))
+    except _BudgetExceeded:
+        return Settlement(transactions=_greedy(balances))
+
+    txs: List[Transaction] = []
+    for group in groups:
+        txs.extend(_greedy({p: balances[p] for p in group}))
+    return Settlement(transactions=txs, strategy="exact")
+
+
+def _zero_sum_groups(
+    names: Sequence[str], amounts: Sequence[int], deadline: Optional[float]
+) -> List[List[str]]:
+    """Partition zero-sum `amounts` into the maximum number of zero-sum subgroups.
+
+    Bitmask DP: `best[m]` memoizes the most subgroups a zero-sum mask `m` splits into;
+    it only needs the zero-sum submasks of `m`, which are few for real balances.
+    """
+    if not names:
+        return []
+    sums = [0]
+    for v in amounts:
+        _check_budget(deadline)
+        sums += [s + v for s in sums]
+    zero_masks = [m for m, s in enumerate(sums) if s == 0]
+    del sums
+
+    best = {0: 0}
+    parent = {0: 0}
+    seen = [0]
+    for m in zero_masks[1:]:
+        _check_budget(deadline)
+        top, prev = 1, 0
+        for sub in seen:
+            if sub & m == sub and best[sub] >= top:
+                top, prev = best[sub] + 1, sub
+        best[m] = top
+        parent[m] = prev
+        seen.append(m)
+
+    groups: List[List[str]] = []
+    mask = (1 << len(names)) - 1
+    while mask:
+        part = mask ^ parent[mask]
+        groups.append([names[i] for i in range(len(names)) if part >> i & 1])
+        mask = parent[mask]
+    return groups
+
+
+def _check_budget(deadline: Optional[float]) -> None:
+    if deadline is not None and time.perf_counter() > deadline:
+        raise _BudgetExceeded
\ No newline at end of file
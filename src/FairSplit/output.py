@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: output.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Streaming machine-readable report writers (JSON, NDJSON, CSV). Each balance and transfer
+is written to the file as soon as it is produced; no table or document is built in memory.
+
+Usage:
+from fairsplit.output import open_writer
+with open_writer("ndjson", sys.stdout) as out:
+    out.balances("USD", balances.items())
+    out.settlements("USD", settlement.transactions)
+
+Notes:
+- json:   {"USD": {"balances": {"Ali": "12.50", ...}, "settlements": [{...}, ...]}, ...}
+- ndjson: one object per line, {"type": "balance" | "transfer", "currency": ..., ...}
+- csv:    header `record,currency,person,counterparty,amount`; transfers are
+          payer -> counterparty (payee), balances leave the counterparty empty.
+- Amounts are decimal strings, exactly as computed.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import csv
+import json
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import Iterable, Optional, TextIO, Tuple
+
+from .models import Transaction
+
+FORMATS = ("table", "json", "ndjson", "csv")
+
+
+class ReportWriter(ABC):
+    """Writes per-currency balances and settlements; `balances` precedes `settlements`."""
+
+    def __init__(self, fh: TextIO) -> None:
+        self.fh = fh
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @abstractmethod
+    def balances(self, currency: str, rows: Iterable[Tuple[str, Decimal]]) -> None: ...
+
+    @abstractmethod
+    def settlements(self, currency: str, transactions: Iterable[Transaction]) -> None: ...
+
+    def close(self) -> None:
+        self.fh.flush()
+
+
+class NdjsonWriter(ReportWriter):
+    def balances(self, currency: str, rows: Iterable[Tuple[str, Decimal]]) -> None:
+        write = self.fh.write
+        for person, amount in rows:
+            write(json.dumps({"type": "balance", "currency": currency, "person": person, "balance": str(amount)}))
+            write("\n")
+
+    def settlements(self, currency: str, transactions: Iterable[Transaction]) -> None:
+        write = self.fh.write
+        for tx in transactions:
+            record = {
+                "type": "transfer", "currency": currency, "payer": tx.payer, "payee": tx.payee, "amount": str(tx.amount)
+            }
+            write(json.dumps(record))
+            write("\n")
+
+
+class CsvWriter(ReportWriter):
+    def __init__(self, fh: TextIO) -> None:
+        super().__init__(fh)
+        self.writer = csv.writer(fh)
+        self.writer.writerow(["record", "currency", "person", "counterparty", "amount"])
+
+    def balances(self, currency: str, rows: Iterable[Tuple[str, Decimal]]) -> None:
+        self.writer.writerows(("balance", currency, person, "", str(amount)) for person, amount in rows)
+
+    def settlements(self, currency: str, transactions: Iterable[Transaction]) -> None:
+        self.writer.writerows(("transfer", currency, tx.payer, tx.payee, str(tx.amount)) for tx in transactions)
+
+
+class JsonWriter(ReportWriter):
+    """One JSON object keyed by currency, written incrementally."""
+
+    def __init__(self, fh: TextIO) -> None:
+        super().__init__(fh)
+        self._open: Optional[str] = None  # currency whose object is still open
+        self._sections = 0
+        fh.write("{")
+
+    def balances(self, currency: str, rows: Iterable[Tuple[str, Decimal]]) -> None:
+        self._end_section()
+        write = self.fh.write
+        write(f'{"," if self._sections else ""}\n  {json.dumps(currency)}: {{"balances": {{')
+        for i, (person, amount) in enumerate(rows):
+            write(f'{"," if i else ""}\n    {json.dumps(person)}: "{amount}"')
+        write("\n  }")
+        self._open = currency
+        self._sections += 1
+
+    def settlements(self, currency: str, transactions: Iterable[Transaction]) -> None:
+        if self._open != currency:
+            self.balances(currency, ())
+        write = self.fh.write
+        write(', "settlements": [')
+        for i, tx in enumerate(transactions):
+            record = {"payer": tx.payer, "payee": tx.payee, "amount": str(tx.amount)}
+            write(f'{"," if i else ""}\n    {json.dumps(record)}')
+        write("\n  ]")
+        self._end_section()
+
+    def close(self) -> None:
+        self._end_section()
+        self.fh.write("\n}\n")
+        super().close()
+
+    def _end_section(self) -> None:
+        if self._open is not None:
+            self.fh.write("}")
+            self._open = None
+
+
+_WRITERS = {"json": JsonWriter, "ndjson": NdjsonWriter, "csv": CsvWriter}
+
+
+def open_writer(fmt: str, fh: TextIO) -> ReportWriter:
+    """Writer for a machine-readable `fmt` ("json", "ndjson" or "csv") over `fh`."""
+    try:
+        return _WRITERS[fmt](fh)
+    except KeyError:
+        raise ValueError(f"Unknown output format: {fmt!r} (expected one of {', '.join(_WRITERS)})") from None
\ No newline at end of file
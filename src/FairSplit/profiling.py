@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: profiling.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Lightweight stage timing and counters. Library code reports to `current()`, which is
+a no-op NullProfiler unless a Profiler has been activated, so normal runs pay nothing.
+
+Usage:
+from fairsplit.profiling import Profiler, activate
+prof = Profiler()
+with activate(prof), prof.span("balances"):
+    compute_balances(people, expenses)
+prof.dump("report.json")
+
+Notes:
+- Spans accumulate: re-entering a span name adds to its time and call count.
+- Counters used by the library: expenses, splits, split_cache_hits, drift_corrections,
+  transactions.
+- Hot loops check `current().enabled` once and only then take the instrumented path.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator
+
+
+class Profiler:
+    """Collects named timing spans and integer counters."""
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self._started = time.perf_counter()
+
+    def span(self, name: str) -> ContextManager[None]:
+        """Time the enclosed block under `name`."""
+        return self._span(name)
+
+    @contextmanager
+    def _span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float, calls: int = 1) -> None:
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + calls
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "total_seconds": round(time.perf_counter() - self._started, 6),
+            "stages": {
+                name: {"seconds": round(self.seconds[name], 6), "calls": self.calls[name]} for name in self.seconds
+            },
+            "counters": dict(self.counters),
+        }
+
+    def dump(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+
+
+class NullProfiler(Profiler):
+    """Default profiler: every method is a no-op."""
+
+    enabled = False
+
+    def span(self, name: str) -> ContextManager[None]:
+        return nullcontext()
+
+    def add(self, name: str, seconds: float, calls: int = 1) -> None:
+        pass
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+_active: Profiler = NULL_PROFILER
+
+
+def current() -> Profiler:
+    """The active profiler (the shared NullProfiler when none is active)."""
+    return _active
+
+
+@contextmanager
+def activate(profiler: Profiler) -> Iterator[Profiler]:
+    """Make `profiler` the one library code reports to for the duration of the block."""
+    global _active
+    previous, _active = _active, profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
\ No newline at end of file
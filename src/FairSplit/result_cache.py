@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: result_cache.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Content-addressed on-disk cache of `fairsplit file` results. A report (balances and
+settlements per currency) is stored under a SHA-256 key of the input file's bytes, the
+options that shape the result and the library version, so re-running on an unchanged
+file skips parsing, balances and settlement entirely.
+
+Usage:
+from fairsplit.result_cache import CachedReport, ResultCache
+cache = ResultCache()                                  # ~/.cache/fairsplit (or $XDG_CACHE_HOME)
+key = cache.key("trip.json", {"strategy": "greedy"})
+report = cache.get(key)                                # None on a miss
+cache.put(key, CachedReport(people, partitions, settlements))
+
+Notes:
+- Entries are JSON files; a hit refreshes the entry's mtime and `put` evicts the least
+  recently used entries until the cache fits in `max_bytes`.
+- File digests are remembered by (size, mtime, inode), so a hit does not even re-read
+  the input. As in git, a file modified within `RACY_NS` of being hashed is always
+  rehashed, since a same-size rewrite in that window could keep its mtime.
+- The CLI does not cache SQLite inputs: their balances are already materialized, and
+  commits still in the `-wal` file change neither the database file nor its stat.
+- Writes are atomic (temp file + rename) and every cache error degrades to a miss, so
+  concurrent jobs and read-only directories are safe.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from . import __version__
+from .models import Transaction
+from .optimizer import Settlement
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 64 << 20
+RACY_NS = 2_000_000_000  # mtimes this close to the hashing time are not trusted
+_CHUNK = 1 << 20
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "fairsplit"
+
+
+@dataclass
+class CachedReport:
+    people: List[str]
+    partitions: Dict[str, Dict[str, Decimal]]  # currency -> person -> balance
+    settlements: Dict[str, Settlement] = field(default_factory=dict)  # empty without --optimize
+    fees: Dict[str, Decimal] = field(default_factory=dict)  # currency -> transfer fees (flow strategy)
+
+    def to_obj(self) -> Dict[str, Any]:
+        return {
+            "people": self.people,
+            "partitions": {c: {p: str(v) for p, v in b.items()} for c, b in self.partitions.items()},
+            "settlements": {
+                c: {"strategy": s.strategy, "transactions": [[t.payer, t.payee, str(t.amount)] for t in s.transactions]}
+                for c, s in self.settlements.items()
+            },
+            "fees": {c: str(v) for c, v in self.fees.items()},
+        }
+
+    @classmethod
+    def from_obj(cls, obj: Mapping[str, Any]) -> "CachedReport":
+        return cls(
+            people=list(obj["people"]),
+            partitions={c: {p: Decimal(v) for p, v in b.items()} for c, b in obj["partitions"].items()},
+            settlements={
+                c: Settlement(
+                    transactions=[Transaction(payer=a, payee=b, amount=Decimal(v)) for a, b, v in s["transactions"]],
+                    strategy=s["strategy"],
+                )
+                for c, s in obj["settlements"].items()
+            },
+            fees={c: Decimal(v) for c, v in obj.get("fees", {}).items()},
+        )
+
+
+class ResultCache:
+    """LRU (by mtime) directory of CachedReports bounded by total size."""
+
+    def __init__(self, directory: Optional[str | Path] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError("Cache max_bytes must be non-negative")
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _results(self) -> Path:
+        return self.directory / "results"
+
+    @property
+    def _digests(self) -> Path:
+        return self.directory / "digests"
+
+    # --- keys ----------------------------------------------------------------------------------
+
+    def key(self, path: str | Path, options: Mapping[str, Any]) -> str:
+        """Cache key for running on `path` with `options` (JSON-serializable values)."""
+        h = hashlib.sha256()
+        h.update(f"fairsplit {__version__} cache {CACHE_VERSION}\0".encode())
+        h.update(self.file_digest(path).encode())
+        h.update(json.dumps(options, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def file_digest(self, path: str | Path) -> str:
+        """SHA-256 of the file's bytes, reused while its size, mtime and inode are unchanged."""
+        path = Path(path)
+        st = path.stat()
+        stamp = [st.st_size, st.st_mtime_ns, st.st_ino]
+        memo = self._digests / (hashlib.sha256(str(path.resolve()).encode()).hexdigest() + ".json")
+        try:
+            saved = json.loads(memo.read_text(encoding="utf-8"))
+            if saved["stat"] == stamp and saved["hashed_ns"] - st.st_mtime_ns > RACY_NS:
+                _touch(memo)
+                return saved["digest"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        hashed_ns = time.time_ns()
+        h = hashlib.sha256()
+        with path.open("rb") as fh:
+            while chunk := fh.read(_CHUNK):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self._write(memo, {"stat": stamp, "hashed_ns": hashed_ns, "digest": digest})
+        return digest
+
+    # --- entries -------------------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[CachedReport]:
+        entry = self._results / f"{key}.json"
+        try:
+            report = CachedReport.from_obj(json.loads(entry.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            _unlink(entry)  # unreadable or from an incompatible layout
+            self.misses += 1
+            return None
+        _touch(entry)
+        self.hits += 1
+        return report
+
+    def put(self, key: str, report: CachedReport) -> None:
+        self._write(self._results / f"{key}.json", report.to_obj())
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used files until the cache fits in `max_bytes`; returns files removed."""
+        files = self._files()
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if _unlink(path):
+                removed += 1
+            total -= size
+        return removed
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._files())
+
+    def clear(self) -> None:
+        for _, _, path in self._files():
+            _unlink(path)
+
+    def _files(self) -> List[Tuple[int, int, Path]]:
+        """(mtime_ns, size, path) of every entry and digest file."""
+        files = []
+        for sub in (self._results, self._digests):
+            try:
+                entries = list(os.scandir(sub))
+            except OSError:
+                continue
+            for e in entries:
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                files.append((st.st_mtime_ns, st.st_size, Path(e.path)))
+        return files
+
+    def _write(self, path: Path, obj: Any) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(obj, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass  # an unwritable cache only costs the next run a recomputation
+
+
+def _touch(path: Path) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _unlink(path: Path) -> bool:
+    try:
+        path.unlink()
+        return True
+    except OSError:
+        return False
\ No newline at end of file
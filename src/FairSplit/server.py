@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: server.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Local asyncio HTTP/JSON settlement service. Each group is an NDJSON log on disk and,
+while recently used, a hot in-memory Ledger per currency held in an LRU cache, so
+requests never reparse a group's full history.
+
+Usage:
+fairsplit serve --port 8750 --data-dir groups/
+curl -X POST localhost:8750/groups/trip/expenses -d '{"people": ["Ali", "Sara"], "expenses": [...]}'
+curl localhost:8750/groups/trip/balances
+curl 'localhost:8750/groups/trip/settlements?strategy=heap'
+
+Notes:
+- Endpoints: GET /health, POST /groups/<id>/expenses (an expense object, a list, or
+  {"people": [...], "expenses": [...]}), GET /groups/<id>/balances and
+  GET /groups/<id>/settlements?strategy=greedy|exact|heap|flow&budget_ms=...
+- `people` is only taken when a group is created; later names arrive via expenses.
+- Requests for one group are serialized by a per-group lock; different groups proceed
+  concurrently. Expenses are appended to the log before they are applied in memory, so
+  an evicted group reloads to the same state.
+- Each group has its own small split cache instead of the shared `models.SPLIT_CACHE`:
+  logs are replayed on executor threads while the loop thread adds to other groups, and
+  a group is only touched by one thread at a time (its loader, then the loop).
+- Settlement runs in a process pool (`workers`; 0 runs it on a thread) and is memoized
+  per group until the next append.
+- Plain HTTP/1.1 with keep-alive and Content-Length bodies; meant for localhost only.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Executor
+from decimal import Decimal
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .io_utils import expense_from_obj, expense_to_obj, stream_json
+from .ledger import Ledger
+from .models import Expense, SplitCache
+from .optimizer import EXACT_BUDGET_MS, STRATEGIES, Settlement, optimize_settlements
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8750
+DEFAULT_MAX_GROUPS = 128
+GROUP_SPLIT_CACHE_SIZE = 256
+MAX_BODY_BYTES = 16 << 20
+
+_GROUP_ID = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}")
+_ROUTE = re.compile(r"/groups/([^/]+)/(expenses|balances|settlements)")
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class Group:
+    """Hot state of one group: its people and a running Ledger per currency."""
+
+    def __init__(self, people: Sequence[str] = ()) -> None:
+        self.people: Dict[str, None] = dict.fromkeys(people)
+        self.ledgers: Dict[str, Ledger] = {}
+        self.split_cache = SplitCache(GROUP_SPLIT_CACHE_SIZE)
+        self.version = 0
+        self.settled: Dict[Tuple[str, Optional[float]], Dict[str, Settlement]] = {}
+
+    def add(self, expense: Expense) -> None:
+        ledger = self.ledgers.get(expense.currency)
+        if ledger is None:
+            ledger = self.ledgers[expense.currency] = Ledger(split_cache=self.split_cache)
+        ledger.add_expense(expense)
+        for name in (expense.paid_by, *expense.beneficiaries):
+            self.people.setdefault(name)
+        self.version += 1
+        self.settled.clear()
+
+    def balances(self) -> Dict[str, Dict[str, Decimal]]:
+        """currency -> person -> balance; every person appears in each currency."""
+        result = {}
+        for currency, ledger in sorted(self.ledgers.items()):
+            balances = ledger.balances()
+            result[currency] = {p: balances.get(p, Decimal("0.00")) for p in self.people}
+        return result
+
+    def __len__(self) -> int:
+        return sum(len(ledger) for ledger in self.ledgers.values())
+
+
+class GroupStore:
+    """NDJSON logs (one per group) under `data_dir`, plus an LRU of hot Groups."""
+
+    def __init__(self, data_dir: str | Path, max_groups: int = DEFAULT_MAX_GROUPS) -> None:
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.max_groups = max_groups
+        self.hot: OrderedDict[str, Group] = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def path(self, group_id: str) -> Path:
+        return self.data_dir / f"{group_id}.ndjson"
+
+    def cached(self, group_id: str) -> Optional[Group]:
+        group = self.hot.get(group_id)
+        if group is not None:
+            self.hits += 1
+            self.hot.move_to_end(group_id)
+        return group
+
+    def keep(self, group_id: str, group: Group) -> None:
+        self.misses += 1
+        self.hot[group_id] = group
+        while len(self.hot) > self.max_groups:
+            self.hot.popitem(last=False)
+            self.evictions += 1
+
+    def load(self, group_id: str) -> Group:
+        """Replay a group's log (blocking)."""
+        stream = stream_json(self.path(group_id), ndjson=True)
+        group = Group(stream.people)
+        for expense in stream:
+            group.add(expense)
+        return group
+
+    def append(self, group_id: str, people: Optional[Sequence[str]], expenses: Sequence[Expense]) -> None:
+        """Append expenses to the log, writing the people header first for a new group (blocking)."""
+        path = self.path(group_id)
+        lines = [json.dumps({"people": list(people)}, ensure_ascii=False)] if people is not None else []
+        lines.extend(json.dumps(expense_to_obj(e), ensure_ascii=False) for e in expenses)
+        with path.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "hot": len(self.hot), "max_groups": self.max_groups,
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+        }
+
+
+class SettlementServer:
+    """Routes HTTP requests to groups; one instance per listening socket."""
+
+    def __init__(
+        self, data_dir: str | Path, max_groups: int = DEFAULT_MAX_GROUPS, workers: Optional[int] = None
+    ) -> None:
+        self.store = GroupStore(data_dir, max_groups)
+        self.workers = workers
+        self._pool: Optional[Executor] = None
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._handle, host, port)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    async def request(self, method: str, target: str, body: bytes = b"") -> Tuple[int, Any]:
+        """Handle one request; returns (status, JSON-serializable payload)."""
+        try:
+            return 200, await self._route(method, target, body)
+        except HttpError as exc:
+            return exc.status, {"error": str(exc)}
+        except (ValueError, KeyError, TypeError) as exc:
+            return 400, {"error": f"invalid request: {exc}"}
+        except OSError as exc:  # e.g. disk full or permission denied while appending to the log
+            return 500, {"error": f"server error: {exc}"}
+
+    async def _route(self, method: str, target: str, body: bytes) -> Any:
+        url = urlsplit(target)
+        if url.path == "/health":
+            return {"status": "ok", "groups": self.store.info()}
+        match = _ROUTE.fullmatch(url.path)
+        if match is None:
+            raise HttpError(404, f"no route for {url.path}")
+        group_id, action = match.groups()
+        if not _GROUP_ID.fullmatch(group_id):
+            raise HttpError(400, f"invalid group id {group_id!r}")
+
+        allowed = "POST" if action == "expenses" else "GET"
+        if method != allowed:
+            raise HttpError(405, f"{url.path} only accepts {allowed}")
+        if action == "expenses":
+            return await self._append(group_id, body)
+        if action == "balances":
+            return await self._balances(group_id)
+        query = parse_qs(url.query)
+        strategy = query.get("strategy", ["greedy"])[0]
+        if strategy not in STRATEGIES:
+            raise HttpError(400, f"strategy must be one of {', '.join(STRATEGIES)}")
+        budget_ms = float(query["budget_ms"][0]) if "budget_ms" in query else EXACT_BUDGET_MS
+        return await self._settlements(group_id, strategy, budget_ms)
+
+    async def _append(self, group_id: str, body: bytes) -> Dict[str, Any]:
+        payload = json.loads(body or b"null")
+        people: Optional[List[str]] = None
+        if isinstance(payload, dict) and "expenses" in payload:
+            people = payload.get("people")
+            items = payload["expenses"]
+        else:
+            items = payload if isinstance(payload, list) else [payload]
+        if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+            raise HttpError(400, "expected an expense object, a list of them, or {\"expenses\": [...]}")
+        expenses = [expense_from_obj(item) for item in items]  # validates before anything is written
+
+        loop = asyncio.get_running_loop()
+        async with self._lock(group_id):
+            group = await self._group(group_id, create=True)
+            new_group = not self.store.path(group_id).exists()
+            if people is not None and not new_group and not set(people) <= set(group.people):
+                raise HttpError(409, "people can only be set when the group is created")
+            header = (people or []) if new_group else None
+            await loop.run_in_executor(None, self.store.append, group_id, header, expenses)
+            if header:  # as a reload would: listed people come first, even those without expenses
+                for name in header:
+                    group.people.setdefault(name)
+            for expense in expenses:
+                group.add(expense)
+            return {"group": group_id, "added": len(expenses), "expenses": len(group)}
+
+    async def _balances(self, group_id: str) -> Dict[str, Any]:
+        async with self._lock(group_id):
+            group = await self._group(group_id)
+            balances = group.balances()
+        return {
+            "group": group_id,
+            "balances": {c: {p: str(v) for p, v in b.items()} for c, b in balances.items()},
+        }
+
+    async def _settlements(self, group_id: str, strategy: str, budget_ms: Optional[float]) -> Dict[str, Any]:
+        key = (strategy, budget_ms)
+        async with self._lock(group_id):
+            group = await self._group(group_id)
+            settled = group.settled.get(key)
+            if settled is None:
+                balances, version = group.balances(), group.version
+
+        if settled is None:
+            # The optimizer runs outside the lock and off the event loop
+            loop = asyncio.get_running_loop()
+            currencies = list(balances)
+            plans = await asyncio.gather(
+                *(
+                    loop.run_in_executor(self._executor(), _settle, balances[c], strategy, budget_ms)
+                    for c in currencies
+                )
+            )
+            settled = dict(zip(currencies, plans))
+            if group.version == version:
+                group.settled[key] = settled
+
+        return {
+            "group": group_id,
+            "strategy": strategy,
+            "settlements": {
+                currency: {
+                    "strategy": plan.strategy,
+                    "transactions": [
+                        {"payer": tx.payer, "payee": tx.payee, "amount": str(tx.amount)} for tx in plan.transactions
+                    ],
+                }
+                for currency, plan in settled.items()
+            },
+        }
+
+    async def _group(self, group_id: str, create: bool = False) -> Group:
+        """The hot Group, loading it from its log on a miss (caller holds the group lock)."""
+        group = self.store.cached(group_id)
+        if group is not None:
+            return group
+        if self.store.path(group_id).exists():
+            group = await asyncio.get_running_loop().run_in_executor(None, self.store.load, group_id)
+        elif create:
+            group = Group()
+        else:
+            raise HttpError(404, f"unknown group {group_id!r}")
+        self.store.keep(group_id, group)
+        return group
+
+    def _lock(self, group_id: str) -> asyncio.Lock:
+        lock = self._locks.get(group_id)
+        if lock is None:
+            lock = self._locks[group_id] = asyncio.Lock()
+        return lock
+
+    def _executor(self) -> Optional[Executor]:
+        if self.workers == 0:
+            return None  # the loop's default thread pool
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    headers = await _read_headers(reader)
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    await _send(writer, 400, {"error": "malformed request"}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await _send(writer, 413, {"error": "request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.request(method, target, body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await _send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _settle(balances: Dict[str, Decimal], strategy: str, budget_ms: Optional[float]) -> Settlement:
+    return optimize_settlements(balances, strategy=strategy, budget_ms=budget_ms)
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, sep, value = line.decode("latin-1").partition(":")
+        if not sep:
+            raise ValueError("malformed header")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _send(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    data_dir: str | Path = "fairsplit-groups",
+    max_groups: int = DEFAULT_MAX_GROUPS,
+    workers: Optional[int] = None,
+) -> None:
+    """Run the service until interrupted."""
+
+    async def main() -> None:
+        app = SettlementServer(data_dir, max_groups, workers)
+        server = await app.start(host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            app.close()
+
+    asyncio.run(main())
\ No newline at end of file
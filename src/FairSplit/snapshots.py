@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: snapshots.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Point-in-time balance queries over timestamped expenses. Expenses are kept in time order
+with cumulative balance checkpoints every `interval` rows, so "balances as of T" is one
+binary search plus a replay of at most `interval` rows instead of a scan of all history.
+
+Usage:
+from fairsplit.snapshots import SnapshotIndex
+index = SnapshotIndex(people, expenses)
+index.as_of("2026-04-01")                   # everything before April
+index.between("2026-03-01", "2026-04-01")   # net change during March
+index.between("2026-03-01", None)           # everything since March
+
+Notes:
+- Ranges are half-open: `as_of(T)` covers expenses strictly before T and
+  `between(S, E)` covers S <= timestamp < E, so consecutive months never overlap.
+- Balances follow the `minor` ledger engine; each expense is split once, when added.
+- Expenses without a timestamp cannot be placed in time; they are counted in `undated`
+  and left out of every query.
+- Checkpoints are built on first use and dropped past the point where an out-of-order
+  expense is inserted.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .models import SPLIT_CACHE, Expense, SplitCache, timestamp_us
+from .money import from_minor
+
+DEFAULT_INTERVAL = 1024
+
+When = Union[str, date, datetime]
+Partitions = Dict[str, Dict[str, Decimal]]
+# (currency, payer, amount, shares) in minor units
+_Charge = Tuple[str, str, int, Mapping[str, int]]
+_Totals = Dict[str, Dict[str, int]]
+
+
+class SnapshotIndex:
+    """Time-ordered expense charges with cumulative checkpoints for as-of queries."""
+
+    def __init__(
+        self,
+        people: Sequence[str] = (),
+        expenses: Iterable[Expense] = (),
+        interval: int = DEFAULT_INTERVAL,
+        split_cache: Optional[SplitCache] = SPLIT_CACHE,
+    ) -> None:
+        if interval < 1:
+            raise ValueError("Snapshot interval must be at least 1")
+        self.people: Dict[str, None] = dict.fromkeys(people)
+        self.interval = interval
+        self.split_cache = split_cache
+        self.undated = 0
+        self._times: List[int] = []
+        self._charges: List[_Charge] = []
+        self._checkpoints: List[_Totals] = [{}]  # checkpoint k: totals of the first k * interval rows
+        self.extend(expenses)
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def add(self, expense: Expense) -> None:
+        self.extend((expense,))
+
+    def extend(self, expenses: Iterable[Expense]) -> None:
+        """Add expenses in any order; appends in time order never invalidate checkpoints."""
+        batch: List[Tuple[int, _Charge]] = []
+        for e in expenses:
+            if e.timestamp is None:
+                self.undated += 1
+                continue
+            batch.append((timestamp_us(e.timestamp), self._charge(e)))
+        if not batch:
+            return
+        batch.sort(key=lambda row: row[0])  # stable: same-instant expenses keep their order
+
+        first = bisect_right(self._times, batch[0][0])  # existing rows at the same instant stay first
+        if first < len(self._times):
+            rows = sorted(list(zip(self._times[first:], self._charges[first:])) + batch, key=lambda row: row[0])
+            del self._times[first:], self._charges[first:]
+            del self._checkpoints[first // self.interval + 1 :]
+        else:
+            rows = batch
+        for ts, charge in rows:
+            self._times.append(ts)
+            self._charges.append(charge)
+
+    def as_of(self, when: When) -> Partitions:
+        """Balances over every expense before `when` (currency -> person -> balance)."""
+        return self._partitions(self._totals(self._position(when)))
+
+    def between(self, start: Optional[When], end: Optional[When]) -> Partitions:
+        """Net change in balances from expenses in [start, end); None leaves that side open."""
+        lo = self._position(start) if start is not None else 0
+        hi = self._position(end) if end is not None else len(self)
+        if hi < lo:
+            raise ValueError("between() end precedes start")
+        if hi - lo <= self.interval:
+            return self._partitions(self._replay({}, lo, hi))
+        before, after = self._totals(lo), self._totals(hi)
+        for currency, totals in before.items():
+            cents = after[currency]
+            for person, value in totals.items():
+                cents[person] -= value
+        return self._partitions(after)
+
+    def _position(self, when: When) -> int:
+        """Number of expenses strictly before `when`."""
+        return bisect_left(self._times, timestamp_us(when))
+
+    def _totals(self, n: int) -> _Totals:
+        """Cumulative minor-unit totals of the first `n` rows (a fresh copy)."""
+        k = n // self.interval
+        while len(self._checkpoints) <= k:
+            built = len(self._checkpoints) - 1
+            self._checkpoints.append(
+                self._replay(_copy(self._checkpoints[built]), built * self.interval, (built + 1) * self.interval)
+            )
+        return self._replay(_copy(self._checkpoints[k]), k * self.interval, n)
+
+    def _replay(self, totals: _Totals, lo: int, hi: int) -> _Totals:
+        for currency, payer, amount, shares in self._charges[lo:hi]:
+            cents = totals.get(currency)
+            if cents is None:
+                cents = totals[currency] = {}
+            cents[payer] = cents.get(payer, 0) + amount
+            for person, share in shares.items():
+                cents[person] = cents.get(person, 0) - share
+        return totals
+
+    def _charge(self, e: Expense) -> _Charge:
+        if self.split_cache is not None:
+            amount, shares = self.split_cache.charge_minor(e)
+        else:
+            amount, shares = e.amount_minor(), e.split_minor()
+        self.people.setdefault(e.paid_by)
+        for person in shares:
+            self.people.setdefault(person)
+        return e.currency, e.paid_by, amount, shares
+
+    def _partitions(self, totals: _Totals) -> Partitions:
+        return {
+            currency: {p: from_minor(cents.get(p, 0)) for p in self.people}
+            for currency, cents in sorted(totals.items())
+        }
+
+
+def _copy(totals: _Totals) -> _Totals:
+    return {currency: dict(cents) for currency, cents in totals.items()}
\ No newline at end of file
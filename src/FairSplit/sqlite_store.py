@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: sqlite_store.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Persistent SQLite ledger for long-lived groups. People, expenses and their per-person
+shares are stored in indexed tables, and a materialized `balances` table (person,
+currency, minor units) is updated in the same transaction as every insert or delete,
+so reading balances never replays history.
+
+Usage:
+from fairsplit.sqlite_store import SqliteLedger
+with SqliteLedger("trip.db") as db:
+    db.add_expenses(expenses)
+    db.balances_by_currency()
+
+Notes:
+- Inserts are batched with `executemany` inside one transaction per call. Expenses are
+  validated before anything is written, and a rolled-back call leaves no stale person ids.
+- Shares are computed once on insert (through the split cache) and stored, so a delete
+  reverses exactly what its insert applied. Amounts follow the `minor` ledger engine.
+- Databases created before the `ts` column existed gain it (NULL) when opened.
+- `rebuild_balances()` recomputes the materialized table from `shares` after manual edits.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import sqlite3
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal
+from pathlib import Path
+from typing import DefaultDict, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .models import SPLIT_CACHE, Expense, SplitCache, from_timestamp_us, timestamp_us
+from .money import D, from_minor
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS people (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS expenses (
+    id INTEGER PRIMARY KEY,
+    desc TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    amount_minor INTEGER NOT NULL,
+    currency TEXT NOT NULL,
+    payer INTEGER NOT NULL REFERENCES people(id),
+    ts INTEGER  -- microseconds since the epoch, NULL when undated
+);
+CREATE TABLE IF NOT EXISTS shares (
+    expense_id INTEGER NOT NULL REFERENCES expenses(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    person INTEGER NOT NULL REFERENCES people(id),
+    weight TEXT,
+    share_minor INTEGER NOT NULL,
+    PRIMARY KEY (expense_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS shares_person ON shares(person);
+CREATE INDEX IF NOT EXISTS expenses_payer ON expenses(payer);
+CREATE TABLE IF NOT EXISTS balances (
+    person INTEGER NOT NULL REFERENCES people(id),
+    currency TEXT NOT NULL,
+    amount_minor INTEGER NOT NULL,
+    PRIMARY KEY (person, currency)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_BALANCE = """
+INSERT INTO balances (person, currency, amount_minor) VALUES (?, ?, ?)
+ON CONFLICT (person, currency) DO UPDATE SET amount_minor = amount_minor + excluded.amount_minor
+"""
+
+
+class SqliteLedger:
+    """Expenses persisted in SQLite with balances maintained incrementally."""
+
+    def __init__(self, path: str | Path, split_cache: Optional[SplitCache] = SPLIT_CACHE) -> None:
+        self.path = str(path)
+        self.split_cache = split_cache
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_SCHEMA)
+        if "ts" not in {row[1] for row in self.conn.execute("PRAGMA table_info(expenses)")}:
+            self.conn.execute("ALTER TABLE expenses ADD COLUMN ts INTEGER")
+        self._ids: Dict[str, int] = dict(self.conn.execute("SELECT name, id FROM people"))
+
+    def __enter__(self) -> "SqliteLedger":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def add_people(self, people: Iterable[str]) -> None:
+        with self._transaction():
+            self._intern(people)
+
+    def people(self) -> List[str]:
+        """Names in insertion order."""
+        return [name for (name,) in self.conn.execute("SELECT name FROM people ORDER BY id")]
+
+    def add_expenses(self, expenses: Iterable[Expense]) -> List[int]:
+        """Insert expenses in one transaction and update balances; returns the new expense ids."""
+        # Everything that can reject an expense runs before the first INSERT
+        charged: List[Tuple[Expense, List[str], int, Dict[str, int], Optional[int]]] = []
+        for e in expenses:
+            names = list(e.beneficiaries)
+            if len(set(names)) != len(names):
+                raise ValueError(f"Duplicate beneficiaries in expense {e.desc!r}")
+            if self.split_cache is not None:
+                amount, shares = self.split_cache.charge_minor(e)
+            else:
+                amount, shares = e.amount_minor(), e.split_minor()
+            ts = timestamp_us(e.timestamp) if e.timestamp is not None else None
+            charged.append((e, names, amount, shares, ts))
+
+        expense_rows: List[tuple] = []
+        share_rows: List[tuple] = []
+        deltas: DefaultDict[Tuple[str, str], int] = defaultdict(int)
+
+        with self._transaction():
+            (next_id,) = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM expenses").fetchone()
+            for e, names, amount, shares, ts in charged:
+                self._intern([e.paid_by, *names])
+                expense_rows.append((next_id, e.desc, str(e.amount), amount, e.currency, self._ids[e.paid_by], ts))
+                for position, name in enumerate(names):
+                    weight = str(e.weights[name]) if e.weights else None
+                    share_rows.append((next_id, position, self._ids[name], weight, shares[name]))
+                    deltas[name, e.currency] -= shares[name]
+                deltas[e.paid_by, e.currency] += amount
+                next_id += 1
+
+            self.conn.executemany("INSERT INTO expenses VALUES (?, ?, ?, ?, ?, ?, ?)", expense_rows)
+            self.conn.executemany("INSERT INTO shares VALUES (?, ?, ?, ?, ?)", share_rows)
+            self._apply(deltas)
+        return [row[0] for row in expense_rows]
+
+    def delete_expenses(self, ids: Sequence[int]) -> int:
+        """Delete expenses by id, reversing their effect on balances; returns how many were deleted."""
+        ids = list(ids)
+        if not ids:
+            return 0
+        deltas: DefaultDict[Tuple[str, str], int] = defaultdict(int)
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS doomed (id INTEGER PRIMARY KEY)")
+            self.conn.execute("DELETE FROM doomed")
+            self.conn.executemany("INSERT OR IGNORE INTO doomed VALUES (?)", ((i,) for i in ids))
+            for name, currency, amount in self.conn.execute(
+                "SELECT p.name, e.currency, e.amount_minor FROM expenses e "
+                "JOIN doomed d ON d.id = e.id JOIN people p ON p.id = e.payer"
+            ):
+                deltas[name, currency] -= amount
+            for name, currency, share in self.conn.execute(
+                "SELECT p.name, e.currency, s.share_minor FROM shares s "
+                "JOIN doomed d ON d.id = s.expense_id JOIN expenses e ON e.id = s.expense_id "
+                "JOIN people p ON p.id = s.person"
+            ):
+                deltas[name, currency] += share
+            deleted = self.conn.execute("DELETE FROM expenses WHERE id IN (SELECT id FROM doomed)").rowcount
+            self._apply(deltas)
+        return deleted
+
+    def expenses(self) -> Iterator[Expense]:
+        """Yield stored expenses in insertion order, rebuilt from their rows."""
+        rows = self.conn.execute(
+            "SELECT e.id, e.desc, e.amount, e.currency, p.name, e.ts FROM expenses e "
+            "JOIN people p ON p.id = e.payer ORDER BY e.id"
+        )
+        shares = self.conn.cursor().execute(
+            "SELECT s.expense_id, p.name, s.weight FROM shares s "
+            "JOIN people p ON p.id = s.person ORDER BY s.expense_id, s.position"
+        )
+        pending = shares.fetchone()
+        for expense_id, desc, amount, currency, payer, ts in rows:
+            names: List[str] = []
+            weights: Dict[str, Decimal] = {}
+            while pending is not None and pending[0] == expense_id:
+                names.append(pending[1])
+                if pending[2] is not None:
+                    weights[pending[1]] = D(pending[2])
+                pending = shares.fetchone()
+            yield Expense(
+                desc=desc, amount=D(amount), paid_by=payer, beneficiaries=names,
+                currency=currency, weights=weights or None,
+                timestamp=from_timestamp_us(ts) if ts is not None else None,
+            )
+
+    def __len__(self) -> int:
+        (n,) = self.conn.execute("SELECT COUNT(*) FROM expenses").fetchone()
+        return n
+
+    def balances_by_currency(self) -> Dict[str, Dict[str, Decimal]]:
+        """Materialized balances (currency -> person -> balance); every person appears in each currency."""
+        people = self.people()
+        partitions: Dict[str, Dict[str, Decimal]] = {}
+        for currency, name, amount in self.conn.execute(
+            "SELECT b.currency, p.name, b.amount_minor FROM balances b JOIN people p ON p.id = b.person"
+        ):
+            balances = partitions.get(currency)
+            if balances is None:
+                balances = partitions[currency] = {p: from_minor(0) for p in people}
+            balances[name] = from_minor(amount)
+        return partitions
+
+    def balances(self, currency: str = "USD") -> Dict[str, Decimal]:
+        """Materialized balances for one currency."""
+        balances = {p: from_minor(0) for p in self.people()}
+        for name, amount in self.conn.execute(
+            "SELECT p.name, b.amount_minor FROM balances b JOIN people p ON p.id = b.person WHERE b.currency = ?",
+            (currency,),
+        ):
+            balances[name] = from_minor(amount)
+        return balances
+
+    def rebuild_balances(self) -> None:
+        """Recompute the materialized balances from the stored expenses and shares."""
+        with self.conn:
+            self.conn.execute("DELETE FROM balances")
+            self.conn.execute(
+                "INSERT INTO balances (person, currency, amount_minor) "
+                "SELECT person, currency, SUM(delta) FROM ("
+                "  SELECT payer AS person, currency, amount_minor AS delta FROM expenses"
+                "  UNION ALL"
+                "  SELECT s.person, e.currency, -s.share_minor FROM shares s JOIN expenses e ON e.id = s.expense_id"
+                ") GROUP BY person, currency"
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """`with self.conn`, also forgetting ids of people whose INSERT is rolled back."""
+        known = len(self._ids)
+        try:
+            with self.conn:
+                yield
+        except BaseException:
+            for name in list(self._ids)[known:]:  # dicts keep insertion order: new names are last
+                del self._ids[name]
+            raise
+
+    def _intern(self, names: Iterable[str]) -> None:
+        for name in names:
+            if name not in self._ids:
+                self._ids[name] = self.conn.execute("INSERT INTO people (name) VALUES (?)", (name,)).lastrowid
+
+    def _apply(self, deltas: Dict[Tuple[str, str], int]) -> None:
+        self.conn.executemany(
+            _UPSERT_BALANCE, ((self._ids[name], currency, v) for (name, currency), v in deltas.items() if v)
+        )
\ No newline at end of file
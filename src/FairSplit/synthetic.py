@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: synthetic.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Seeded synthetic ledgers for benchmarks and load tests: a group of people and a stream
+of expenses with a configurable share of weighted splits and recurring expense shapes.
+
+Usage:
+from fairsplit.synthetic import Workload, generate, payment_network
+people, expenses = generate(Workload(people=50, expenses=100_000, weighted=0.2, recurring=0.6))
+network = payment_network(people, networks=4, channels=2)   # constraints for strategy="flow"
+
+Notes:
+- The same Workload (including `seed`) always yields the same ledger.
+- Recurring expenses reuse one of `shapes` fixed (amount, payer, group, weights) tuples,
+  the pattern the split cache is built for; the rest are drawn fresh.
+- With `span_days`, expenses get evenly spaced timestamps from `START` over that many
+  days (no extra random draws, so the ledger is otherwise unchanged).
+- `payment_network` links its networks in a ring of channels, so any balances over
+  `people` can be settled within it.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .flow import Channel, FlowNetwork, PaymentNetwork
+from .models import Expense
+
+_DESCRIPTIONS = ("rent", "groceries", "utilities", "internet", "dinner", "taxi", "hotel", "tickets")
+_WEIGHTS = (Decimal("0.5"), Decimal("1"), Decimal("1.5"), Decimal("2"), Decimal("3"))
+_FEE_RATES = (Decimal("0"), Decimal("0.001"), Decimal("0.005"), Decimal("0.01"), Decimal("0.02"))
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class Workload:
+    """Shape of a synthetic ledger."""
+
+    people: int = 20
+    expenses: int = 10_000
+    weighted: float = 0.2  # fraction of expenses with weighted shares
+    recurring: float = 0.5  # fraction of expenses drawn from the recurring shapes
+    max_group: int = 8  # largest beneficiary group
+    shapes: int = 64  # number of distinct recurring shapes
+    currency: str = "USD"
+    seed: int = 0
+    span_days: int = 0  # spread timestamps over this many days (0: undated)
+
+    def __post_init__(self) -> None:
+        if self.people < 2:
+            raise ValueError("A workload needs at least two people")
+        if not (0 <= self.weighted <= 1 and 0 <= self.recurring <= 1):
+            raise ValueError("weighted and recurring must be fractions between 0 and 1")
+
+
+def make_people(workload: Workload) -> List[str]:
+    width = len(str(workload.people - 1))
+    return [f"person{i:0{width}d}" for i in range(workload.people)]
+
+
+def iter_expenses(workload: Workload) -> Iterator[Expense]:
+    """Yield the workload's expenses one at a time (constant memory)."""
+    rng = random.Random(workload.seed)
+    people = make_people(workload)
+    shapes = [_draw(rng, people, workload) for _ in range(max(workload.shapes, 1))]
+    step = timedelta(days=workload.span_days) / max(workload.expenses, 1)
+    for i in range(workload.expenses):
+        if rng.random() < workload.recurring:
+            desc, amount, payer, group, weights = rng.choice(shapes)
+        else:
+            desc, amount, payer, group, weights = _draw(rng, people, workload)
+        yield Expense(
+            desc=desc, amount=amount, paid_by=payer, beneficiaries=group,
+            currency=workload.currency, weights=weights,
+            timestamp=START + i * step if workload.span_days else None,
+        )
+
+
+def generate(workload: Workload) -> Tuple[List[str], List[Expense]]:
+    """Materialize the workload as (people, expenses)."""
+    return make_people(workload), list(iter_expenses(workload))
+
+
+def payment_network(people: Sequence[str], networks: int = 4, channels: int = 2, seed: int = 0) -> FlowNetwork:
+    """Sparse settlement constraints: everyone joins one of `networks` payment networks (round
+    robin) and gets `channels` direct channels to random people, each with a random fee rate."""
+    if networks < 1 or len(people) < 2:
+        raise ValueError("A payment network needs at least one network and two people")
+    rng = random.Random(seed)
+    members: List[List[str]] = [list(people[k::networks]) for k in range(networks)]
+    members = [m for m in members if m]
+    links = [
+        Channel(members[k][0], members[(k + 1) % len(members)][0], _FEE_RATES[-1])
+        for k in range(len(members))
+        if len(members) > 1
+    ]
+    for payer in people:
+        for _ in range(channels):
+            payee = rng.choice(people)
+            if payee != payer:
+                links.append(Channel(payer, payee, rng.choice(_FEE_RATES)))
+    return FlowNetwork(
+        channels=links,
+        networks=[PaymentNetwork(f"network{k}", m, rng.choice(_FEE_RATES[:3])) for k, m in enumerate(members)],
+    )
+
+
+def _draw(
+    rng: random.Random, people: List[str], workload: Workload
+) -> Tuple[str, Decimal, str, List[str], Optional[Dict[str, Decimal]]]:
+    group = rng.sample(people, rng.randint(1, min(workload.max_group, len(people))))
+    weights = {p: rng.choice(_WEIGHTS) for p in group} if rng.random() < workload.weighted else None
+    amount = Decimal(rng.randint(100, 500_000)).scaleb(-2)
+    return rng.choice(_DESCRIPTIONS), amount, rng.choice(people), group, weights
\ No newline at end of file
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: table.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Compact, interned expense storage for very large ledgers: names are interned to small
+integer ids and expenses live in typed `array` columns (CSR layout for beneficiaries).
+
+Usage:
+from fairsplit.table import ExpenseTable
+table = ExpenseTable.from_expenses(people, expenses)
+compute_balances(people, table)
+
+Notes:
+- Columns match `ledger.compute_balances_batch`: amounts in cents, integer weights
+  (scaled per row, 0 for equal-split rows) and offsets into `beneficiaries`.
+- Rows are validated once on append; beneficiaries must be distinct within a row.
+- Weights too large for int64 even after reduction turn `weights` into a plain list
+  (exact, but not writable by `binfile`).
+- Timestamps are microseconds since the Unix epoch; NO_TIMESTAMP marks undated rows.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import math
+import sys
+from array import array
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .models import Expense, from_timestamp_us, timestamp_us
+from .money import MINOR_EXP, from_minor, minor_exponent
+
+NO_TIMESTAMP = -(1 << 63)  # int64 minimum, stored for expenses without a timestamp
+INT64_MAX = (1 << 63) - 1
+
+
+class PersonTable:
+    """Bidirectional name <-> id mapping; ids are dense and assigned in first-seen order."""
+
+    __slots__ = ("names", "_ids")
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name: str) -> int:
+        pid = self._ids.get(name)
+        if pid is None:
+            pid = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return pid
+
+    def id(self, name: str) -> int:
+        return self._ids[name]
+
+    def __getitem__(self, pid: int) -> str:
+        return self.names[pid]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class ExpenseRecord:
+    """One ExpenseTable row with person ids instead of names."""
+
+    __slots__ = ("desc", "amount", "payer", "currency", "beneficiaries", "weights", "timestamp")
+
+    def __init__(
+        self,
+        desc: str,
+        amount: int,
+        payer: int,
+        currency: str,
+        beneficiaries: Tuple[int, ...],
+        weights: Optional[Tuple[int, ...]],
+        timestamp: Optional[int] = None,
+    ) -> None:
+        self.desc = desc
+        self.amount = amount  # cents
+        self.payer = payer
+        self.currency = currency
+        self.beneficiaries = beneficiaries
+        self.weights = weights
+        self.timestamp = timestamp  # microseconds since the epoch
+
+    def to_expense(self, people: PersonTable) -> Expense:
+        names = [people[b] for b in self.beneficiaries]
+        return Expense(
+            desc=self.desc,
+            amount=from_minor(self.amount),
+            paid_by=people[self.payer],
+            beneficiaries=names,
+            currency=self.currency,
+            weights={n: Decimal(w) for n, w in zip(names, self.weights)} if self.weights else None,
+            timestamp=from_timestamp_us(self.timestamp) if self.timestamp is not None else None,
+        )
+
+
+# Numeric columns and their array typecodes
+COLUMNS = {
+    "desc": "I",
+    "payer": "I",
+    "amount": "q",
+    "currency": "H",
+    "offsets": "Q",
+    "beneficiaries": "I",
+    "weights": "q",
+    "timestamp": "q",
+}
+
+
+class ExpenseTable:
+    """Array-backed expenses: a few bytes per row plus 12 bytes per beneficiary.
+
+    Weights are stored as integers scaled per row (1.5 and 2 become 15 and 20), which
+    leaves every share unchanged; rows read back through `to_expense` carry the scaled
+    weights.
+    """
+
+    def __init__(self, people: Optional[PersonTable] = None) -> None:
+        self.people = people if people is not None else PersonTable()
+        self.currencies: List[str] = []
+        self._currency_ids: Dict[str, int] = {}
+        self.desc_texts: List[str] = []  # distinct descriptions (recurring expenses repeat them)
+        self._desc_ids: Dict[str, int] = {}
+        for name, typecode in COLUMNS.items():
+            setattr(self, name, array(typecode))
+        self.offsets.append(0)
+        self.mapping: Optional[object] = None  # backing mmap for tables opened by `binfile`
+
+    @classmethod
+    def from_expenses(cls, people: Sequence[str], expenses: Iterable[Expense]) -> "ExpenseTable":
+        table = cls(PersonTable(people))
+        table.extend(expenses)
+        return table
+
+    @classmethod
+    def from_columns(
+        cls,
+        people: Sequence[str],
+        currencies: Sequence[str],
+        desc_texts: Sequence[str],
+        columns: Dict[str, Sequence[int]],
+    ) -> "ExpenseTable":
+        """Wrap existing columns (arrays or memoryviews, e.g. from `binfile`) without copying.
+
+        `columns` holds desc, payer, amount, currency, offsets, beneficiaries, weights and timestamp.
+        Tables over memoryviews are read-only.
+        """
+        table = cls(PersonTable(people))
+        table.currencies = list(currencies)
+        table._currency_ids = {c: i for i, c in enumerate(table.currencies)}
+        table.desc_texts = list(desc_texts)
+        table._desc_ids = {d: i for i, d in enumerate(table.desc_texts)}
+        for name in COLUMNS:
+            setattr(table, name, columns[name])
+        return table
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    def __getitem__(self, row: int) -> ExpenseRecord:
+        lo, hi = self.offsets[row], self.offsets[row + 1]
+        weights = tuple(self.weights[lo:hi])
+        timestamp = self.timestamp[row]
+        return ExpenseRecord(
+            desc=self.desc_texts[self.desc[row]],
+            amount=self.amount[row],
+            payer=self.payer[row],
+            currency=self.currencies[self.currency[row]],
+            beneficiaries=tuple(self.beneficiaries[lo:hi]),
+            weights=weights if weights and weights[0] > 0 else None,
+            timestamp=timestamp if timestamp != NO_TIMESTAMP else None,
+        )
+
+    def __iter__(self) -> Iterator[Expense]:
+        """Yield rows as (transient) Expense objects, for code that needs the object API."""
+        for row in range(len(self)):
+            yield self[row].to_expense(self.people)
+
+    def append(self, expense: Expense) -> None:
+        if not isinstance(self.amount, array):
+            raise TypeError("A memory-mapped ExpenseTable is read-only")
+        intern = self.people.intern
+        names = list(expense.weights) if expense.weights else list(expense.beneficiaries)
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate beneficiaries in expense {expense.desc!r}")
+
+        self.payer.append(intern(expense.paid_by))
+        ids = [intern(b) for b in names]
+        self.amount.append(expense.amount_minor())
+        self.currency.append(self._currency_id(expense.currency))
+        self.desc.append(self._desc_id(expense.desc))
+        self.timestamp.append(timestamp_us(expense.timestamp) if expense.timestamp is not None else NO_TIMESTAMP)
+        self.beneficiaries.extend(ids)
+        if expense.weights:
+            scaled = _scaled_weights([expense.weights[b] for b in names])
+            if max(scaled) > INT64_MAX and isinstance(self.weights, array):
+                self.weights = list(self.weights)  # keep such weights exact; batch splits them in Python
+            self.weights.extend(scaled)
+        else:
+            self.weights.extend([0] * len(ids))
+        self.offsets.append(len(self.beneficiaries))
+
+    def extend(self, expenses: Iterable[Expense]) -> None:
+        for e in expenses:
+            self.append(e)
+
+    def units(self, lo: int = 0, hi: Optional[int] = None) -> Optional[List[int]]:
+        """Per-row split granularity in cents, or None when every row splits to the cent."""
+        per_currency = [10 ** (MINOR_EXP - min(MINOR_EXP, minor_exponent(c))) for c in self.currencies]
+        if all(u == 1 for u in per_currency):
+            return None
+        return [per_currency[c] for c in self.currency[lo:hi]]
+
+    def columns(self, lo: int = 0, hi: Optional[int] = None) -> tuple:
+        """Rows [lo, hi) as `compute_balances_batch` arguments after `people` (offsets rebased)."""
+        hi = len(self) if hi is None else hi
+        b_lo, b_hi = self.offsets[lo], self.offsets[hi]
+        offsets = self.offsets[lo : hi + 1]
+        if b_lo:
+            offsets = array("Q", (o - b_lo for o in offsets))
+        return (
+            self.payer[lo:hi],
+            self.amount[lo:hi],
+            offsets,
+            self.beneficiaries[b_lo:b_hi],
+            self.weights[b_lo:b_hi],
+            self.units(lo, hi),
+        )
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the numeric columns."""
+        columns = [getattr(self, name) for name in COLUMNS]
+        return sum(c.itemsize * len(c) if hasattr(c, "itemsize") else sys.getsizeof(c) for c in columns)
+
+    def _desc_id(self, desc: str) -> int:
+        did = self._desc_ids.get(desc)
+        if did is None:
+            did = self._desc_ids[desc] = len(self.desc_texts)
+            self.desc_texts.append(desc)
+        return did
+
+    def _currency_id(self, currency: str) -> int:
+        cid = self._currency_ids.get(currency)
+        if cid is None:
+            cid = self._currency_ids[currency] = len(self.currencies)
+            self.currencies.append(currency)
+        return cid
+
+
+def _scaled_weights(weights: Sequence[Decimal]) -> List[int]:
+    digits = max(max(-w.as_tuple().exponent, 0) for w in weights)
+    scaled = [int(w.scaleb(digits)) for w in weights]
+    if max(scaled) > INT64_MAX:  # dividing out the common factor keeps the ratios exact
+        common = math.gcd(*scaled)
+        scaled = [w // common for w in scaled]
+    return scaled
\ No newline at end of file
@@ -17,15 +17,17 @@ Usage:
 from fairsplit.utils import normalize_people
 
 Notes:
-- Rendering uses `rich` for pleasant CLI output.
+- Rendering uses `rich` for pleasant CLI output; it is imported on first use so
+  non-rendering callers (batch workers) do not pay for it.
 
 =================================================================================================================
 """
 from __future__ import annotations
 
-from typing import Iterable, List
+from typing import TYPE_CHECKING, Iterable, List
 
-from rich.table import Table
+if TYPE_CHECKING:
+    from rich.table import Table
 
 
 def normalize_people(people: Iterable[str]) -> List[str]:
@@ -33,6 +35,8 @@ def normalize_people(people: Iterable[str]) -> List[str]:
 
 
 def make_table(title: str, columns: list[str]) -> Table:
+    from rich.table import Table
+
     table = Table(title=title)
     for c in columns:
         table.add_column(c)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: validation.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Whole-document validation of expense JSON/NDJSON. Instead of stopping at the first
+exception raised while building `Expense` objects, every record is checked and every
+problem is reported with its expense index and field.
+
+Usage:
+from fairsplit.validation import validate_document, validate_file
+issues = validate_file("ledger.json")
+for issue in issues:
+    print(issue)            # expenses[17].weights: missing weight for 'Sara'
+
+Notes:
+- The checks mirror what `io_utils.expense_from_obj` and `Expense.__post_init__` enforce
+  (plus rejecting NaN/infinite amounts, which would only fail later, and a bare string
+  for "for", which the loader would split into characters), so a file with no
+  issues can be loaded with `trusted=True`.
+- NDJSON issues carry the expense index too; lines that are not JSON are reported with
+  their line number under the field "line".
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional
+
+from .models import parse_timestamp
+
+
+@dataclass(frozen=True)
+class Issue:
+    index: Optional[int]  # expense index; None for document-level problems
+    field: str
+    message: str
+
+    def __str__(self) -> str:
+        where = f"expenses[{self.index}].{self.field}" if self.index is not None else self.field
+        return f"{where}: {self.message}"
+
+
+def validate_document(data: Any) -> List[Issue]:
+    """Every problem in a parsed JSON document `{"people": [...], "expenses": [...]}`."""
+    if not isinstance(data, dict):
+        return [Issue(None, "document", f"expected an object, got {type(data).__name__}")]
+    issues: List[Issue] = []
+    _check_people(data.get("people", []), issues.append)
+    expenses = data.get("expenses", [])
+    if not isinstance(expenses, list):
+        issues.append(Issue(None, "expenses", f"expected a list, got {type(expenses).__name__}"))
+        return issues
+    for index, item in enumerate(expenses):
+        check_expense(item, index, issues.append)
+    return issues
+
+
+def validate_expenses(items: Iterable[Any], start: int = 0) -> List[Issue]:
+    """Every problem in a sequence of expense objects, indexed from `start`."""
+    issues: List[Issue] = []
+    for index, item in enumerate(items, start):
+        check_expense(item, index, issues.append)
+    return issues
+
+
+def validate_file(path: str | Path) -> List[Issue]:
+    """Validate a JSON document or an NDJSON log (by suffix, as `io_utils.stream_json` does)."""
+    from .io_utils import NDJSON_SUFFIXES, is_people_header
+
+    path = Path(path)
+    if path.suffix.lower() not in NDJSON_SUFFIXES:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError as exc:
+            return [Issue(None, "document", f"invalid JSON ({exc})")]
+        return validate_document(data)
+
+    issues: List[Issue] = []
+    index = 0
+    with path.open(encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, 1):
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError as exc:
+                issues.append(Issue(None, "line", f"{lineno}: invalid JSON ({exc})"))
+                continue
+            if index == 0 and lineno == 1 and is_people_header(obj):
+                _check_people(obj["people"], issues.append)
+                continue
+            check_expense(obj, index, issues.append)
+            index += 1
+    return issues
+
+
+def check_expense(item: Any, index: int, report: Callable[[Issue], None]) -> None:
+    """Report every problem in one expense object (without building it)."""
+    if not isinstance(item, dict):
+        report(Issue(index, "expense", f"expected an object, got {type(item).__name__}"))
+        return
+
+    def problem(field: str, message: str) -> None:
+        report(Issue(index, field, message))
+
+    if "desc" in item and not isinstance(item["desc"], str):
+        problem("desc", "must be a string")
+    if "amount" not in item:
+        problem("amount", "missing")
+    else:
+        amount = _decimal(item["amount"])
+        if amount is None:
+            problem("amount", f"not a decimal number: {item['amount']!r}")
+        elif amount <= 0:
+            problem("amount", f"must be positive, got {item['amount']!r}")
+    if "paid_by" not in item:
+        problem("paid_by", "missing")
+    elif not isinstance(item["paid_by"], str) or not item["paid_by"]:
+        problem("paid_by", "must be a non-empty string")
+
+    beneficiaries = item.get("for")
+    if "for" not in item:
+        problem("for", "missing")
+        beneficiaries = None
+    elif not isinstance(beneficiaries, list) or not all(isinstance(b, str) and b for b in beneficiaries):
+        problem("for", "must be a list of non-empty strings")
+        beneficiaries = None
+    elif not beneficiaries:
+        problem("for", "needs at least one beneficiary")
+
+    if "currency" in item and (not isinstance(item["currency"], str) or not item["currency"]):
+        problem("currency", "must be a non-empty string")
+
+    weights = item.get("weights")
+    if weights:
+        if not isinstance(weights, dict):
+            problem("weights", f"expected an object, got {type(weights).__name__}")
+        else:
+            if beneficiaries is not None:
+                missing = [b for b in dict.fromkeys(beneficiaries) if b not in weights]
+                extra = [w for w in weights if w not in beneficiaries]
+                if missing:
+                    problem("weights", f"missing weight for {', '.join(map(repr, missing))}")
+                if extra:
+                    problem("weights", f"weight for non-beneficiary {', '.join(map(repr, extra))}")
+            for name, value in weights.items():
+                weight = _decimal(value)
+                if weight is None or weight <= 0:
+                    problem("weights", f"weight for {name!r} must be a positive number, got {value!r}")
+
+    timestamp = item.get("timestamp")
+    if timestamp is not None:
+        try:
+            parse_timestamp(timestamp)
+        except (ValueError, TypeError) as exc:
+            problem("timestamp", str(exc))
+
+
+def _check_people(people: Any, report: Callable[[Issue], None]) -> None:
+    if not isinstance(people, list) or not all(isinstance(p, str) and p for p in people):
+        report(Issue(None, "people", "must be a list of non-empty strings"))
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    """Finite Decimal for a JSON number or numeric string, else None."""
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        return None
+    try:
+        result = Decimal(value) if isinstance(value, str) else Decimal(str(value))
+    except InvalidOperation:
+        return None
+    return result if result.is_finite() else None
\ No newline at end of file
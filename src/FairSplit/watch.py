@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: watch.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Follow an append-only NDJSON expense log: apply each new line to running balances as it
+arrives, checkpoint balances and the byte offset so a restart resumes where it stopped,
+and re-emit settlements only when balances have actually changed (debounced).
+
+Usage:
+from fairsplit.watch import LogWatcher
+watcher = LogWatcher("pos.ndjson", checkpoint="pos.checkpoint.json")
+watcher.run(lambda balances, settlements: ...)
+
+Notes:
+- Balances are integer minor units per currency (the `minor` ledger engine).
+- Only complete lines are consumed; a half-written last line waits for its newline.
+- Invalid lines are counted and skipped so one bad record cannot stall the feed.
+- Skipped lines and replays are reported to `on_warning` (the CLI prints them to stderr),
+  or to the `fairsplit.watch` logger when no callback is given.
+- If the log shrinks below the checkpointed offset, is replaced by another file (new
+  inode) or, on restart, no longer starts with the bytes the checkpoint saw, the watcher
+  starts over from byte zero with empty balances.
+- A backlog is read in `read_size` chunks, so a first start on a huge log is not loaded
+  into memory at once; a line split across chunks is carried over.
+- Emission waits for `debounce` seconds without new changes, but never longer than
+  `max_wait` once balances are dirty, so a continuous feed still gets settlements.
+- After the first emission, plans are patched with `update_settlements` (only transfers
+  of people whose balance moved change) and `diffs` holds what changed per currency;
+  `incremental=False` replans with `strategy` every time.
+
+=================================================================================================================
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from .io_utils import expense_from_obj, is_people_header
+from .models import SPLIT_CACHE, Expense, SplitCache
+from .money import from_minor
+from .optimizer import (
+    EXACT_BUDGET_MS,
+    Settlement,
+    SettlementDiff,
+    diff_settlements,
+    optimize_settlements,
+    update_settlements,
+)
+
+CHECKPOINT_VERSION = 1
+DEFAULT_DEBOUNCE = 1.0
+DEFAULT_POLL_INTERVAL = 0.25
+DEFAULT_CHECKPOINT_INTERVAL = 5.0
+DEFAULT_READ_SIZE = 1 << 20
+HEAD_BYTES = 4096  # prefix of the log hashed into the checkpoint to recognise the same file
+
+_log = logging.getLogger(__name__)
+
+Partitions = Dict[str, Dict[str, Decimal]]
+EmitCallback = Callable[[Partitions, Dict[str, Settlement]], None]
+
+
+class LogWatcher:
+    """Incrementally applies an NDJSON log to per-currency balances."""
+
+    def __init__(
+        self,
+        log: str | Path,
+        checkpoint: Optional[str | Path] = None,
+        strategy: str = "greedy",
+        budget_ms: Optional[float] = EXACT_BUDGET_MS,
+        debounce: float = DEFAULT_DEBOUNCE,
+        max_wait: Optional[float] = None,
+        checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+        split_cache: Optional[SplitCache] = SPLIT_CACHE,
+        clock: Callable[[], float] = time.monotonic,
+        incremental: bool = True,
+        read_size: int = DEFAULT_READ_SIZE,
+        on_warning: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.log = Path(log)
+        self.checkpoint = Path(checkpoint) if checkpoint else None
+        self.strategy = strategy
+        self.budget_ms = budget_ms
+        self.debounce = debounce
+        self.max_wait = max_wait if max_wait is not None else 10 * debounce
+        self.checkpoint_interval = checkpoint_interval
+        self.split_cache = split_cache
+        self.clock = clock
+        self.incremental = incremental
+        self.read_size = read_size
+        self.on_warning = on_warning
+
+        self._reset()
+        self._emitted: Optional[Dict[str, Dict[str, int]]] = None
+        self._plans: Dict[str, Tuple[Dict[str, int], Settlement]] = {}  # currency -> (cents, plan) last emitted
+        self.diffs: Dict[str, SettlementDiff] = {}
+        self._dirty_since: Optional[float] = None
+        self._changed_at = 0.0
+        self._saved_at = clock()
+        if self.checkpoint is not None and self.checkpoint.exists():
+            self._restore()
+
+    # --- reading -------------------------------------------------------------------------------
+
+    def poll(self) -> int:
+        """Apply every complete line appended since the last poll; returns lines applied."""
+        try:
+            st = self.log.stat()
+        except FileNotFoundError:
+            return 0
+        size = st.st_size
+        if size < self.offset:
+            self._warn(f"{self.log}: log shrank below offset {self.offset}; replaying from the start")
+            self._reset()
+        elif self.inode is not None and st.st_ino != self.inode:
+            self._warn(f"{self.log}: log was replaced; replaying from the start")
+            self._reset()
+        elif self._head is not None and self._head != _head_digest(self.log, self._head[0]):
+            self._warn(f"{self.log}: log start differs from the checkpoint; replaying from the start")
+            self._reset()
+        self._head = None  # checked once after a restore; the inode covers the rest
+        self.inode = st.st_ino
+        if size == self.offset:
+            return 0
+
+        # Bounded reads: a long backlog is applied chunk by chunk, carrying a partial last line over
+        applied = 0
+        with self.log.open("rb") as fh:
+            fh.seek(self.offset)
+            remaining = size - self.offset
+            carry = b""
+            while remaining > 0:
+                data = fh.read(min(self.read_size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                data = carry + data
+                end = data.rfind(b"\n") + 1  # only complete lines
+                carry = data[end:]
+                for raw in data[:end].split(b"\n")[:-1]:
+                    line_offset = self.offset
+                    self.offset += len(raw) + 1
+                    if not raw.strip():
+                        continue
+                    applied += self._apply_line(raw, line_offset)
+        if applied:
+            now = self.clock()
+            self._changed_at = now
+            if self._dirty_since is None:
+                self._dirty_since = now
+        return applied
+
+    def _apply_line(self, raw: bytes, line_offset: int) -> int:
+        try:
+            obj = json.loads(raw)
+            if line_offset == 0 and is_people_header(obj):
+                for p in obj["people"]:
+                    self.people.setdefault(p)
+                return 0
+            self.add(expense_from_obj(obj))
+        except (ValueError, KeyError, TypeError) as exc:
+            self.skipped += 1
+            self._warn(f"{self.log}@{line_offset}: skipped invalid line ({exc})")
+            return 0
+        return 1
+
+    def _warn(self, message: str) -> None:
+        if self.on_warning is not None:
+            self.on_warning(message)
+        else:
+            _log.warning(message)
+
+    def add(self, expense: Expense) -> None:
+        if self.split_cache is not None:
+            amount, shares = self.split_cache.charge_minor(expense)
+        else:
+            amount, shares = expense.amount_minor(), expense.split_minor()
+        cents = self.cents.setdefault(expense.currency, {})
+        cents[expense.paid_by] = cents.get(expense.paid_by, 0) + amount
+        self.people.setdefault(expense.paid_by)
+        for b, share in shares.items():
+            cents[b] = cents.get(b, 0) - share
+            self.people.setdefault(b)
+        self.expenses += 1
+
+    def balances(self) -> Partitions:
+        """currency -> person -> balance; every known person appears in each currency."""
+        return {
+            currency: {p: from_minor(cents.get(p, 0)) for p in self.people}
+            for currency, cents in sorted(self.cents.items())
+        }
+
+    # --- emission ------------------------------------------------------------------------------
+
+    def due(self) -> bool:
+        """True when balances changed and the debounce (or max wait) has elapsed."""
+        if self._dirty_since is None:
+            return False
+        now = self.clock()
+        return now - self._changed_at >= self.debounce or now - self._dirty_since >= self.max_wait
+
+    def emit(self, callback: EmitCallback) -> bool:
+        """Settle and call `callback` if balances differ from the last emission; returns whether it did."""
+        self._dirty_since = None
+        snapshot = {c: {p: v for p, v in cents.items() if v} for c, cents in self.cents.items()}
+        if snapshot == self._emitted:
+            return False
+        balances = self.balances()
+        settlements = {currency: self._settle(currency, b) for currency, b in balances.items()}
+        callback(balances, settlements)
+        self._emitted = snapshot
+        return True
+
+    def _settle(self, currency: str, balances: Dict[str, Decimal]) -> Settlement:
+        cents = self.cents[currency]
+        previous = self._plans.get(currency)
+        if previous is not None and self.incremental:
+            old_cents, old_plan = previous
+            delta = {
+                p: from_minor(cents.get(p, 0) - old_cents.get(p, 0))
+                for p in cents.keys() | old_cents.keys()
+                if cents.get(p, 0) != old_cents.get(p, 0)
+            }
+            settlement, diff = update_settlements(old_plan, delta)
+        else:
+            settlement = optimize_settlements(balances, strategy=self.strategy, budget_ms=self.budget_ms)
+            diff = diff_settlements(previous[1] if previous else Settlement(transactions=[]), settlement)
+        self._plans[currency] = (dict(cents), settlement)
+        self.diffs[currency] = diff
+        return settlement
+
+    # --- checkpoints ---------------------------------------------------------------------------
+
+    def save(self) -> None:
+        """Write the checkpoint atomically (temp file + rename)."""
+        if self.checkpoint is None:
+            return
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "log": str(self.log),
+            "offset": self.offset,
+            "inode": self.inode,
+            "head": self._head or _head_digest(self.log, min(self.offset, HEAD_BYTES)),
+            "expenses": self.expenses,
+            "skipped": self.skipped,
+            "people": list(self.people),
+            "balances_minor": self.cents,
+        }
+        tmp = self.checkpoint.with_name(self.checkpoint.name + ".tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.checkpoint)
+        self._saved_at = self.clock()
+
+    def _restore(self) -> None:
+        state = json.loads(self.checkpoint.read_text(encoding="utf-8"))
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"{self.checkpoint}: unsupported checkpoint version {state.get('version')}")
+        self.offset = state["offset"]
+        self.inode = state.get("inode")  # absent from older checkpoints
+        self._head = (state["head"][0], state["head"][1]) if state.get("head") else None
+        self.expenses = state["expenses"]
+        self.skipped = state.get("skipped", 0)
+        self.people = dict.fromkeys(state["people"])
+        self.cents = {c: dict(b) for c, b in state["balances_minor"].items()}
+
+    def _reset(self) -> None:
+        self.offset = 0
+        self.inode: Optional[int] = None
+        self._head: Optional[Tuple[int, str]] = None  # (length, sha256) to check on the next poll
+        self.expenses = 0
+        self.skipped = 0
+        self.people: Dict[str, None] = {}
+        self.cents: Dict[str, Dict[str, int]] = {}
+
+    # --- loop ----------------------------------------------------------------------------------
+
+    def run(
+        self,
+        callback: EmitCallback,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        once: bool = False,
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> None:
+        """Tail the log until `should_stop()` (or after one pass with `once`), checkpointing on exit."""
+        try:
+            while True:
+                self.poll()
+                if once:
+                    self.emit(callback)
+                    return
+                if self.due():
+                    self.emit(callback)
+                if self.checkpoint is not None and self.clock() - self._saved_at >= self.checkpoint_interval:
+                    self.save()
+                if should_stop():
+                    return
+                time.sleep(poll_interval)
+        finally:
+            self.save()
+
+
+def _head_digest(path: Path, length: int) -> Optional[Tuple[int, str]]:
+    """(length, sha256) of the first `length` bytes of `path`; None if it cannot be read."""
+    try:
+        with path.open("rb") as fh:
+            return length, hashlib.sha256(fh.read(length)).hexdigest()
+    except OSError:
+        return None
\ No newline at end of file
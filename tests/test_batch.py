@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_batch.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for multi-file batch settlement.
+
+Usage:
+pytest -q
+
+Notes:
+- A malformed group must be reported without aborting the other groups.
+
+=================================================================================================================
+"""
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from fairsplit.batch import SUMMARY_NAME, find_group_files, run_batch, unique_stems
+
+SAMPLE = Path(__file__).parent / "data" / "sample_expenses.json"
+
+
+@pytest.fixture
+def groups(tmp_path):
+    src = tmp_path / "groups"
+    src.mkdir()
+    shutil.copy(SAMPLE, src / "trip.json")
+    shutil.copy(SAMPLE, src / "flat.json")
+    (src / "broken.json").write_text('{"people": ["A"], "expenses": [', encoding="utf-8")
+    (src / "notes.txt").write_text("ignored", encoding="utf-8")
+    return src
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_isolates_failures(groups, tmp_path, workers):
+    out = tmp_path / "out"
+    paths = find_group_files(groups)
+    assert [p.name for p in paths] == ["broken.json", "flat.json", "trip.json"]
+
+    summary = run_batch(paths, out, workers=workers, chunk_size=1)
+    assert (summary["groups"], summary["succeeded"], summary["failed"]) == (3, 2, 1)
+    assert summary["errors"][0]["source"].endswith("broken.json")
+    assert summary["transactions"] == 6
+    assert summary["transferred"] == {"USD": "164.00"}
+
+    result = json.loads((out / "trip.result.json").read_text(encoding="utf-8"))
+    assert result["balances"]["USD"]["Ali"] == "82.00"
+    assert json.loads((out / SUMMARY_NAME).read_text(encoding="utf-8"))["failed"] == 1
+
+
+def test_output_names_never_collide(tmp_path):
+    src = tmp_path / "groups"
+    src.mkdir()
+    shutil.copy(SAMPLE, src / "a-2.json")
+    shutil.copy(SAMPLE, src / "a.json")
+    (src / "a.ndjson").write_text('{"amount": "10", "paid_by": "A", "for": ["A", "B"]}\n', encoding="utf-8")
+    assert unique_stems(find_group_files(src)) == ["a-2", "a", "a-3"]
+    summary = run_batch(find_group_files(src), tmp_path / "out", workers=1)
+    assert summary["succeeded"] == 3
+    assert sorted(p.name for p in (tmp_path / "out").glob("*.result.json")) == [
+        "a-2.result.json", "a-3.result.json", "a.result.json"
+    ]
+
+
+def test_rerun_skips_previous_results(groups, tmp_path):
+    out = groups / "out"
+    run_batch(find_group_files(groups, exclude=out), out, workers=1)
+    shutil.copy(out / "trip.result.json", groups / "old.result.json")
+    (groups / SUMMARY_NAME).write_text("{}", encoding="utf-8")
+    shutil.copy(SAMPLE, out / "copy.json")  # only the exclude keeps it out
+    assert [p.name for p in find_group_files(groups, exclude=out)] == ["broken.json", "flat.json", "trip.json"]
+    assert [p.name for p in find_group_files(str(groups / "**" / "*.json"), exclude=out)] == [
+        "broken.json", "flat.json", "trip.json"
+    ]
+
+
+def test_find_group_files_accepts_glob(groups):
+    assert [p.name for p in find_group_files(str(groups / "t*.json"))] == ["trip.json"]
\ No newline at end of file
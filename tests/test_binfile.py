@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_binfile.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for the memory-mapped binary ledger format.
+
+Usage:
+pytest -q
+
+Notes:
+- A mapped table must give the same balances as the JSON it was converted from.
+
+=================================================================================================================
+"""
+import mmap
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from fairsplit.binfile import binary_to_json, dump_binary, json_to_binary, load_binary
+from fairsplit.io_utils import load_json
+from fairsplit.ledger import compute_balances, compute_balances_by_currency
+from fairsplit.models import Expense
+from fairsplit.table import ExpenseTable
+
+SAMPLE = Path(__file__).parent / "data" / "sample_expenses.json"
+
+EXPENSES = [
+    Expense(desc="rent", amount=Decimal("1000.00"), paid_by="A", beneficiaries=["A", "B", "C"]),
+    Expense(
+        desc="hotel", amount=Decimal("333.33"), paid_by="B", beneficiaries=["A", "B"],
+        weights={"B": Decimal("1.5"), "A": Decimal("2")}, timestamp="2026-03-14T19:30:00.250+01:00",
+    ),
+    Expense(desc="sushi ☕", amount=Decimal("1000"), paid_by="C", beneficiaries=["A", "B", "C"], currency="JPY"),
+]
+
+
+def test_round_trip_is_mapped(tmp_path):
+    people = ["A", "B", "C", "D"]
+    table = ExpenseTable.from_expenses(people, EXPENSES)
+    dump_binary(tmp_path / "t.fsb", people, table)
+
+    loaded_people, mapped = load_binary(tmp_path / "t.fsb")
+    assert loaded_people == people
+    assert isinstance(mapped.amount, memoryview) and mapped.mapping is not None
+    assert list(mapped) == list(table)
+    assert [e.timestamp for e in mapped] == [e.timestamp for e in EXPENSES]
+    assert compute_balances_by_currency(people, mapped) == compute_balances_by_currency(people, EXPENSES)
+
+
+def test_mapped_table_is_read_only(tmp_path):
+    dump_binary(tmp_path / "t.fsb", ["A", "B", "C"], ExpenseTable.from_expenses(["A", "B", "C"], EXPENSES))
+    _, mapped = load_binary(tmp_path / "t.fsb")
+    with pytest.raises(TypeError):
+        mapped.append(EXPENSES[0])
+
+
+def test_json_conversion_round_trip(tmp_path):
+    assert json_to_binary(SAMPLE, tmp_path / "s.fsb") > 0
+    binary_to_json(tmp_path / "s.fsb", tmp_path / "s.json")
+
+    people, expenses = load_json(SAMPLE)
+    people2, expenses2 = load_json(tmp_path / "s.json")
+    assert people2 == people
+    assert compute_balances(people2, expenses2) == compute_balances(people, expenses)
+    assert compute_balances(*load_binary(tmp_path / "s.fsb")) == compute_balances(people, expenses)
+
+
+@pytest.mark.parametrize("corrupt", ["truncated", "rows"])
+def test_corrupt_file_closes_the_mapping(tmp_path, monkeypatch, corrupt):
+    path = tmp_path / "t.fsb"
+    dump_binary(path, ["A", "B", "C"], ExpenseTable.from_expenses(["A", "B", "C"], EXPENSES))
+    data = bytearray(path.read_bytes())
+    if corrupt == "truncated":
+        del data[-16:]  # the last section now runs past the end
+    else:
+        data[8:16] = (99).to_bytes(8, "little")  # header row count no longer matches the columns
+    path.write_bytes(bytes(data))
+
+    opened = []
+    real_mmap = mmap.mmap
+
+    def tracked(*args, **kwargs):
+        opened.append(real_mmap(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(mmap, "mmap", tracked)
+    with pytest.raises(ValueError):
+        load_binary(path)
+    assert len(opened) == 1 and opened[0].closed
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "bad.fsb"
+    path.write_bytes(b"NOPE" + b"\0" * 60)
+    with pytest.raises(ValueError, match="bad magic"):
+        load_binary(path)
+    path.write_bytes(b"FS")
+    with pytest.raises(ValueError, match="too short"):
+        load_binary(path)
\ No newline at end of file
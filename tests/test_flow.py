@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_flow.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for the constrained min-cost-flow settlement strategy.
+
+Usage:
+pytest -q
+
+Notes:
+- Minimum fees are checked against a plain Bellman-Ford successive-shortest-path solver.
+
+=================================================================================================================
+"""
+import random
+from decimal import Decimal
+
+import pytest
+
+from fairsplit.flow import Channel, FlowNetwork, InfeasibleSettlement, PaymentNetwork, settle_flow
+from fairsplit.money import quantize
+from fairsplit.optimizer import optimize_settlements
+from fairsplit.synthetic import payment_network
+
+
+def _residual(balances, transactions):
+    residual = dict(balances)
+    for t in transactions:
+        residual[t.payer] = residual.get(t.payer, Decimal(0)) + t.amount
+        residual[t.payee] = residual.get(t.payee, Decimal(0)) - t.amount
+    return {p: v for p, v in residual.items() if v}
+
+
+def _min_fees(balances, channels):
+    """Reference: one Bellman-Ford shortest path per augmentation, fee rates as costs."""
+    people = sorted({c.payer for c in channels} | {c.payee for c in channels} | set(balances))
+    graph = []  # [from, to, capacity, rate, reverse index]
+    source, sink = "<s>", "<t>"
+
+    def add(u, v, cap, rate):
+        graph.append([u, v, cap, rate, len(graph) + 1])
+        graph.append([v, u, 0, -rate, len(graph) - 1])
+
+    supply = 0
+    for p, v in balances.items():
+        cents = int(v * 100)
+        if cents < 0:
+            add(source, p, -cents, Decimal(0))
+        elif cents > 0:
+            add(p, sink, cents, Decimal(0))
+            supply += cents
+    for c in channels:
+        add(c.payer, c.payee, supply if c.capacity is None else int(c.capacity * 100), c.fee_rate)
+
+    fees, flow = Decimal(0), 0
+    while flow < supply:
+        dist, via = {source: Decimal(0)}, {}
+        for _ in range(len(people) + 2):
+            for i, (u, v, cap, rate, _) in enumerate(graph):
+                if cap and u in dist and dist[u] + rate < dist.get(v, Decimal("Infinity")):
+                    dist[v], via[v] = dist[u] + rate, i
+        if sink not in dist:
+            return None
+        path, node = [], sink
+        while node != source:
+            path.append(via[node])
+            node = graph[via[node]][0]
+        pushed = min(graph[i][2] for i in path)
+        for i in path:
+            graph[i][2] -= pushed
+            graph[graph[i][4]][2] += pushed
+        fees += pushed * dist[sink] / 100
+        flow += pushed
+    return quantize(fees)
+
+
+def _random_case(rng, n):
+    people = [f"p{i}" for i in range(n)]
+    cents = [rng.randint(-5000, 5000) for _ in people]
+    cents[-1] -= sum(cents)
+    balances = {p: Decimal(c).scaleb(-2) for p, c in zip(people, cents)}
+    channels = []
+    for p in people:
+        for q in rng.sample(people, 4):
+            if q != p:
+                capacity = Decimal(rng.randint(10, 200)) if rng.random() < 0.3 else None
+                channels.append(Channel(p, q, Decimal(rng.choice(["0", "0.005", "0.01", "0.03"])), capacity))
+    return balances, channels
+
+
+def test_prefers_cheaper_route_through_an_intermediary():
+    balances = {"A": Decimal("-30"), "B": Decimal("-20"), "C": Decimal("50")}
+    network = FlowNetwork(
+        channels=[Channel("A", "B"), Channel("B", "C", Decimal("0.01")), Channel("A", "C", Decimal("0.05"))]
+    )
+    transactions, fees = settle_flow(balances, network)
+    plan = {(t.payer, t.payee): t.amount for t in transactions}
+    assert plan == {("A", "B"): Decimal("30.00"), ("B", "C"): Decimal("50.00")}
+    assert fees == Decimal("0.50")
+
+
+def test_capacity_and_outflow_caps():
+    balances = {"A": Decimal("-30"), "B": Decimal("-20"), "C": Decimal("50")}
+    channels = [Channel("A", "B"), Channel("B", "C", Decimal("0.01")), Channel("A", "C", Decimal("0.05"))]
+    transactions, fees = settle_flow(balances, FlowNetwork(channels=channels, max_outflow={"B": Decimal("40")}))
+    assert not _residual(balances, transactions)
+    assert sum(t.amount for t in transactions if t.payer == "B") == Decimal("40.00")
+    assert fees == Decimal("0.90")
+
+    channels[1] = Channel("B", "C", Decimal("0.01"), capacity=Decimal("25"))
+    transactions, fees = settle_flow(balances, FlowNetwork(channels=channels))
+    assert {(t.payer, t.payee): t.amount for t in transactions}[("B", "C")] == Decimal("25.00")
+    assert fees == Decimal("0.25") + Decimal("1.25")
+
+
+def test_payment_network_pairs_members():
+    balances = {"A": Decimal("-10"), "B": Decimal("-5"), "C": Decimal("7"), "D": Decimal("8")}
+    network = FlowNetwork(networks=[PaymentNetwork("bank", ["A", "B", "C", "D"], Decimal("0.01"))])
+    transactions, fees = settle_flow(balances, network)
+    assert not _residual(balances, transactions)
+    assert all(t.payer in "AB" and t.payee in "CD" for t in transactions)
+    assert fees == Decimal("0.15")
+
+
+def test_infeasible_reports_what_is_left():
+    balances = {"A": Decimal("-10"), "B": Decimal("-5"), "C": Decimal("15")}
+    with pytest.raises(InfeasibleSettlement) as info:
+        settle_flow(balances, FlowNetwork(channels=[Channel("A", "C")]))
+    assert info.value.unsettled == {"B": Decimal("-5.00"), "C": Decimal("5.00")}
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_fees_match_reference(seed):
+    rng = random.Random(seed)
+    balances, channels = _random_case(rng, 12)
+    expected = _min_fees(balances, channels)
+    if expected is None:
+        with pytest.raises(InfeasibleSettlement):
+            settle_flow(balances, FlowNetwork(channels=channels))
+        return
+    transactions, fees = settle_flow(balances, FlowNetwork(channels=channels))
+    assert not _residual(balances, transactions)
+    assert fees == expected
+    allowed = {(c.payer, c.payee) for c in channels}
+    assert all((t.payer, t.payee) in allowed for t in transactions)
+
+
+def test_strategy_and_synthetic_network():
+    rng = random.Random(3)
+    people = [f"person{i:03d}" for i in range(300)]
+    cents = [rng.randint(-20_000, 20_000) for _ in people]
+    cents[0] -= sum(cents)
+    balances = {p: Decimal(c).scaleb(-2) for p, c in zip(people, cents)}
+
+    settlement = optimize_settlements(balances, strategy="flow", network=payment_network(people, networks=5))
+    assert settlement.strategy == "flow"
+    assert not _residual(balances, settlement.transactions)
+    unconstrained = optimize_settlements(balances, strategy="flow")
+    assert unconstrained.strategy == "flow"
+    assert unconstrained.transactions == optimize_settlements(balances, strategy="heap").transactions
+
+
+def test_network_from_obj():
+    network = FlowNetwork.from_obj(
+        {
+            "channels": [{"payer": "A", "payee": "B", "fee_rate": "0.01", "capacity": 50, "both_ways": True}],
+            "networks": [{"name": "bank", "members": ["B", "C"]}],
+            "max_outflow": {"A": "20"},
+        }
+    )
+    assert network.channels == [
+        Channel("A", "B", Decimal("0.01"), Decimal("50")),
+        Channel("B", "A", Decimal("0.01"), Decimal("50")),
+    ]
+    assert network.networks == [PaymentNetwork("bank", ["B", "C"], Decimal("0"))]
+    assert network.max_outflow == {"A": Decimal("20")}
+    with pytest.raises(ValueError):
+        FlowNetwork(channels=[Channel("A", "A")])
\ No newline at end of file
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_fx.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for FX rate loading and base-currency conversion of balances.
+
+Usage:
+pytest -q
+
+Notes:
+- Converted balances must still sum to zero at cent precision.
+
+=================================================================================================================
+"""
+import json
+from decimal import Decimal
+
+from fairsplit.fx import FxRates, load_rates
+
+
+def test_cross_rates_from_pivot():
+    rates = FxRates.from_mapping("USD", {"EUR": "1.10", "GBP": "1.32"})
+    assert rates.rate("EUR", "USD") == Decimal("1.10")
+    assert rates.rate("gbp", "EUR") == Decimal("1.2")
+    assert rates.rate("USD", "USD") == 1
+
+
+def test_convert_balances_sums_to_zero():
+    rates = FxRates.from_mapping("USD", {"EUR": "1.07", "JPY": "0.0067"})
+    partitions = {
+        "EUR": {"A": Decimal("10.01"), "B": Decimal("-5.00"), "C": Decimal("-5.01")},
+        "JPY": {"A": Decimal("-1001"), "B": Decimal("1001"), "C": Decimal("0")},
+    }
+    usd = rates.convert_balances(partitions, "USD")
+    assert sum(usd.values()) == 0
+    assert usd["B"] == Decimal("1.36")
+
+
+def test_load_rates_is_cached_until_file_changes(tmp_path):
+    path = tmp_path / "rates.json"
+    path.write_text(json.dumps({"base": "USD", "rates": {"EUR": "1.08"}}), encoding="utf-8")
+    first = load_rates(path)
+    assert load_rates(path) is first
+
+    path.write_text(json.dumps({"base": "USD", "rates": {"EUR": "1.09", "GBP": "1.3"}}), encoding="utf-8")
+    assert load_rates(path).rate("EUR", "USD") == Decimal("1.09")
\ No newline at end of file
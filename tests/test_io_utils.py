@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_io_utils.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for JSON loading, including the streaming and NDJSON readers.
+
+Usage:
+pytest -q
+
+Notes:
+- Small chunk sizes force the incremental parser to refill mid-value.
+
+=================================================================================================================
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from fairsplit.io_utils import expense_from_obj, expense_to_obj, iter_ndjson_range, load_json, stream_json
+
+SAMPLE = Path(__file__).parent / "data" / "sample_expenses.json"
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_trusted_load_matches_checked(tmp_path, compact):
+    data = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    data["expenses"][0]["timestamp"] = "2026-03-01T12:00:00+02:00"
+    path = tmp_path / "dated.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    people, expenses = load_json(path, compact=compact)
+    trusted_people, trusted_expenses = load_json(path, compact=compact, trusted=True)
+    assert trusted_people == people
+    assert list(trusted_expenses) == list(expenses)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_stream_matches_load_json(chunk_size):
+    people, expenses = load_json(SAMPLE)
+    stream = stream_json(SAMPLE, chunk_size=chunk_size)
+    assert stream.people == people
+    assert list(stream) == expenses
+
+
+def test_stream_people_after_expenses(tmp_path):
+    data = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    path = tmp_path / "reordered.json"
+    path.write_text(json.dumps({"expenses": data["expenses"], "people": data["people"]}), encoding="utf-8")
+    stream = stream_json(path, chunk_size=16)
+    assert stream.people == data["people"]
+    assert len(list(stream)) == len(data["expenses"])
+
+
+def test_ndjson_with_people_header(tmp_path):
+    data = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    path = tmp_path / "log.ndjson"
+    lines = [json.dumps({"people": data["people"]})] + [json.dumps(e) for e in data["expenses"]]
+    path.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+    people, expenses = load_json(path)
+    assert people == data["people"]
+    assert expenses == load_json(SAMPLE)[1]
+
+
+def test_stream_reports_malformed_document(tmp_path):
+    path = tmp_path / "bad.json"
+    item = '{"amount": "1.00", "paid_by": "A", "for": ["A"]}'
+    path.write_text('{"people": ["A"], "expenses": [' + item + " " + item + "]}", encoding="utf-8")
+    with pytest.raises(ValueError, match="expected"):
+        list(stream_json(path))
+
+def test_ndjson_byte_ranges_cover_every_line_once(tmp_path):
+    people, expenses = load_json(SAMPLE)
+    lines = [json.dumps({"people": people})] + [json.dumps(expense_to_obj(e)) for e in expenses * 5]
+    path = tmp_path / "log.ndjson"
+    path.write_text("\n".join(lines), encoding="utf-8")  # no final newline
+    stream = stream_json(path)
+    for rows in (1, 3, 100):
+        ranges = stream.byte_ranges(rows)
+        assert all(hi == lo for (_, hi), (lo, _) in zip(ranges, ranges[1:]))
+        assert ranges[-1][1] == path.stat().st_size
+        assert [e for lo, hi in ranges for e in iter_ndjson_range(path, lo, hi)] == list(stream)
+    assert len(stream.byte_ranges(100)) == 1
+
+
+def test_timestamp_round_trip(tmp_path):
+    path = tmp_path / "log.ndjson"
+    item = {"desc": "x", "amount": "3.00", "paid_by": "A", "for": ["A"], "timestamp": "2026-01-31T23:59:59.5Z"}
+    path.write_text(json.dumps(item) + "\n", encoding="utf-8")
+    _, expenses = load_json(path)
+    assert expense_to_obj(expenses[0])["timestamp"] == "2026-01-31T23:59:59.500000+00:00"
+    assert expense_from_obj(expense_to_obj(expenses[0])) == expenses[0]
\ No newline at end of file
@@ -23,15 +23,183 @@ Notes:
 """
 from decimal import Decimal
 
-from fairsplit.ledger import compute_balances
+import pytest
+
+from fairsplit import ledger
+from fairsplit.ledger import (
+    ENGINES,
+    Ledger,
+    compute_balances,
+    compute_balances_batch,
+    compute_balances_by_currency,
+)
 from fairsplit.models import Expense
 
 
-def test_balances_sum_to_zero():
+@pytest.mark.parametrize("engine", ENGINES)
+def test_balances_sum_to_zero(engine):
     people = ["A", "B", "C"]
     expenses = [
         Expense(desc="dinner", amount=Decimal("90.00"), paid_by="A", beneficiaries=["A", "B", "C"]),
         Expense(desc="taxi", amount=Decimal("30.00"), paid_by="B", beneficiaries=["B", "C"]),
     ]
-    b = compute_balances(people, expenses)
-    assert round(sum(b.values()), 2) == 0
\ No newline at end of file
+    b = compute_balances(people, expenses, engine=engine)
+    assert round(sum(b.values()), 2) == 0
+
+
+def test_engines_agree():
+    people = ["A", "B", "C", "D"]
+    expenses = [
+        Expense(desc="rent", amount=Decimal("1000.00"), paid_by="A", beneficiaries=["A", "B", "C"]),
+        Expense(desc="fuel", amount=Decimal("20.00"), paid_by="B", beneficiaries=["A", "B", "C"]),
+        Expense(desc="gift", amount=Decimal("0.05"), paid_by="C", beneficiaries=["B", "C", "D"]),
+        Expense(
+            desc="hotel",
+            amount=Decimal("333.33"),
+            paid_by="D",
+            beneficiaries=["A", "D"],
+            weights={"A": Decimal("1.5"), "D": Decimal("2")},
+        ),
+    ]
+    assert compute_balances(people, expenses, engine="minor") == compute_balances(people, expenses)
+
+
+def test_unknown_engine_rejected():
+    with pytest.raises(ValueError):
+        compute_balances(["A"], [], engine="float")
+
+
+def _columns(people, expenses):
+    index = {p: i for i, p in enumerate(people)}
+    payer, amount, offsets, bens, weights = [], [], [0], [], []
+    for e in expenses:
+        payer.append(index[e.paid_by])
+        amount.append(e.amount_minor())
+        names = list(e.weights) if e.weights else list(e.beneficiaries)
+        bens.extend(index[b] for b in names)
+        weights.extend(int(e.weights[b]) if e.weights else 0 for b in names)
+        offsets.append(len(bens))
+    return payer, amount, offsets, bens, weights
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_batch_matches_compute_balances(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(ledger, "np", None)
+    people = ["A", "B", "C", "D"]
+    expenses = [
+        Expense(desc="rent", amount=Decimal("1000.00"), paid_by="A", beneficiaries=["A", "B", "C"]),
+        Expense(desc="fuel", amount=Decimal("20.00"), paid_by="B", beneficiaries=["A", "B", "C"]),
+        Expense(
+            desc="hotel",
+            amount=Decimal("333.33"),
+            paid_by="D",
+            beneficiaries=["A", "D"],
+            weights={"A": Decimal("3"), "D": Decimal("4")},
+        ),
+        Expense(desc="gift", amount=Decimal("0.05"), paid_by="C", beneficiaries=["B", "C", "D"]),
+    ]
+    batch = compute_balances_batch(people, *_columns(people, expenses))
+    assert batch == compute_balances(people, expenses)
+
+
+def test_batch_weights_beyond_int64_products():
+    people = ["A", "B"]
+    expenses = [
+        Expense(
+            desc="yacht", amount=Decimal("1000000.00"), paid_by="A", beneficiaries=["A", "B"],
+            weights={"A": Decimal("1000000000000001"), "B": Decimal("1000000000000000")},
+        )
+    ]
+    # units * weight is ~1e23: NumPy's int64 would wrap silently, so the exact loop must run
+    assert compute_balances_batch(people, *_columns(people, expenses)) == compute_balances(people, expenses)
+
+
+def test_batch_rejects_malformed_offsets():
+    with pytest.raises(ValueError):
+        compute_balances_batch(["A"], [0], [100], [0, 2], [0])
+
+
+def test_incremental_ledger_matches_full_recompute():
+    people = ["A", "B", "C"]
+    dinner = Expense(desc="dinner", amount=Decimal("20.00"), paid_by="A", beneficiaries=["A", "B", "C"])
+    taxi = Expense(desc="taxi", amount=Decimal("30.00"), paid_by="B", beneficiaries=["B", "C"])
+    fixed = Expense(desc="taxi", amount=Decimal("31.50"), paid_by="C", beneficiaries=["A", "B", "C"])
+
+    ledger_ = Ledger(people)
+    dinner_id = ledger_.add_expense(dinner)
+    taxi_id = ledger_.add_expense(taxi)
+    assert ledger_.balances() == compute_balances(people, [dinner, taxi])
+
+    ledger_.edit_expense(taxi_id, fixed)
+    assert ledger_.balances() == compute_balances(people, [dinner, fixed])
+
+    ledger_.remove_expense(dinner_id)
+    assert ledger_.balances() == compute_balances(people, [fixed])
+    assert sum(ledger_.balances().values()) == 0
+    assert len(ledger_) == 1
+
+
+def test_ledger_remove_unknown_expense():
+    with pytest.raises(KeyError):
+        Ledger(["A"]).remove_expense(42)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_balances_partitioned_by_currency(engine):
+    people = ["A", "B"]
+    expenses = [
+        Expense(desc="hotel", amount=Decimal("100.00"), paid_by="A", beneficiaries=["A", "B"], currency="EUR"),
+        Expense(desc="taxi", amount=Decimal("30.00"), paid_by="B", beneficiaries=["A", "B"]),
+    ]
+    partitions = compute_balances_by_currency(people, expenses, engine=engine)
+    assert partitions == {
+        "EUR": {"A": Decimal("50.00"), "B": Decimal("-50.00")},
+        "USD": {"A": Decimal("-15.00"), "B": Decimal("15.00")},
+    }
+
+
+def test_engines_agree_on_zero_decimal_currencies():
+    from fairsplit.table import ExpenseTable
+
+    people = ["A", "B", "C"]
+    expenses = [
+        Expense(desc="sushi", amount=Decimal("1000"), paid_by="A", beneficiaries=people, currency="JPY"),
+        Expense(desc="taxi", amount=Decimal("700.5"), paid_by="B", beneficiaries=["A", "C"], currency="JPY",
+                weights={"A": Decimal("1"), "C": Decimal("2")}),
+        Expense(desc="tea", amount=Decimal("0.105"), paid_by="C", beneficiaries=people, currency="BHD"),
+    ]
+    results = [compute_balances(people, expenses, engine=engine) for engine in ENGINES]
+    results.append(compute_balances(people, ExpenseTable.from_expenses(people, expenses)))
+    assert results[0] == results[1] == results[2]
+    by_currency = [compute_balances_by_currency(people, expenses, engine=engine) for engine in ENGINES]
+    assert by_currency[0] == by_currency[1]
+    assert by_currency[0]["JPY"] == {"A": Decimal("432.00"), "B": Decimal("368.00"), "C": Decimal("-800.00")}
+
+
+@pytest.mark.parametrize("source", ["list", "table", "ndjson"])
+def test_parallel_matches_serial(tmp_path, source):
+    import json
+
+    from fairsplit.io_utils import expense_to_obj, stream_json
+    from fairsplit.table import ExpenseTable
+
+    people = ["A", "B", "C", "D"]
+    expenses = [
+        Expense(desc=f"e{i}", amount=Decimal(i * 37 % 5000 + 1) / 100, paid_by=people[i % 4],
+                beneficiaries=people[: i % 3 + 2])
+        for i in range(50)
+    ]
+    if source == "table":
+        expenses_in = ExpenseTable.from_expenses(people, expenses)
+    elif source == "ndjson":
+        lines = [json.dumps({"people": people}), ""] + [json.dumps(expense_to_obj(e)) for e in expenses]
+        (tmp_path / "log.ndjson").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        expenses_in = stream_json(tmp_path / "log.ndjson")
+    else:
+        expenses_in = iter(expenses)  # runs serially: nothing to gain from converting it in this process
+    parallel = compute_balances(people, expenses_in, workers=2, chunk_size=7)
+    assert parallel == compute_balances(people, expenses)
+    assert list(parallel) == list(compute_balances(people, expenses))
\ No newline at end of file
@@ -23,7 +23,9 @@ Notes:
 """
 from decimal import Decimal
 
-from fairsplit.models import Expense
+import pytest
+
+from fairsplit.models import Expense, SplitCache, from_timestamp_us, parse_timestamp, timestamp_us
 
 
 def test_equal_split_no_drift():
@@ -40,4 +42,73 @@ def test_weighted_split():
     s = e.split()
     assert s["A"] + s["B"] == Decimal("30.00")
     # B should pay roughly twice A (subject to cent rounding)
-    assert s["B"] >= s["A"]
\ No newline at end of file
+    assert s["B"] >= s["A"]
+
+
+def test_equal_split_rounded_up_base_keeps_total():
+    e = Expense(desc="x", amount=Decimal("20.00"), paid_by="A", beneficiaries=["A", "B", "C"])
+    s = e.split()
+    assert sum(s.values()) == Decimal("20.00")
+    assert s == {"A": Decimal("6.66"), "B": Decimal("6.67"), "C": Decimal("6.67")}
+
+
+def test_weighted_split_half_cent_rounds_half_up():
+    e = Expense(
+        desc="x", amount=Decimal("134.19"), paid_by="A", beneficiaries=["A", "B"],
+        weights={"A": Decimal("5"), "B": Decimal("9")},
+    )
+    # 134.19 * 5 / 14 == 47.925 exactly
+    assert e.split() == {"A": Decimal("47.93"), "B": Decimal("86.26")}
+
+
+def test_split_minor_matches_split():
+    e = Expense(
+        desc="x", amount=Decimal("100.00"), paid_by="A", beneficiaries=["A", "B", "C"],
+        weights={"A": Decimal("1"), "B": Decimal("1"), "C": Decimal("1")},
+    )
+    assert e.split_minor() == {p: int(v * 100) for p, v in e.split().items()}
+
+
+def test_split_minor_uses_currency_minor_unit():
+    e = Expense(desc="x", amount=Decimal("1000"), paid_by="A", beneficiaries=["A", "B", "C"], currency="JPY")
+    assert e.split_minor() == {"A": 33400, "B": 33300, "C": 33300}
+    assert e.split() == {"A": Decimal("334"), "B": Decimal("333"), "C": Decimal("333")}
+
+
+def test_split_cache_hits_recurring_shapes():
+    cache = SplitCache(maxsize=2)
+    rent = Expense(desc="rent", amount=Decimal("900.00"), paid_by="A", beneficiaries=["A", "B", "C"])
+    again = Expense(desc="rent (May)", amount=Decimal("900.00"), paid_by="B", beneficiaries=["A", "B", "C"])
+    shares = cache.split(rent)
+    assert cache.split(again) is shares
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert dict(shares) == rent.split()
+    with pytest.raises(TypeError):
+        shares["A"] = Decimal("0")  # type: ignore[index]
+
+
+def test_split_cache_evicts_least_recently_used():
+    cache = SplitCache(maxsize=2)
+    e1, e2, e3 = (
+        Expense(desc="x", amount=Decimal(amount), paid_by="A", beneficiaries=["A", "B"])
+        for amount in ("1.00", "2.00", "3.00")
+    )
+    cache.split(e1)
+    cache.split(e2)
+    cache.split(e1)  # e2 is now least recently used
+    cache.split(e3)
+    assert len(cache) == 2
+    cache.split(e1)
+    cache.split(e2)
+    assert cache.info() == {"hits": 2, "misses": 4, "size": 2, "maxsize": 2}
+
+def test_timestamps_normalize_to_utc():
+    e = Expense(desc="x", amount=Decimal("1"), paid_by="A", beneficiaries=["A"], timestamp="2026-03-01T01:00+02:00")
+    assert e.timestamp == parse_timestamp("2026-02-28T23:00:00")
+    assert e.timestamp.utcoffset().total_seconds() == 0
+    assert parse_timestamp("2026-03-01") == parse_timestamp("2026-03-01T00:00Z")
+    assert parse_timestamp("2026-03-01T10:00:00.5Z") == parse_timestamp("2026-03-01T10:00:00.500000+00:00")
+    assert parse_timestamp("2026-03-01T10:00:00,25z").microsecond == 250_000
+    assert from_timestamp_us(timestamp_us(e.timestamp)) == e.timestamp
+    with pytest.raises(ValueError):
+        parse_timestamp("last tuesday")
\ No newline at end of file
@@ -23,7 +23,7 @@ Notes:
 """
 from decimal import Decimal
 
-from fairsplit.money import D, quantize
+from fairsplit.money import D, from_minor, minor_exponent, quantize, to_minor
 
 
 def test_d_decimal_creation():
@@ -32,4 +32,11 @@ def test_d_decimal_creation():
 
 
 def test_quantize_half_up():
-    assert quantize(Decimal("1.005")) == Decimal("1.01")
\ No newline at end of file
+    assert quantize(Decimal("1.005")) == Decimal("1.01")
+
+
+def test_minor_units_round_trip():
+    assert to_minor(Decimal("12.34")) == 1234
+    assert to_minor(Decimal("-0.005")) == -1
+    assert from_minor(-1234) == Decimal("-12.34")
+    assert minor_exponent("jpy") == 0 and minor_exponent("EUR") == 2
\ No newline at end of file
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_netting.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for cross-group netting and per-group attribution of the net transfers.
+
+Usage:
+pytest -q
+
+Notes:
+- `workers=0` keeps file consolidation in-process.
+
+=================================================================================================================
+"""
+import json
+import random
+from collections import defaultdict
+from decimal import Decimal
+
+from fairsplit.netting import consolidate, consolidate_files
+
+
+def _usd(**balances):
+    return {"USD": {p: Decimal(v) for p, v in balances.items()}}
+
+
+def test_debts_cancel_across_groups():
+    result = consolidate([("trip", _usd(A="20", B="-10", C="-10")), ("flat", _usd(A="-10", B="10"))])
+    assert result.groups == 2 and result.people == 3 and result.separate_transfers == 3
+    [t] = result.transfers
+    assert (t.transaction.payer, t.transaction.payee, t.transaction.amount) == ("C", "A", Decimal("10.00"))
+    assert t.groups == (("trip", Decimal("10.00")),)
+
+
+def test_random_groups_settle_and_attribute_consistently():
+    rng = random.Random(3)
+    people = [f"P{i}" for i in range(60)]
+    groups = []
+    for g in range(300):
+        members = rng.sample(people, rng.randint(2, 6))
+        cents = [rng.randint(-5_000, 5_000) for _ in members[1:]]
+        cents.append(-sum(cents))
+        groups.append((f"g{g}", {"USD": {p: Decimal(c).scaleb(-2) for p, c in zip(members, cents)}}))
+
+    result = consolidate(iter(groups))
+    totals = defaultdict(Decimal)
+    debts = defaultdict(Decimal)
+    for group_id, partitions in groups:
+        for p, v in partitions["USD"].items():
+            totals[p] += v
+            if v < 0:
+                debts[group_id, p] -= v
+
+    attributed = defaultdict(Decimal)
+    for t in result.transfers:
+        tx = t.transaction
+        totals[tx.payer] += tx.amount
+        totals[tx.payee] -= tx.amount
+        assert sum(a for _, a in t.groups) == tx.amount
+        for group_id, amount in t.groups:
+            attributed[group_id, tx.payer] += amount
+    assert all(v == 0 for v in totals.values())
+    assert all(amount <= debts[key] for key, amount in attributed.items())
+    assert len(result.transfers) < result.separate_transfers
+
+
+def test_consolidate_files(tmp_path):
+    (tmp_path / "trip.json").write_text(json.dumps({
+        "people": ["A", "B"], "expenses": [{"desc": "x", "amount": "8", "paid_by": "A", "for": ["A", "B"]}],
+    }), encoding="utf-8")
+    (tmp_path / "yen.ndjson").write_text(
+        json.dumps({"desc": "y", "amount": "900", "currency": "JPY", "paid_by": "B", "for": ["A", "B", "C"]}) + "\n",
+        encoding="utf-8",
+    )
+    result = consolidate_files(sorted(tmp_path.iterdir()), workers=0)
+    transfers = {(t.currency, t.transaction.payer): (t.transaction.amount, t.groups) for t in result.transfers}
+    assert transfers[("USD", "B")] == (Decimal("4.00"), (("trip", Decimal("4.00")),))
+    assert transfers[("JPY", "C")] == (Decimal("300.00"), (("yen", Decimal("300.00")),))
+
+
+def test_same_file_name_in_two_directories_stays_two_groups(tmp_path):
+    for folder, payer in (("x", "A"), ("y", "C")):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "trip.json").write_text(json.dumps({
+            "expenses": [{"desc": "x", "amount": "8", "paid_by": payer, "for": [payer, "B"]}],
+        }), encoding="utf-8")
+    result = consolidate_files([tmp_path / "x" / "trip.json", tmp_path / "y" / "trip.json"], workers=0)
+    attributed = sorted(group for t in result.transfers for group in t.groups)
+    assert attributed == [("trip", Decimal("4.00")), ("trip-2", Decimal("4.00"))]
\ No newline at end of file
@@ -21,9 +21,12 @@ Notes:
 
 =================================================================================================================
 """
+import random
 from decimal import Decimal
 
-from fairsplit.optimizer import optimize_settlements
+import pytest
+
+from fairsplit.optimizer import diff_settlements, optimize_settlements, update_settlements
 
 
 def test_optimizer_basic():
@@ -32,4 +35,94 @@ def test_optimizer_basic():
     total = sum(t.amount for t in s.transactions)
     assert total == Decimal("10.00")
     # Two payments: B->A 6, C->A 4 (order may differ)
-    assert len(s.transactions) == 2
\ No newline at end of file
+    assert len(s.transactions) == 2
+
+
+def _settles(balances, settlement):
+    residual = dict(balances)
+    for t in settlement.transactions:
+        residual[t.payer] += t.amount
+        residual[t.payee] -= t.amount
+    return all(v == 0 for v in residual.values())
+
+
+def test_exact_beats_greedy():
+    balances = {
+        "A": Decimal("5.00"), "B": Decimal("4.00"),
+        "C": Decimal("-3.00"), "D": Decimal("-2.00"), "E": Decimal("-1.00"), "F": Decimal("-3.00"),
+    }
+    greedy = optimize_settlements(balances)
+    exact = optimize_settlements(balances, strategy="exact")
+    assert exact.strategy == "exact"
+    assert _settles(balances, exact)
+    # {A, C, D} and {B, E, F} settle separately: 6 people - 2 subgroups
+    assert len(exact.transactions) == 4 < len(greedy.transactions)
+
+
+def test_exact_falls_back_when_too_large():
+    balances = {f"P{i}": Decimal("1.00") for i in range(5)}
+    balances["Z"] = Decimal("-5.00")
+    s = optimize_settlements(balances, strategy="exact", max_parties=3)
+    assert s.strategy == "greedy"
+    assert _settles(balances, s)
+
+
+def test_unknown_strategy_rejected():
+    with pytest.raises(ValueError):
+        optimize_settlements({}, strategy="random")
+
+
+def test_heap_strategy_matches_exact_amounts_first():
+    balances = {
+        "A": Decimal("7.00"), "B": Decimal("3.00"),
+        "C": Decimal("-5.00"), "D": Decimal("-3.00"), "E": Decimal("-2.00"),
+    }
+    s = optimize_settlements(balances, strategy="heap")
+    assert _settles(balances, s)
+    # D->B is settled by the exact-match pass; C and E then pay A
+    assert len(s.transactions) == 3
+    assert any(t.payer == "D" and t.payee == "B" for t in s.transactions)
+
+def test_update_touches_only_changed_people():
+    balances = {"A": Decimal("10.00"), "B": Decimal("-6.00"), "C": Decimal("-4.00"), "D": Decimal("50.00"),
+                "E": Decimal("-50.00")}
+    plan = optimize_settlements(balances)
+    delta = {"C": Decimal("-2.00"), "A": Decimal("2.00")}  # C owes A two more
+    new, diff = update_settlements(plan, delta)
+    updated = {p: balances[p] + delta.get(p, Decimal("0")) for p in balances}
+    assert _settles(updated, new)
+    assert not diff.added and not diff.removed
+    assert [(old.amount, tx.amount) for old, tx in diff.changed] == [(Decimal("4.00"), Decimal("6.00"))]
+    assert diff.changed[0][1].payer == "C"
+
+
+def test_update_cancels_reverse_transfers_and_reports_diff():
+    balances = {"A": Decimal("3.00"), "B": Decimal("-3.00")}
+    plan = optimize_settlements(balances)
+    new, diff = update_settlements(plan, {"A": Decimal("-5.00"), "B": Decimal("5.00")})
+    assert [(t.payer, t.payee, t.amount) for t in new.transactions] == [("A", "B", Decimal("2.00"))]
+    assert diff.removed == plan.transactions and diff.added == new.transactions
+    with pytest.raises(ValueError):
+        update_settlements(plan, {"A": Decimal("1.00")})
+
+
+def test_random_updates_stay_valid_and_small():
+    rng = random.Random(7)
+    people = [f"P{i}" for i in range(12)]
+    balances = {p: Decimal("0.00") for p in people}
+    plan = fresh = optimize_settlements(balances)
+    churn = fresh_churn = 0
+    for _ in range(200):
+        payer, *group = rng.sample(people, rng.randint(2, 5))
+        cents = rng.randint(1, 10_000) * len(group)
+        delta = {p: -Decimal(cents // len(group)).scaleb(-2) for p in group}
+        delta[payer] = Decimal(cents).scaleb(-2)
+        plan, diff = update_settlements(plan, delta)
+        balances = {p: balances[p] + delta.get(p, Decimal("0")) for p in people}
+        assert _settles(balances, plan)
+        assert len(plan.transactions) <= len(people) - 1  # still a forest, like a greedy plan
+        churn += len(diff.added) + len(diff.removed) + len(diff.changed)
+        replanned = optimize_settlements(balances)
+        fresh_diff, fresh = diff_settlements(fresh, replanned), replanned
+        fresh_churn += len(fresh_diff.added) + len(fresh_diff.removed) + len(fresh_diff.changed)
+    assert churn < fresh_churn
\ No newline at end of file
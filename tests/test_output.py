@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_output.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for the streaming JSON / NDJSON / CSV report writers.
+
+Usage:
+pytest -q
+
+Notes:
+- Every format must parse back to the same balances and transfers.
+
+=================================================================================================================
+"""
+import csv
+import io
+import json
+from decimal import Decimal
+
+import pytest
+
+from fairsplit.models import Transaction
+from fairsplit.output import ReportWriter, open_writer
+
+REPORT = {
+    "EUR": ({"A": Decimal("-5.00"), "B": Decimal("5.00")}, [Transaction("A", "B", Decimal("5.00"))]),
+    "USD": (
+        {"A": Decimal("10.00"), "B": Decimal("-4.00"), "C": Decimal("-6.00")},
+        [Transaction("C", "A", Decimal("6.00")), Transaction("B", "A", Decimal("4.00"))],
+    ),
+}
+
+
+def _write(fmt: str, optimize: bool = True) -> str:
+    buf = io.StringIO()
+    with open_writer(fmt, buf) as writer:
+        for currency, (balances, transactions) in REPORT.items():
+            writer.balances(currency, balances.items())
+            if optimize:
+                writer.settlements(currency, transactions)
+    return buf.getvalue()
+
+
+def test_json():
+    doc = json.loads(_write("json"))
+    assert set(doc) == {"EUR", "USD"}
+    assert doc["USD"]["balances"] == {"A": "10.00", "B": "-4.00", "C": "-6.00"}
+    assert doc["USD"]["settlements"][0] == {"payer": "C", "payee": "A", "amount": "6.00"}
+    assert json.loads(_write("json", optimize=False))["EUR"] == {"balances": {"A": "-5.00", "B": "5.00"}}
+
+
+def test_ndjson():
+    records = [json.loads(line) for line in _write("ndjson").splitlines()]
+    assert len(records) == 8
+    assert records[0] == {"type": "balance", "currency": "EUR", "person": "A", "balance": "-5.00"}
+    assert records[2] == {"type": "transfer", "currency": "EUR", "payer": "A", "payee": "B", "amount": "5.00"}
+
+
+def test_csv():
+    rows = list(csv.reader(io.StringIO(_write("csv"))))
+    assert rows[0] == ["record", "currency", "person", "counterparty", "amount"]
+    assert ["balance", "USD", "C", "", "-6.00"] in rows
+    assert ["transfer", "USD", "B", "A", "4.00"] in rows
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        open_writer("xml", io.StringIO())
+
+
+def test_incomplete_writer_fails_on_creation():
+    class BalancesOnly(ReportWriter):
+        def balances(self, currency, rows):
+            pass
+
+    with pytest.raises(TypeError):
+        BalancesOnly(io.StringIO())
\ No newline at end of file
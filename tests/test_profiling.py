@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_profiling.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for stage timing spans and library counters.
+
+Usage:
+pytest -q
+
+Notes:
+- Nothing is recorded unless a Profiler is active.
+
+=================================================================================================================
+"""
+from decimal import Decimal
+from pathlib import Path
+
+from fairsplit.io_utils import stream_json
+from fairsplit.ledger import compute_balances
+from fairsplit.models import Expense, SplitCache
+from fairsplit.optimizer import optimize_settlements
+from fairsplit.profiling import NULL_PROFILER, Profiler, activate, current
+
+SAMPLE = Path(__file__).parent / "data" / "sample_expenses.json"
+
+EXPENSES = [
+    Expense(desc="pizza", amount=Decimal("20.00"), paid_by="A", beneficiaries=["A", "B", "C"]),
+    Expense(desc="pizza", amount=Decimal("20.00"), paid_by="A", beneficiaries=["A", "B", "C"]),
+    Expense(desc="cab", amount=Decimal("9.00"), paid_by="B", beneficiaries=["A", "B"]),
+]
+
+
+def test_default_is_null():
+    assert current() is NULL_PROFILER and not current().enabled
+    compute_balances(["A", "B", "C"], EXPENSES)
+    assert NULL_PROFILER.report()["counters"] == {}
+
+
+def test_counters_and_spans():
+    prof = Profiler()
+    with activate(prof):
+        with prof.span("balances"):
+            balances = compute_balances(["A", "B", "C"], EXPENSES, split_cache=SplitCache())
+        settlement = optimize_settlements(balances)
+    assert current() is NULL_PROFILER
+
+    report = prof.report()
+    assert report["stages"]["balances"]["calls"] == 1
+    counters = report["counters"]
+    assert counters["expenses"] == 3
+    assert counters["splits"] == 2 and counters["split_cache_hits"] == 1
+    assert counters["drift_corrections"] == 1  # 20.00 / 3 needs one cent moved
+    assert counters["transactions"] == len(settlement.transactions)
+
+
+def test_stream_spans(tmp_path):
+    prof = Profiler()
+    with activate(prof):
+        expenses = list(stream_json(SAMPLE))
+    stages = prof.report()["stages"]
+    assert stages["read.validate"]["calls"] == len(expenses)
+    assert stages["read.decode"]["calls"] == len(expenses) + 1
+
+    prof.dump(tmp_path / "report.json")
+    assert (tmp_path / "report.json").read_text(encoding="utf-8").startswith("{")
\ No newline at end of file
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_result_cache.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for the content-addressed result cache.
+
+Usage:
+pytest -q
+
+Notes:
+- Entry ages are set with os.utime so LRU order does not depend on timer resolution.
+
+=================================================================================================================
+"""
+import json
+import os
+from decimal import Decimal
+
+from typer.testing import CliRunner
+
+from fairsplit.cli import app
+from fairsplit.models import Expense, Transaction
+from fairsplit.optimizer import Settlement
+from fairsplit.result_cache import RACY_NS, CachedReport, ResultCache
+from fairsplit.sqlite_store import SqliteLedger
+
+
+def _report():
+    return CachedReport(
+        people=["Ali", "Sara"],
+        partitions={"USD": {"Ali": Decimal("12.50"), "Sara": Decimal("-12.50")}},
+        settlements={"USD": Settlement([Transaction("Sara", "Ali", Decimal("12.50"))], strategy="exact")},
+        fees={"USD": Decimal("0.13")},
+    )
+
+
+def _age(path, seconds):
+    """Move a file's mtime `seconds` into the past."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - int(seconds * 1e9)))
+
+
+def test_round_trip_and_hit_counts(tmp_path):
+    source = tmp_path / "trip.json"
+    source.write_text('{"people": [], "expenses": []}', encoding="utf-8")
+    cache = ResultCache(tmp_path / "cache")
+    key = cache.key(source, {"strategy": "exact"})
+    assert cache.get(key) is None
+    cache.put(key, _report())
+    assert cache.get(key) == _report()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_key_tracks_content_and_options(tmp_path):
+    source = tmp_path / "trip.json"
+    source.write_text("one", encoding="utf-8")
+    cache = ResultCache(tmp_path / "cache")
+    key = cache.key(source, {"strategy": "greedy"})
+    assert cache.key(source, {"strategy": "greedy"}) == key
+    assert cache.key(source, {"strategy": "heap"}) != key
+    source.write_text("two", encoding="utf-8")  # same size, possibly the same mtime: racy, so rehashed
+    assert cache.key(source, {"strategy": "greedy"}) != key
+
+
+def test_digest_memo_skips_rereading_settled_files(tmp_path):
+    source = tmp_path / "trip.json"
+    source.write_text("one", encoding="utf-8")
+    _age(source, 2 * RACY_NS / 1e9)
+    cache = ResultCache(tmp_path / "cache")
+    digest = cache.file_digest(source)
+    st = source.stat()
+    source.write_text("two", encoding="utf-8")
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns))  # content changed behind an identical stat
+    assert cache.file_digest(source) == digest  # trusted: the memo is keyed by stat alone
+    source.write_text("three", encoding="utf-8")
+    assert cache.file_digest(source) != digest
+
+
+def test_lru_eviction_by_size(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    keys = [f"{i:064x}" for i in range(4)]
+    for age, key in zip((40, 30, 20, 10), keys):
+        cache.put(key, _report())
+        _age(cache.directory / "results" / f"{key}.json", age)
+    entry_size = (cache.directory / "results" / f"{keys[0]}.json").stat().st_size
+
+    cache.get(keys[0])  # oldest, but just used
+    cache.max_bytes = 2 * entry_size
+    assert cache.evict() == 2
+    assert cache.get(keys[0]) is not None and cache.get(keys[3]) is not None
+    assert cache.get(keys[1]) is None and cache.get(keys[2]) is None
+    assert cache.size() <= cache.max_bytes
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    key = "0" * 64
+    cache.put(key, _report())
+    (cache.directory / "results" / f"{key}.json").write_text("{not json", encoding="utf-8")
+    assert cache.get(key) is None
+    assert not (cache.directory / "results" / f"{key}.json").exists()
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_cli_trusted_runs_do_not_serve_checked_runs(tmp_path):
+    source, cache_dir = tmp_path / "trip.json", tmp_path / "cache"
+    source.write_text(json.dumps({"expenses": [{"amount": "-5", "paid_by": "A", "for": ["A", "B"]}]}), encoding="utf-8")
+    args = ["file", "-i", str(source), "--format", "json", "--no-optimize", "--cache-dir", str(cache_dir)]
+    runner = CliRunner()
+    assert runner.invoke(app, [*args, "--trusted"]).exit_code == 0
+    checked = runner.invoke(app, args)
+    assert checked.exit_code != 0 and "Result cache hit" not in checked.output
+
+
+def test_cli_does_not_cache_sqlite_ledgers(tmp_path):
+    db_path, cache_dir = tmp_path / "group.db", tmp_path / "cache"
+    args = ["file", "-i", str(db_path), "--format", "json", "--no-optimize", "--cache-dir", str(cache_dir)]
+    runner = CliRunner()
+    with SqliteLedger(db_path) as writer:  # stays open: its commits sit in the -wal file
+        writer.add_expenses([Expense(desc="taxi", amount=Decimal("10.00"), paid_by="X", beneficiaries=["X", "Y"])])
+        first = runner.invoke(app, args)
+        writer.add_expenses([Expense(desc="hotel", amount=Decimal("100.00"), paid_by="Y", beneficiaries=["X", "Y"])])
+        second = runner.invoke(app, args)
+    assert first.exit_code == second.exit_code == 0
+    assert "Result cache" not in first.output + second.output
+    balances = json.loads(second.stdout)["USD"]["balances"]
+    assert balances["X"] == "-45.00"
+    assert not ResultCache(cache_dir).size()
\ No newline at end of file
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_server.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for the asyncio settlement service and its hot group cache.
+
+Usage:
+pytest -q
+
+Notes:
+- `workers=0` keeps settlement on a thread so tests do not spawn processes.
+
+=================================================================================================================
+"""
+import asyncio
+import json
+
+from fairsplit.models import SPLIT_CACHE
+from fairsplit.server import SettlementServer
+
+TRIP = {
+    "people": ["Ali", "Sara", "Reza"],
+    "expenses": [
+        {"desc": "dinner", "amount": "120.00", "paid_by": "Ali", "for": ["Ali", "Sara", "Reza"]},
+        {"desc": "hotel", "amount": "9000", "currency": "JPY", "paid_by": "Sara", "for": ["Sara", "Reza"]},
+    ],
+}
+
+
+def _post(app, group, payload):
+    return app.request("POST", f"/groups/{group}/expenses", json.dumps(payload).encode())
+
+
+def test_append_balances_settlements(tmp_path):
+    async def scenario():
+        app = SettlementServer(tmp_path, workers=0)
+        status, body = await _post(app, "trip", TRIP)
+        assert (status, body["expenses"]) == (200, 2)
+
+        status, body = await app.request("GET", "/groups/trip/balances")
+        assert body["balances"]["USD"] == {"Ali": "80.00", "Sara": "-40.00", "Reza": "-40.00"}
+        assert body["balances"]["JPY"]["Sara"] == "4500.00"
+
+        status, body = await app.request("GET", "/groups/trip/settlements?strategy=heap")
+        assert status == 200
+        assert body["settlements"]["JPY"]["transactions"] == [{"payer": "Reza", "payee": "Sara", "amount": "4500.00"}]
+        assert len(body["settlements"]["USD"]["transactions"]) == 2
+
+        assert (await app.request("GET", "/groups/nope/balances"))[0] == 404
+        assert (await app.request("GET", "/groups/trip/expenses"))[0] == 405
+        assert (await _post(app, "trip", {"amount": "5"}))[0] == 400
+        assert (await _post(app, "trip", {"people": ["Zoe"], "expenses": []}))[0] == 409
+        assert (await app.request("GET", "/groups/trip/settlements?strategy=magic"))[0] == 400
+
+    asyncio.run(scenario())
+
+
+def test_log_write_failure_is_a_server_error(tmp_path, monkeypatch):
+    async def scenario():
+        app = SettlementServer(tmp_path, workers=0)
+        await _post(app, "trip", TRIP)
+
+        def disk_full(*args):
+            raise OSError(28, "No space left on device")
+
+        monkeypatch.setattr(app.store, "append", disk_full)
+        status, body = await _post(app, "trip", TRIP["expenses"][0])
+        assert status == 500 and "No space left" in body["error"]
+        assert (await app.request("GET", "/groups/trip/balances"))[1]["balances"]["USD"]["Ali"] == "80.00"
+
+    asyncio.run(scenario())
+
+
+def test_evicted_group_reloads_from_log(tmp_path):
+    async def scenario():
+        app = SettlementServer(tmp_path, max_groups=1, workers=0)
+        await _post(app, "a", {**TRIP, "people": [*TRIP["people"], "Omid"]})  # Omid has no expenses
+        before = await app.request("GET", "/groups/a/balances")
+        assert before[1]["balances"]["USD"]["Omid"] == "0.00"
+        await _post(app, "b", TRIP["expenses"][0])  # evicts "a"
+        assert "a" not in app.store.hot and app.store.evictions == 1
+        shared = SPLIT_CACHE.info()
+        assert await app.request("GET", "/groups/a/balances") == before
+        assert SPLIT_CACHE.info() == shared  # the replay thread never touches the shared cache
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_appends_over_http(tmp_path):
+    expense = {"desc": "coffee", "amount": "3.00", "paid_by": "Ali", "for": ["Ali", "Sara", "Reza"]}
+
+    async def call(port, method, path, payload=None):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, data = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(data)
+
+    async def scenario():
+        app = SettlementServer(tmp_path, workers=0)
+        server = await app.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            await call(port, "POST", "/groups/cafe/expenses", {"people": ["Ali", "Sara", "Reza"], "expenses": []})
+            results = await asyncio.gather(*(call(port, "POST", "/groups/cafe/expenses", expense) for _ in range(20)))
+            assert all(status == 200 for status, _ in results)
+            status, body = await call(port, "GET", "/groups/cafe/balances")
+        app.close()
+        assert body["balances"]["USD"] == {"Ali": "40.00", "Sara": "-20.00", "Reza": "-20.00"}
+
+    asyncio.run(scenario())
\ No newline at end of file
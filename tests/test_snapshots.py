@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_snapshots.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for as-of and period balance queries over the snapshot index.
+
+Usage:
+pytest -q
+
+Notes:
+- A small `interval` makes every query cross several checkpoints.
+
+=================================================================================================================
+"""
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+
+from fairsplit.ledger import compute_balances_by_currency
+from fairsplit.models import Expense
+from fairsplit.snapshots import SnapshotIndex
+from fairsplit.synthetic import START, Workload, generate
+
+PEOPLE, EXPENSES = generate(Workload(people=8, expenses=500, span_days=90, seed=5))
+
+
+def _expected(lo, hi):
+    chosen = [e for e in EXPENSES if (lo is None or e.timestamp >= lo) and (hi is None or e.timestamp < hi)]
+    return compute_balances_by_currency(PEOPLE, chosen, engine="minor")
+
+
+@pytest.mark.parametrize("day", [0, 1, 17, 45, 89, 200])
+def test_as_of_matches_full_scan(day):
+    index = SnapshotIndex(PEOPLE, EXPENSES, interval=16)
+    when = START + timedelta(days=day, hours=5)
+    assert index.as_of(when) == _expected(None, when)
+
+
+@pytest.mark.parametrize("interval", [1, 16, 1024])
+def test_between_matches_full_scan(interval):
+    index = SnapshotIndex(PEOPLE, EXPENSES, interval=interval)
+    for lo, hi in [(10, 11), (3, 60), (0, 90)]:
+        start, end = START + timedelta(days=lo), START + timedelta(days=hi)
+        assert index.between(start, end) == _expected(start, end)
+    assert index.between(START + timedelta(days=30), None) == _expected(START + timedelta(days=30), None)
+    with pytest.raises(ValueError):
+        index.between(START + timedelta(days=2), START)
+
+
+def test_out_of_order_inserts_invalidate_later_checkpoints():
+    shuffled = EXPENSES[:]
+    random.Random(1).shuffle(shuffled)
+    index = SnapshotIndex(PEOPLE, shuffled[:300], interval=8)
+    index.as_of(START + timedelta(days=90))  # build every checkpoint
+    for e in shuffled[300:]:
+        index.add(e)
+    assert len(index) == len(EXPENSES)
+    for day in (7, 50, 91):
+        when = START + timedelta(days=day)
+        assert index.as_of(when) == _expected(None, when)
+
+
+def test_ranges_are_half_open_and_skip_undated():
+    expenses = [
+        Expense("feb", Decimal("10"), "A", ["B"], timestamp="2026-02-28T23:59:59"),
+        Expense("mar", Decimal("4"), "B", ["A"], timestamp="2026-03-01"),
+        Expense("old", Decimal("99"), "A", ["B"]),
+    ]
+    index = SnapshotIndex(["A", "B"], expenses)
+    assert index.undated == 1
+    assert index.as_of("2026-03-01") == {"USD": {"A": Decimal("10.00"), "B": Decimal("-10.00")}}
+    assert index.between("2026-03-01", "2026-04-01") == {"USD": {"A": Decimal("-4.00"), "B": Decimal("4.00")}}
\ No newline at end of file
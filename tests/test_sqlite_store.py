@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_sqlite_store.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for the SQLite-backed ledger and its materialized balances.
+
+Usage:
+pytest -q
+
+Notes:
+- Materialized balances must equal a full replay through the minor engine (shares are
+  stored in minor units, so JPY splits in whole yen).
+
+=================================================================================================================
+"""
+import sqlite3
+from decimal import Decimal
+
+import pytest
+
+from fairsplit.ledger import compute_balances_by_currency
+from fairsplit.models import Expense
+from fairsplit.sqlite_store import SqliteLedger
+
+PEOPLE = ["A", "B", "C"]
+EXPENSES = [
+    Expense(desc="rent", amount=Decimal("1000.00"), paid_by="A", beneficiaries=["A", "B", "C"]),
+    Expense(
+        desc="hotel", amount=Decimal("333.33"), paid_by="B", beneficiaries=["A", "B"],
+        weights={"B": Decimal("1.5"), "A": Decimal("2")}, timestamp="2026-03-14T19:30:00.250+01:00",
+    ),
+    Expense(desc="sushi", amount=Decimal("1000"), paid_by="C", beneficiaries=["A", "B", "C"], currency="JPY"),
+    Expense(desc="taxi", amount=Decimal("20.00"), paid_by="D", beneficiaries=["C", "D"]),
+]
+
+
+def test_materialized_balances_match_replay(tmp_path):
+    with SqliteLedger(tmp_path / "g.db") as db:
+        db.add_people(PEOPLE)
+        ids = db.add_expenses(EXPENSES)
+        assert ids == [1, 2, 3, 4]
+        assert db.people() == ["A", "B", "C", "D"]
+        assert db.balances_by_currency() == compute_balances_by_currency(db.people(), EXPENSES, engine="minor")
+        assert db.balances("JPY")["C"] == Decimal("667")
+
+
+def test_delete_reverses_insert(tmp_path):
+    with SqliteLedger(tmp_path / "g.db") as db:
+        ids = db.add_expenses(EXPENSES)
+        assert db.delete_expenses([ids[0], ids[2], 99]) == 2
+        assert len(db) == 2
+        expected = compute_balances_by_currency(db.people(), [EXPENSES[1], EXPENSES[3]], engine="minor")
+        assert {c: b for c, b in db.balances_by_currency().items() if any(b.values())} == expected
+
+
+def test_persists_across_connections(tmp_path):
+    path = tmp_path / "g.db"
+    with SqliteLedger(path) as db:
+        db.add_expenses(EXPENSES[:2])
+    with SqliteLedger(path) as db:
+        db.add_expenses(EXPENSES[2:])
+        assert list(db.expenses()) == EXPENSES
+        before = db.balances_by_currency()
+        db.rebuild_balances()
+        assert db.balances_by_currency() == before
+
+
+def test_adds_timestamp_column_to_older_databases(tmp_path):
+    path = tmp_path / "old.db"
+    with SqliteLedger(path) as db, db.conn:
+        db.conn.execute("ALTER TABLE expenses DROP COLUMN ts")
+        db.conn.execute("INSERT INTO people (name) VALUES ('A')")
+        db.conn.execute("INSERT INTO expenses VALUES (1, 'old', '5.00', 500, 'USD', 1)")
+        db.conn.execute("INSERT INTO shares VALUES (1, 0, 1, NULL, 500)")
+    with SqliteLedger(path) as db:
+        db.add_expenses(EXPENSES[1:2])
+        assert [e.timestamp for e in db.expenses()] == [None, EXPENSES[1].timestamp]
+
+
+def test_duplicate_beneficiaries_roll_back(tmp_path):
+    with SqliteLedger(tmp_path / "g.db") as db:
+        with pytest.raises(ValueError):
+            db.add_expenses([EXPENSES[0], Expense("x", Decimal("1"), "A", ["B", "B"])])
+        assert len(db) == 0 and db.balances_by_currency() == {}
+
+
+def test_failed_batch_does_not_poison_person_ids(tmp_path):
+    newcomer = Expense("taxi", Decimal("10"), "E", ["E", "F"])
+    with SqliteLedger(tmp_path / "g.db") as db:
+        with pytest.raises(ValueError):
+            db.add_expenses([newcomer, Expense("x", Decimal("1"), "A", ["B", "B"])])
+        db.add_people(["A"])
+        with pytest.raises(sqlite3.IntegrityError):
+            with db._transaction():
+                db._intern(["G"])
+                db.conn.execute("INSERT INTO people (name) VALUES ('A')")
+        db.add_expenses([newcomer, Expense("bus", Decimal("4"), "G", ["A", "G"])])
+        assert db.people() == ["A", "E", "F", "G"]
+        assert db.balances() == {"E": Decimal("5.00"), "F": Decimal("-5.00"), "G": Decimal("2.00"), "A": Decimal("-2.00")}
\ No newline at end of file
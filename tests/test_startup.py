@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_startup.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+CLI cold-start checks: heavy optional modules stay out of `import fairsplit.main`, and
+the package's own import time (measured with `python -X importtime`) stays in budget.
+
+Usage:
+pytest -q tests/test_startup.py
+
+Notes:
+- The budget covers FairSplit's share of the import (everything except typer itself)
+  and can be raised on slow machines with FAIRSPLIT_IMPORT_BUDGET_MS.
+- Each measurement is the best of a few fresh interpreters to smooth out noise.
+
+=================================================================================================================
+"""
+import os
+import subprocess
+import sys
+from typing import Dict
+
+IMPORT_BUDGET_MS = float(os.environ.get("FAIRSPLIT_IMPORT_BUDGET_MS", "100"))
+HEAVY_MODULES = ("rich", "numpy", "sqlite3", "multiprocessing", "cProfile")
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True)
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds per module, from `-X importtime`."""
+    times = {}
+    for line in _python("-X", "importtime", "-c", f"import {module}").stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_skips_heavy_modules():
+    code = f"import sys, fairsplit.main; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    assert _python("-c", code).stdout.split() == []
+
+
+def test_cli_import_time_budget():
+    own_ms = []
+    for _ in range(3):
+        times = _import_times("fairsplit.main")
+        own_ms.append((times["fairsplit.main"] - times.get("typer", 0)) / 1000)
+    assert min(own_ms) < IMPORT_BUDGET_MS, f"fairsplit import took {min(own_ms):.1f} ms (budget {IMPORT_BUDGET_MS} ms)"
\ No newline at end of file
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_synthetic.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for the seeded synthetic ledger generator used by the benchmarks.
+
+Usage:
+pytest -q
+
+Notes:
+- Benchmarks are only comparable if the same Workload always produces the same ledger.
+
+=================================================================================================================
+"""
+import pytest
+
+from fairsplit.ledger import compute_balances
+from fairsplit.synthetic import Workload, generate
+
+
+def test_same_seed_same_ledger():
+    spec = Workload(people=10, expenses=500, seed=3)
+    assert generate(spec) == generate(spec)
+    assert generate(spec)[1] != generate(Workload(people=10, expenses=500, seed=4))[1]
+
+
+def test_workload_knobs():
+    people, expenses = generate(Workload(people=30, expenses=2_000, weighted=1.0, recurring=0.0, max_group=4))
+    assert len(people) == 30 and len(expenses) == 2_000
+    assert all(e.weights for e in expenses)
+    assert max(len(e.beneficiaries) for e in expenses) <= 4
+    assert sum(compute_balances(people, expenses).values()) == 0
+
+    _, expenses = generate(Workload(expenses=1_000, weighted=0.0, recurring=1.0, shapes=5))
+    assert not any(e.weights for e in expenses)
+    assert len({(e.amount, e.paid_by, tuple(e.beneficiaries)) for e in expenses}) <= 5
+
+
+def test_rejects_bad_fractions():
+    with pytest.raises(ValueError):
+        Workload(weighted=1.5)
\ No newline at end of file
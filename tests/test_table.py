@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_table.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for the compact PersonTable / ExpenseTable representation.
+
+Usage:
+pytest -q
+
+Notes:
+- Balances from a table must equal the object-based path.
+
+=================================================================================================================
+"""
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from fairsplit.io_utils import load_json
+from fairsplit.ledger import compute_balances
+from fairsplit.models import Expense
+from fairsplit.table import ExpenseTable, PersonTable
+
+SAMPLE = Path(__file__).parent / "data" / "sample_expenses.json"
+
+EXPENSES = [
+    Expense(desc="rent", amount=Decimal("1000.00"), paid_by="A", beneficiaries=["A", "B", "C"]),
+    Expense(
+        desc="hotel", amount=Decimal("333.33"), paid_by="B", beneficiaries=["A", "B"],
+        weights={"B": Decimal("1.5"), "A": Decimal("2")},
+    ),
+    Expense(desc="sushi", amount=Decimal("1000"), paid_by="C", beneficiaries=["A", "B", "C"], currency="JPY"),
+]
+
+
+def test_person_table_interns_names():
+    people = PersonTable(["A", "B"])
+    assert people.intern("B") == 1
+    assert people.intern("C") == 2
+    assert people[2] == "C" and "C" in people and len(people) == 3
+
+
+def test_table_balances_match_objects():
+    people = ["A", "B", "C", "D"]
+    table = ExpenseTable.from_expenses(people, EXPENSES)
+    assert len(table) == 3
+    assert compute_balances(people, table) == compute_balances(people, EXPENSES, engine="minor")
+
+
+def test_records_round_trip_to_expenses():
+    table = ExpenseTable.from_expenses(["A", "B", "C"], EXPENSES)
+    record = table[1]
+    assert record.weights == (15, 20)
+    assert [e.split() for e in table] == [e.split() for e in EXPENSES]
+
+
+def test_weights_beyond_int64_stay_exact():
+    people = ["A", "B", "C"]
+    expenses = [
+        *EXPENSES,
+        Expense(
+            desc="pool", amount=Decimal("100.00"), paid_by="C", beneficiaries=["A", "B"],
+            weights={"A": Decimal("1.0000000000000000001"), "B": Decimal("2")},
+        ),
+    ]
+    table = ExpenseTable.from_expenses(people, expenses)
+    assert table[3].weights == (10000000000000000001, 20000000000000000000)
+    assert compute_balances(people, table) == compute_balances(people, expenses, engine="minor")
+
+
+def test_duplicate_beneficiaries_rejected():
+    with pytest.raises(ValueError):
+        ExpenseTable().append(Expense(desc="x", amount=Decimal("1.00"), paid_by="A", beneficiaries=["A", "A"]))
+
+
+def test_load_json_compact():
+    people, expenses = load_json(SAMPLE)
+    compact_people, table = load_json(SAMPLE, compact=True)
+    assert compact_people == people
+    assert compute_balances(people, table) == compute_balances(people, expenses)
\ No newline at end of file
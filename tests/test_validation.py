@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_validation.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for whole-document validation.
+
+Usage:
+pytest -q
+
+Notes:
+- Validation must agree with `expense_from_obj`: a record passes exactly when it loads.
+
+=================================================================================================================
+"""
+import json
+from decimal import InvalidOperation
+from pathlib import Path
+
+import pytest
+
+from fairsplit.io_utils import expense_from_obj
+from fairsplit.validation import Issue, validate_document, validate_file
+
+SAMPLE = Path(__file__).parent / "data" / "sample_expenses.json"
+
+VALID = {"amount": "12.50", "paid_by": "Ali", "for": ["Ali", "Sara"]}
+INVALID = [
+    {"paid_by": "Ali", "for": ["Ali"]},
+    {**VALID, "amount": "twelve"},
+    {**VALID, "amount": "-1"},
+    {**VALID, "amount": 0},
+    {**VALID, "for": []},
+    {**VALID, "weights": {"Ali": 1}},
+    {**VALID, "weights": {"Ali": 1, "Sara": 0}},
+    {**VALID, "weights": {"Ali": 1, "Sara": 1, "Omid": 1}},
+    {**VALID, "timestamp": "yesterday"},
+    {**VALID, "timestamp": 1712345678},
+]
+
+
+def test_sample_is_valid():
+    assert validate_file(SAMPLE) == []
+
+
+@pytest.mark.parametrize("item", INVALID)
+def test_issue_exactly_when_loading_fails(item):
+    assert validate_document({"expenses": [VALID]}) == []
+    issues = validate_document({"expenses": [VALID, item]})
+    assert issues and all(issue.index == 1 for issue in issues)
+    with pytest.raises((ValueError, KeyError, TypeError, InvalidOperation)):
+        expense_from_obj(item)
+
+
+def test_reports_every_issue_with_index_and_field():
+    issues = validate_document(
+        {
+            "people": ["Ali", 7],
+            "expenses": [
+                VALID,
+                {"amount": "x", "paid_by": "", "for": ["Ali"], "timestamp": "nope"},
+                "not an expense",
+                {**VALID, "weights": {"Ali": "2", "Omid": "1"}},
+            ],
+        }
+    )
+    assert [(i.index, i.field) for i in issues] == [
+        (None, "people"),
+        (1, "amount"),
+        (1, "paid_by"),
+        (1, "timestamp"),
+        (2, "expense"),
+        (3, "weights"),
+        (3, "weights"),
+    ]
+    assert str(issues[1]) == "expenses[1].amount: not a decimal number: 'x'"
+    assert str(issues[0]) == "people: must be a list of non-empty strings"
+
+
+def test_ndjson_counts_expenses_not_lines(tmp_path):
+    path = tmp_path / "log.ndjson"
+    lines = [json.dumps({"people": ["Ali", "Sara"]}), json.dumps(VALID), "", "{oops", json.dumps({**VALID, "for": []})]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    line_issue, expense_issue = validate_file(path)
+    assert (line_issue.index, line_issue.field) == (None, "line")
+    assert line_issue.message.startswith("4: invalid JSON")
+    assert expense_issue == Issue(1, "for", "needs at least one beneficiary")
\ No newline at end of file
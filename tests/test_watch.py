@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=================================================================================================================
+Project: FairSplit — Optimized Cost Sharing Calculator
+File: test_watch.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+=
+
+Description:
+Unit tests for the log watcher: incremental application, checkpoints and debouncing.
+
+Usage:
+pytest -q
+
+Notes:
+- A fake clock drives the debounce so no test sleeps.
+
+=================================================================================================================
+"""
+import json
+from decimal import Decimal
+
+from fairsplit.io_utils import expense_to_obj
+from fairsplit.ledger import compute_balances_by_currency
+from fairsplit.synthetic import Workload, generate
+from fairsplit.watch import LogWatcher
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _append(path, *objs):
+    with path.open("a", encoding="utf-8") as fh:
+        for obj in objs:
+            fh.write(json.dumps(obj) + "\n")
+
+
+def test_incremental_polls_match_full_recompute(tmp_path):
+    people, expenses = generate(Workload(people=6, expenses=300, seed=3))
+    log = tmp_path / "log.ndjson"
+    _append(log, {"people": people})
+    watcher = LogWatcher(log)
+    for start in range(0, len(expenses), 70):
+        _append(log, *(expense_to_obj(e) for e in expenses[start:start + 70]))
+        watcher.poll()
+    assert watcher.expenses == len(expenses)
+    assert watcher.balances() == compute_balances_by_currency(people, expenses, engine="minor")
+
+
+def test_backlog_is_read_in_bounded_chunks(tmp_path):
+    people, expenses = generate(Workload(people=6, expenses=200, seed=5))
+    log = tmp_path / "log.ndjson"
+    _append(log, {"people": people}, *(expense_to_obj(e) for e in expenses))
+    with log.open("a", encoding="utf-8") as fh:
+        fh.write('{"desc": "half')
+    watcher = LogWatcher(log, read_size=64)  # shorter than a line: every line spans chunks
+    assert watcher.poll() == len(expenses)
+    assert watcher.offset == log.stat().st_size - len('{"desc": "half')
+    assert watcher.balances() == compute_balances_by_currency(people, expenses, engine="minor")
+
+
+def test_partial_line_waits_for_newline(tmp_path):
+    log = tmp_path / "log.ndjson"
+    line = json.dumps({"desc": "x", "amount": "10", "paid_by": "A", "for": ["A", "B"]})
+    log.write_text(line[:10], encoding="utf-8")
+    watcher = LogWatcher(log)
+    assert watcher.poll() == 0 and watcher.offset == 0
+    with log.open("a", encoding="utf-8") as fh:
+        fh.write(line[10:] + "\n")
+    assert watcher.poll() == 1
+    assert watcher.balances()["USD"]["B"] == -5
+
+
+def test_checkpoint_resume_applies_only_new_lines(tmp_path):
+    log, ckpt = tmp_path / "log.ndjson", tmp_path / "log.ckpt"
+    _append(log, {"desc": "a", "amount": "30", "paid_by": "A", "for": ["A", "B", "C"]})
+    first = LogWatcher(log, checkpoint=ckpt)
+    first.poll()
+    first.save()
+
+    _append(log, {"desc": "b", "amount": "9", "paid_by": "B", "for": ["C"]})
+    second = LogWatcher(log, checkpoint=ckpt)
+    assert second.expenses == 1
+    assert second.poll() == 1
+    assert second.balances()["USD"] == {"A": 20, "B": -1, "C": -19}
+
+
+def test_emits_only_after_debounce_and_on_change(tmp_path):
+    log, clock, seen = tmp_path / "log.ndjson", Clock(), []
+    watcher = LogWatcher(log, debounce=1.0, max_wait=5.0, clock=clock)
+    _append(log, {"desc": "a", "amount": "10", "paid_by": "A", "for": ["B"]})
+    watcher.poll()
+    assert not watcher.due()
+    clock.now = 1.0
+    assert watcher.due() and watcher.emit(lambda b, s: seen.append(s))
+    assert [(t.payer, t.payee) for t in seen[0]["USD"].transactions] == [("B", "A")]
+
+    # a payback that cancels out still re-emits; a further zero-sum line with no net change does not
+    _append(log, {"desc": "b", "amount": "10", "paid_by": "B", "for": ["A"]})
+    watcher.poll()
+    clock.now = 2.0
+    assert watcher.emit(lambda b, s: seen.append(s))
+    _append(log, {"desc": "c", "amount": "5", "paid_by": "A", "for": ["A"]})
+    watcher.poll()
+    clock.now = 3.0
+    assert watcher.due() and not watcher.emit(lambda b, s: seen.append(s))
+    assert len(seen) == 2
+
+
+def test_max_wait_bounds_a_continuous_feed(tmp_path):
+    log, clock = tmp_path / "log.ndjson", Clock()
+    watcher = LogWatcher(log, debounce=1.0, max_wait=3.0, clock=clock)
+    for i in range(4):
+        clock.now = i * 0.5 + 0.5
+        _append(log, {"desc": str(i), "amount": "1", "paid_by": "A", "for": ["B"]})
+        watcher.poll()
+    assert not watcher.due()  # changed 0s ago, dirty for 1.5s
+    clock.now = 3.5
+    assert watcher.due()
+
+
+def test_invalid_lines_are_skipped(tmp_path, caplog):
+    log = tmp_path / "log.ndjson"
+    log.write_text(
+        '{"desc": "ok", "amount": "4", "paid_by": "A", "for": ["A", "B"]}\n'
+        "not json\n"
+        '{"desc": "bad", "amount": "-4", "paid_by": "A", "for": ["B"]}\n',
+        encoding="utf-8",
+    )
+    warnings = []
+    watcher = LogWatcher(log, on_warning=warnings.append)
+    assert watcher.poll() == 1
+    assert watcher.skipped == 2
+    assert len(warnings) == 2 and all("skipped invalid line" in w for w in warnings)
+
+    with caplog.at_level("WARNING", logger="fairsplit.watch"):
+        LogWatcher(log).poll()  # no callback: the module logger, never a bare print
+    assert sum("skipped invalid line" in r.getMessage() for r in caplog.records) == 2
+
+
+def test_truncated_log_is_replayed(tmp_path):
+    log = tmp_path / "log.ndjson"
+    _append(log, *({"desc": str(i), "amount": "2", "paid_by": "A", "for": ["B"]} for i in range(3)))
+    watcher = LogWatcher(log)
+    watcher.poll()
+    log.write_text(json.dumps({"desc": "new", "amount": "1", "paid_by": "B", "for": ["A"]}) + "\n", encoding="utf-8")
+    watcher.poll()
+    assert watcher.expenses == 1
+    assert watcher.balances()["USD"] == {"A": -1, "B": 1}
+
+
+def test_replaced_log_is_replayed_even_when_longer(tmp_path):
+    log, ckpt = tmp_path / "log.ndjson", tmp_path / "log.ckpt"
+    _append(log, {"desc": "old", "amount": "2", "paid_by": "A", "for": ["B"]})
+    watcher = LogWatcher(log, checkpoint=ckpt)
+    watcher.poll()
+    watcher.save()
+    rotated = [{"desc": f"new{i}", "amount": "1", "paid_by": "B", "for": ["A"]} for i in range(3)]
+
+    other = tmp_path / "other.ndjson"
+    _append(other, *rotated)
+    other.replace(log)  # new inode, longer than the checkpointed offset
+    watcher.poll()
+    assert watcher.expenses == 3 and watcher.balances()["USD"] == {"A": -3, "B": 3}
+
+    watcher.save()
+    log.write_text("", encoding="utf-8")  # rewritten in place while stopped: same inode, new content
+    _append(log, *({"desc": f"other{i}", "amount": "5", "paid_by": "A", "for": ["B"]} for i in range(4)))
+    resumed = LogWatcher(log, checkpoint=ckpt)
+    resumed.poll()
+    assert resumed.expenses == 4 and resumed.balances()["USD"] == {"A": 20, "B": -20}
+
+
+def test_run_once_emits_and_checkpoints(tmp_path):
+    log, ckpt, seen = tmp_path / "log.ndjson", tmp_path / "log.ckpt", []
+    _append(log, {"people": ["A", "B"]}, {"desc": "a", "amount": "8", "paid_by": "A", "for": ["A", "B"]})
+    LogWatcher(log, checkpoint=ckpt).run(lambda b, s: seen.append(b), once=True)
+    assert seen == [{"USD": {"A": 4, "B": -4}}]
+    assert json.loads(ckpt.read_text(encoding="utf-8"))["offset"] == log.stat().st_size
+
+def test_later_emissions_patch_the_plan(tmp_path):
+    log, plans = tmp_path / "log.ndjson", []
+    _append(
+        log,
+        {"desc": "a", "amount": "30", "paid_by": "A", "for": ["A", "B", "C"]},
+        {"desc": "b", "amount": "40", "paid_by": "D", "for": ["D", "E"]},
+    )
+    watcher = LogWatcher(log)
+    watcher.poll()
+    watcher.emit(lambda b, s: plans.append(s["USD"]))
+    _append(log, {"desc": "c", "amount": "6", "paid_by": "A", "for": ["C"]})
+    watcher.poll()
+    watcher.emit(lambda b, s: plans.append(s["USD"]))
+
+    # E->A, B->D and C->D stay as they were; only C's extra debt to A is added
+    diff = watcher.diffs["USD"]
+    assert not diff.changed and not diff.removed
+    assert [(tx.payer, tx.payee, tx.amount) for tx in diff.added] == [("C", "A", Decimal("6.00"))]
+    assert plans[1].strategy == "incremental"
+    assert plans[1].transactions[:3] == plans[0].transactions
\ No newline at end of file